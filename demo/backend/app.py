@@ -2,6 +2,7 @@ import os
 import sys
 import asyncio
 import json
+import threading
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 from datetime import datetime
@@ -20,7 +21,7 @@ sys.path.append(root)
 from src.config import Config
 from src.agents import DataCollector, DataAnalyzer, ReportGenerator
 from src.memory import Memory
-from src.utils import setup_logger, get_logger
+from src.utils import setup_logger, get_logger, add_stream_listener
 import logging
 
 
@@ -29,6 +30,8 @@ class LLMConfig(BaseModel):
     api_key: str
     base_url: str
     generation_params: Optional[Dict[str, Any]] = {}
+    stream: Optional[bool] = None  # defaults to streaming for the main (ds) model
+
 
 
 class SystemConfig(BaseModel):
@@ -124,6 +127,8 @@ app.add_middleware(
 
 
 manager = ConnectionManager()
+# Event loop serving the websockets, captured at startup; agents may log or stream from other loops
+server_loop: Optional[asyncio.AbstractEventLoop] = None
 current_config: Optional[SystemConfig] = None
 current_tasks: TaskList = TaskList(collect_tasks=[], analysis_tasks=[])
 execution_state: Dict[str, Any] = {
@@ -133,6 +138,12 @@ execution_state: Dict[str, Any] = {
 }
 
 
+@app.on_event("startup")
+async def capture_server_loop():
+    global server_loop
+    server_loop = asyncio.get_running_loop()
+
+
 
 class WebSocketLogHandler(logging.Handler):
     def __init__(self, connection_manager: ConnectionManager):
@@ -150,18 +161,108 @@ class WebSocketLogHandler(logging.Handler):
             self.manager.add_log(agent_id, log_message)
             
             # Broadcast to all connected clients
-            asyncio.create_task(self.manager.broadcast({
+            send_to_clients({
                 "type": "log",
                 "agent_id": agent_id,
                 "agent_type": agent_name,
                 "message": log_message,
                 "timestamp": datetime.now().isoformat(),
                 "level": record.levelname
-            }))
+            })
         except Exception:
             self.handleError(record)
 
 
+def send_to_clients(message: dict):
+    """Broadcast from any thread or event loop by handing the send to the server loop"""
+    loop = server_loop
+    if loop is None or loop.is_closed():
+        return
+    asyncio.run_coroutine_threadsafe(manager.broadcast(message), loop)
+
+
+class LLMStreamBuffer:
+    """
+    Collects streamed LLM deltas per agent and flushes them to the clients once per interval.
+    Deep searches stream from worker threads with their own event loops, so nothing here
+    touches the websockets directly: the flush is always scheduled on the server loop.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._scheduled = False
+
+    def add(self, delta: str, info: Dict[str, Any]):
+        loop = server_loop
+        if loop is None or loop.is_closed():
+            return
+        agent_id = info.get('agent_id', 'system')
+        with self._lock:
+            entry = self._pending.setdefault(agent_id, {
+                "agent_type": info.get('agent_name', 'system'),
+                "delta": "",
+                "reset": False,
+            })
+            if info.get('done', False):
+                # The finished call's text is cleared anyway; only the reset has to reach the client
+                entry["delta"] = ""
+                entry["reset"] = True
+            else:
+                entry["delta"] += delta
+            schedule = not self._scheduled
+            self._scheduled = True
+        if schedule:
+            loop.call_soon_threadsafe(loop.call_later, self.interval, self.flush)
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._scheduled = False
+        messages = []
+        timestamp = datetime.now().isoformat()
+        for agent_id, entry in pending.items():
+            if entry["reset"]:
+                messages.append({
+                    "type": "llm_stream",
+                    "agent_id": agent_id,
+                    "agent_type": entry["agent_type"],
+                    "delta": "",
+                    "done": True,
+                    "timestamp": timestamp
+                })
+            if entry["delta"]:
+                messages.append({
+                    "type": "llm_stream",
+                    "agent_id": agent_id,
+                    "agent_type": entry["agent_type"],
+                    "delta": entry["delta"],
+                    "done": False,
+                    "timestamp": timestamp
+                })
+        if messages:
+            asyncio.create_task(self._send(messages))
+
+    @staticmethod
+    async def _send(messages: List[dict]):
+        for message in messages:
+            await manager.broadcast(message)
+
+
+# Same cadence as the frontend's LOG_BATCH_INTERVAL, which re-renders the stream at most that often
+STREAM_FLUSH_INTERVAL = 0.5
+llm_stream_buffer = LLMStreamBuffer(STREAM_FLUSH_INTERVAL)
+
+
+def broadcast_llm_stream(delta: str, info: Dict[str, Any]):
+    """Forward partial LLM output to connected clients (not kept in the log history)"""
+    llm_stream_buffer.add(delta, info)
+
+
+add_stream_listener(broadcast_llm_stream)
+
+
 # Get the base directory for user configs
 USER_CONFIGS_DIR = Path(__file__).parent / "user_configs"
 SYSTEM_CONFIGS_DIR = USER_CONFIGS_DIR / "system"
@@ -590,6 +691,7 @@ async def websocket_logs(websocket: WebSocket):
 
 async def run_report_generation(resume: bool = False):
     """Main report generation logic"""
+    config = None
     try:
         # Prepare config
         config_dict = {
@@ -604,7 +706,8 @@ async def run_report_generation(resume: bool = False):
                     "model_name": llm.model_name,
                     "api_key": llm.api_key,
                     "base_url": llm.base_url,
-                    "generation_params": llm.generation_params or {}
+                    "generation_params": llm.generation_params or {},
+                    "stream": llm.stream if llm.stream is not None else llm.model_name == current_config.ds_model_name
                 }
                 for llm in current_config.llm_configs
             ]
@@ -840,6 +943,10 @@ async def run_report_generation(resume: bool = False):
             "error": str(e),
             "timestamp": datetime.now().isoformat()
         })
+    finally:
+        # Release LLM clients, pooled HTTP connections and browsers of this run
+        if config is not None:
+            await config.close()
 
 
 async def update_agent_status(status: AgentStatus):
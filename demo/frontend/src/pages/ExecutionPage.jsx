@@ -40,11 +40,14 @@ const { Title, Text, Paragraph } = Typography
 const MAX_LOGS_PER_AGENT = 5000
 // Batch update interval for logs (ms)
 const LOG_BATCH_INTERVAL = 500
+// Maximum characters of live (streaming) LLM output kept per agent
+const MAX_STREAM_CHARS = 4000
 
 function ExecutionPage() {
     const [isRunning, setIsRunning] = useState(false)
     const [agents, setAgents] = useState([])
     const [agentLogs, setAgentLogs] = useState({})
+    const [streamText, setStreamText] = useState({})
     const [currentPriority, setCurrentPriority] = useState(null)
     const [loading, setLoading] = useState(false)
     const [activeTab, setActiveTab] = useState('overview')
@@ -54,6 +57,7 @@ function ExecutionPage() {
     const wsRef = useRef(null)
     const logEndRef = useRef({})
     const logBatchRef = useRef({})
+    const streamBatchRef = useRef({})
     const batchTimerRef = useRef(null)
     const scrollTimerRef = useRef(null)
 
@@ -104,6 +108,22 @@ function ExecutionPage() {
                 })
                 logBatchRef.current = {}
             }
+            const streamBatch = streamBatchRef.current
+            if (Object.keys(streamBatch).length > 0) {
+                setStreamText(prev => {
+                    const updated = { ...prev }
+                    for (const [agentId, entry] of Object.entries(streamBatch)) {
+                        const text = ((entry.reset ? '' : updated[agentId] || '') + entry.text).slice(-MAX_STREAM_CHARS)
+                        if (text) {
+                            updated[agentId] = text
+                        } else {
+                            delete updated[agentId]
+                        }
+                    }
+                    return updated
+                })
+                streamBatchRef.current = {}
+            }
         }, LOG_BATCH_INTERVAL)
 
         return () => {
@@ -158,6 +178,19 @@ function ExecutionPage() {
                 })
                 break
 
+            case 'llm_stream': {
+                // Live partial output of the current LLM call; cleared when the call finishes
+                const entry = streamBatchRef.current[data.agent_id] || { text: '', reset: false }
+                if (data.done) {
+                    entry.text = ''
+                    entry.reset = true
+                } else {
+                    entry.text += data.delta
+                }
+                streamBatchRef.current[data.agent_id] = entry
+                break
+            }
+
             case 'agent_status_update':
                 setAgents(prev => prev.map(agent =>
                     agent.agent_id === data.agent.agent_id ? data.agent : agent
@@ -175,7 +208,9 @@ function ExecutionPage() {
             case 'execution_start':
                 setIsRunning(true)
                 setAgentLogs({})
+                setStreamText({})
                 logBatchRef.current = {}
+                streamBatchRef.current = {}
                 message.success(t('execution.messages.startSuccess'))
                 break
 
@@ -484,12 +519,34 @@ function ExecutionPage() {
                                 </Paragraph>
                             </div>
                         ))}
+                        {streamText[agentId] && (
+                            <div
+                                style={{
+                                    padding: '8px',
+                                    borderLeft: '3px dashed #52c41a',
+                                    borderRadius: '4px'
+                                }}
+                            >
+                                <Paragraph
+                                    style={{
+                                        color: '#b5cea8',
+                                        fontFamily: 'monospace',
+                                        fontSize: '13px',
+                                        marginBottom: 0,
+                                        whiteSpace: 'pre-wrap',
+                                        wordBreak: 'break-word'
+                                    }}
+                                >
+                                    {streamText[agentId]}
+                                </Paragraph>
+                            </div>
+                        )}
                         <div ref={el => logEndRef.current[agentId] = el} />
                     </div>
                 )}
             </Card>
         )
-    }, [agentLogs, t])
+    }, [agentLogs, streamText, t])
 
     // Memoize tab items to prevent re-creation
     const tabItems = useMemo(() => {
@@ -4,7 +4,6 @@ import sys
 from pathlib import Path
 import asyncio
 import traceback
-from collections import defaultdict
 import logging
 from dotenv import load_dotenv
 load_dotenv()
@@ -14,6 +13,7 @@ from src.agents import DataCollector, DataAnalyzer, ReportGenerator
 from src.memory import Memory
 from src.utils import setup_logger
 from src.utils import get_logger
+from src.utils import DAGScheduler
 get_logger().set_agent_context('runner', 'main')
 
 IF_RESUME = True
@@ -113,7 +113,7 @@ async def run_report(resume: bool = True, max_concurrent: int = None):
     #     print(item['agent_id'])
     # assert False
     
-    # Prepare prioritized task list (lower value = higher priority)
+    # Prepare task list (lower priority value = earlier)
     tasks_to_run = []
     
     # Data-collection tasks
@@ -183,89 +183,68 @@ async def run_report(resume: bool = True, max_concurrent: int = None):
             priority=task_info['priority'],
             **task_info['agent_kwargs']
         )
-        # Retrieve the persisted priority (may differ on resume)
-        actual_priority = task_info['priority']
-        for saved_task in memory.task_mapping:
-            if saved_task.get('agent_id') == agent.id:
-                actual_priority = saved_task.get('priority', task_info['priority'])
-                break
-        
         agents_info.append({
             'agent': agent,
             'task_input': task_info['task_input'],
-            'priority': actual_priority,
         })
-    
+
+    # Edges: analyzers read the whole collected-data pool (get_collect_data) when they
+    # start, so each waits for every collect task until tasks declare their inputs;
+    # the report waits for every collect and analysis task
+    collector_ids = [info['agent'].id for info in agents_info if isinstance(info['agent'], DataCollector)]
+    analyzer_ids = [info['agent'].id for info in agents_info if isinstance(info['agent'], DataAnalyzer)]
+    for agent_info in agents_info:
+        agent = agent_info['agent']
+        if isinstance(agent, DataAnalyzer):
+            depends_on = list(collector_ids)
+        elif isinstance(agent, ReportGenerator):
+            depends_on = collector_ids + analyzer_ids
+        else:
+            depends_on = []
+        memory.set_task_dependencies(agent.id, depends_on)
 
     memory.save()
     
     
-    # Execute tasks by priority tier (parallel within a tier)
-    agents_info.sort(key=lambda x: x['priority'])
-    
-    # Group tasks by priority
-    priority_groups = defaultdict(list)
+    # Execute as a DAG: each agent starts once its inputs are ready (global concurrency budget)
+    concurrency_info = f" (max concurrent: {max_concurrent})" if max_concurrent else ""
+    logger.info(f"Scheduling {len(agents_info)} task(s) as a dependency graph{concurrency_info}")
+    scheduler = DAGScheduler(max_concurrent=max_concurrent)
     for agent_info in agents_info:
-        priority_groups[agent_info['priority']].append(agent_info)
-    
-    # Execute each priority tier sequentially
-    sorted_priorities = sorted(priority_groups.keys())
-    for priority in sorted_priorities:
-        group = priority_groups[priority]
-        agent_resume = group[0]['task_input']['resume']
-        concurrency_info = f" (max concurrent: {max_concurrent})" if max_concurrent else ""
-        logger.info(f"\nExecuting priority {priority} group ({len(group)} task(s){concurrency_info})")
-        logger.info(f"DEBUG: Tasks in this group: {[ai['agent'].id for ai in group]}")  # 添加这行
-        # Skip tasks that already finished
-        tasks_to_run = []
-        for agent_info in group:
-            agent = agent_info['agent']
-            if agent_resume and resume and memory.is_agent_finished(agent.id):
-                logger.info(f"Agent {agent.id} already completed; skip")
-                continue
-            tasks_to_run.append(agent_info)
-        
-        if not tasks_to_run:
-            logger.info(f"All tasks with priority {priority} are complete")
-            continue
-        
-        # Run tasks within the tier with concurrency limit
-        semaphore = asyncio.Semaphore(max_concurrent) if max_concurrent else None
-        
-        async def run_agent_with_limit(agent_info):
-            """Run agent with semaphore limit if configured"""
-            agent = agent_info['agent']
-            if semaphore:
-                async with semaphore:
-                    logger.info(f"Starting agent {agent.id}")
-                    return await agent.async_run(**agent_info['task_input'])
-            else:
-                logger.info(f"Starting agent {agent.id}")
-                return await agent.async_run(**agent_info['task_input'])
-        
-        # Create tasks
-        async_tasks = []
-        for agent_info in tasks_to_run:
-            async_tasks.append(asyncio.create_task(
-                run_agent_with_limit(agent_info)
-            ))
-        
-        # Wait for completion
-        if async_tasks:
-            results = await asyncio.gather(*async_tasks, return_exceptions=True)
-            for agent_info, result in zip(tasks_to_run, results):
-                agent = agent_info['agent']
-                if isinstance(result, Exception):
-                    # Format full traceback for better debugging
-                    tb_str = ''.join(traceback.format_exception(type(result), result, result.__traceback__))
-                    logger.error(f"  Task failed: Agent {agent.id}, error: {result}\n{tb_str}")
-                else:
-                    logger.info(f"  Task finished: Agent {agent.id}")
-        
-        logger.info(f"Priority {priority} group finished\n")
-    
-    # Persist final state
+        agent = agent_info['agent']
+        agent_resume = agent_info['task_input']['resume']
+        finished = bool(agent_resume and resume and memory.is_agent_finished(agent.id))
+        if finished:
+            logger.info(f"Agent {agent.id} already completed; skip")
+
+        async def run_agent(agent=agent, task_input=agent_info['task_input']):
+            logger.info(f"Starting agent {agent.id}")
+            return await agent.async_run(**task_input)
+
+        dependencies = memory.get_task_dependencies(agent.id)
+        logger.debug(f"Agent {agent.id} depends on {dependencies}")
+        scheduler.add_node(agent.id, run_agent, depends_on=dependencies, skip=finished)
+
+    results = await scheduler.run()
+    for agent_info in agents_info:
+        agent = agent_info['agent']
+        result = results.get(agent.id)
+        if isinstance(result, Exception):
+            # Format full traceback for better debugging
+            tb_str = ''.join(traceback.format_exception(type(result), result, result.__traceback__))
+            logger.error(f"  Task failed: Agent {agent.id}, error: {result}\n{tb_str}")
+        elif not scheduler.nodes[agent.id].skip:
+            logger.info(f"  Task finished: Agent {agent.id}")
+    
+    # Persist final state (also writes the LLM usage summary next to memory.pkl)
     memory.save()
+    usage_totals = config.usage_tracker.summary()['totals']
+    logger.info(
+        f"LLM usage: calls={usage_totals['calls']}, prompt_tokens={usage_totals['prompt_tokens']}, "
+        f"completion_tokens={usage_totals['completion_tokens']}, cache_hit_tokens={usage_totals['cache_hit_tokens']} "
+        f"({usage_totals['cache_hit_rate']:.1%}), retries={usage_totals['retries']}, "
+        f"latency_total={usage_totals['latency_total']}s"
+    )
     logger.info("All tasks completed")
 
 
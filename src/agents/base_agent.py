@@ -7,10 +7,9 @@ import dill
 import uuid
 import re
 import asyncio
-from datetime import datetime
 from src.config import Config
 from src.tools import list_tools, get_tool_by_name
-from src.utils import AsyncCodeExecutor, get_logger
+from src.utils import AsyncCodeExecutor, ConversationLog, get_frame_store, get_logger
 from src.tools.base import Tool
 
 
@@ -52,13 +51,18 @@ class BaseAgent:
         self.cache_dir = os.path.join(self.working_dir, '.cache')
         os.makedirs(self.cache_dir, exist_ok=True)
         
-        self.current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        # One timestamp per run: it sits at the top of every prompt, so a per-agent clock
+        # would break the shared prompt prefix between sibling agents.
+        self.current_time = self.config.run_time
+
+        # DataFrames in checkpoints/executor state are stored once as columnar files, referenced by id
+        self.frame_store = self._get_frame_store(self.config)
 
         self.enable_code = enable_code
         if self.enable_code:
             self.executor_path = os.path.join(self.working_dir, '.executor_cache')
             os.makedirs(self.executor_path, exist_ok=True)
-            self.code_executor = AsyncCodeExecutor(self.executor_path)
+            self.code_executor = AsyncCodeExecutor(self.executor_path, frame_store=self.frame_store)
             self.executor_state_path = os.path.join(self.executor_path, 'state.dill')
         
         self.use_llm_name = use_llm_name
@@ -73,6 +77,7 @@ class BaseAgent:
             self.memory.add_dependency(tool.id, self.id)
         self.current_task_data = {}
         self.current_checkpoint = {}
+        self._conversation_logs: Dict[str, ConversationLog] = {}  # checkpoint_name -> history log
         self._resume_state: Dict[str, Any] | None = None
         self.current_round = 0
         
@@ -83,6 +88,10 @@ class BaseAgent:
     def _set_default_tools(self):
         return []
 
+    @staticmethod
+    def _get_frame_store(config: Config):
+        return get_frame_store(os.path.join(config.working_dir, 'frames'))
+
     def _get_persist_extra_state(self) -> Dict[str, Any]:
         """Hook for subclasses to persist additional state."""
         return {}
@@ -143,7 +152,7 @@ class BaseAgent:
         # Load checkpoint
         try:
             with open(checkpoint_path, 'rb') as f:
-                state = dill.load(f)
+                state = cls._get_frame_store(config).load(f)
         except Exception as e1:
             try:
                 with open(checkpoint_path, 'rb') as f:
@@ -156,6 +165,7 @@ class BaseAgent:
                     f"pickle_error={type(e2).__name__}: {e2}"
                 )
                 return None
+        cls._replay_conversation_log(state, checkpoint_path)
         
         agent_name = state.get('agent_name')
         if not agent_name:
@@ -224,6 +234,24 @@ class BaseAgent:
         restored_agents[agent_id] = agent
         return agent
     
+    @staticmethod
+    def _conversation_log_path(checkpoint_path: str) -> str:
+        return checkpoint_path + '.log'
+
+    @classmethod
+    def _replay_conversation_log(cls, state: Dict[str, Any], checkpoint_path: str):
+        """Rebuild `conversation_history` from the checkpoint's append-only log, if it has one."""
+        marker = state.get('conversation_log')
+        if not marker or 'conversation_history' in state:
+            return
+        log_path = cls._conversation_log_path(checkpoint_path)
+        try:
+            state['conversation_history'] = ConversationLog.replay(log_path, marker)
+        except Exception as e:
+            get_logger().error(
+                f"Failed to replay conversation log: path={log_path}, error={type(e).__name__}: {e}"
+            )
+
     @classmethod
     async def _restore_tools_from_checkpoint(
         cls,
@@ -262,7 +290,7 @@ class BaseAgent:
                 if os.path.exists(dep_checkpoint_path):
                     try:
                         with open(dep_checkpoint_path, 'rb') as f:
-                            dep_state = dill.load(f)
+                            dep_state = cls._get_frame_store(config).load(f)
                         dep_init_params = dep_state.get('init_params', {})
                         # Only pass supported parameters; always forward use_llm_name (can be overridden)
                         dep_kwargs['use_llm_name'] = kwargs.get('use_llm_name', dep_init_params.get('use_llm_name'))
@@ -338,10 +366,25 @@ class BaseAgent:
             self.current_checkpoint.update(state)
         checkpoint.update(self.current_checkpoint)
         target_path = os.path.join(self.cache_dir, checkpoint_name)
+
+        # Conversation history goes to an append-only log (one segment per turn) instead of
+        # being re-dumped in full on every save; the checkpoint only keeps a marker into it.
+        conversation_history = checkpoint.pop('conversation_history', None)
+        if isinstance(conversation_history, list):
+            conversation_log = self._conversation_logs.get(checkpoint_name)
+            if conversation_log is None:
+                conversation_log = ConversationLog(self._conversation_log_path(target_path))
+                self._conversation_logs[checkpoint_name] = conversation_log
+            checkpoint['conversation_log'] = conversation_log.sync(
+                conversation_history,
+                compact=bool(checkpoint.get('finished', False)),
+            )
+        elif conversation_history is not None:
+            checkpoint['conversation_history'] = conversation_history
         tmp_path = target_path + '.tmp'
         try:
             with open(tmp_path, 'wb') as f:
-                dill.dump(checkpoint, f)
+                self.frame_store.dump(checkpoint, f)
             os.replace(tmp_path, target_path)
         except Exception:
             with open(tmp_path, 'wb') as f:
@@ -364,10 +407,11 @@ class BaseAgent:
             return None
         try:
             with open(target_path, 'rb') as f:
-                state = dill.load(f)
+                state = self.frame_store.load(f)
         except Exception:
             with open(target_path, 'rb') as f:
                 state = pickle.load(f)
+        self._replay_conversation_log(state, target_path)
         self.state = state
         # Restore essential fields
         self.current_task_data = state.get('current_task_data', {})
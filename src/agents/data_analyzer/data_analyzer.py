@@ -5,12 +5,14 @@ import json_repair
 import dill
 from typing import List, Dict, Any, Tuple
 import asyncio
-from threading import Semaphore
 from src.agents.base_agent import BaseAgent
 from src.agents import DeepSearchAgent
 from src.tools import ToolResult
 from src.utils import IndexBuilder
 from src.utils import image_to_base64
+from src.utils import AsyncCodeExecutor
+from src.utils import set_usage_phase
+from src.utils.prompt_loader import format_with_stable_prefix
 
 # TODO: Break parameter passing into explicit arguments
 # TODO: Standardize I/O structures as lightweight classes
@@ -63,6 +65,8 @@ class DataAnalyzer(BaseAgent):
  
         self.image_save_dir = os.path.join(self.working_dir, "images")
         os.makedirs(self.image_save_dir, exist_ok = True)
+        # image path -> (mtime_ns, size, base64); shared by the critique loop and caption stage
+        self._image_b64_cache = {}
     
     def _set_default_tools(self):
         """
@@ -124,22 +128,17 @@ class DataAnalyzer(BaseAgent):
         }
         target_language_name = language_mapping.get(target_language, target_language)
 
-        if enable_chart:
-            prompt = self.DATA_ANALYSIS_PROMPT.format(
-                api_descriptions=self.DATA_API_PROMPT,
-                data_info=data_info,
-                current_time=self.current_time,
-                user_query=analysis_task,
-                target_language=target_language_name
-            )
-        else:
-            prompt = self.DATA_ANALYSIS_PROMPT_WO_CHART.format(
-                api_descriptions=self.DATA_API_PROMPT,
-                data_info=data_info,
-                current_time=self.current_time,
-                user_query=analysis_task,
-                target_language=target_language_name
-            )
+        # The analysis task is the only per-agent field; it goes to the tail so that
+        # sibling analyzers share a byte-identical prompt prefix (provider prefix caching).
+        prompt = format_with_stable_prefix(
+            self.DATA_ANALYSIS_PROMPT if enable_chart else self.DATA_ANALYSIS_PROMPT_WO_CHART,
+            ['user_query'],
+            api_descriptions=self.DATA_API_PROMPT,
+            data_info=data_info,
+            current_time=self.current_time,
+            user_query=analysis_task,
+            target_language=target_language_name
+        )
         return [{"role": "user", "content": prompt}]
     
     async def _format_collect_data(self, analysis_task, collect_data_list):
@@ -244,17 +243,16 @@ class DataAnalyzer(BaseAgent):
             pass
         return report_title, report_content
     
-    async def _draw_chart(self, input_data, run_data: dict, max_iterations: int = 3):
+    async def _draw_chart(self, input_data, run_data: dict, max_iterations: int = 3, chart_concurrency: int = None):
         report_content = run_data["report_content"]
         analysis_task = input_data['analysis_task']
-        chart_names = re.findall(r'@import\s+"(.*?)"', report_content)
+        chart_names = list(dict.fromkeys(re.findall(r'@import\s+"(.*?)"', report_content)))
         current_variables = self.code_executor.get_environment_info()
         
         name_mapping = {}  # long chart name -> short filename
         name_description_mapping = {}  # long chart name -> description
         chart_code_mapping = {}  # long chart name -> code snippet
         
-        # Concurrency control semaphore
         charts_completed = set()
         # Load chart-stage checkpoint if available
         charts_ckpt = await self.load(checkpoint_name='charts.pkl')
@@ -265,56 +263,95 @@ class DataAnalyzer(BaseAgent):
             name_description_mapping.update(charts_state.get('name_description_mapping', {}))
             chart_code_mapping.update(charts_state.get('chart_code_mapping', {}))
 
-        for long_chart_name in chart_names:
-            if long_chart_name in charts_completed:
-                continue
-            # TODO: Shared environments need isolation; temporarily limit concurrency to 1
-            with Semaphore(1):
+        async def save_charts_state():
+            await self.save(
+                state={
+                    'charts_state': {
+                        'completed': list(charts_completed),
+                        'name_mapping': name_mapping,
+                        'name_description_mapping': name_description_mapping,
+                        'chart_code_mapping': chart_code_mapping,
+                    }
+                },
+                checkpoint_name='charts.pkl',
+            )
+
+        if chart_concurrency is None:
+            chart_concurrency = self.config.config.get('chart_concurrency', 1)
+        chart_concurrency = max(1, int(chart_concurrency))
+        pending = [name for name in chart_names if name not in charts_completed]
+        self.logger.info(f"Drawing charts: pending={len(pending)}, concurrency={chart_concurrency}")
+        semaphore = asyncio.Semaphore(chart_concurrency)
+
+        async def draw(long_chart_name: str):
+            async with semaphore:
+                # Each chart runs in a forked sandbox so concurrent code cannot clobber shared variables
                 new_chart_code, new_chart_name = await self._draw_single_chart(
                     task = analysis_task,
                     report_content = report_content,
                     chart_name = long_chart_name,
                     current_variables = current_variables, 
-                    max_iterations = max_iterations
+                    max_iterations = max_iterations,
+                    code_executor = self.code_executor.fork(),
                 )
                 name_mapping[long_chart_name] = new_chart_name
                 chart_code_mapping[long_chart_name] = new_chart_code
                 charts_completed.add(long_chart_name)
                 # Save progress after each completed chart (chart-specific checkpoint)
-                await self.save(
-                    state={
-                        'charts_state': {
-                            'completed': list(charts_completed),
-                            'name_mapping': name_mapping,
-                            'name_description_mapping': name_description_mapping,
-                            'chart_code_mapping': chart_code_mapping,
-                        }
-                    },
-                    checkpoint_name='charts.pkl',
-                )
+                await save_charts_state()
+
+        results = await asyncio.gather(*[draw(name) for name in pending], return_exceptions=True)
+        errors = [(name, result) for name, result in zip(pending, results) if isinstance(result, Exception)]
+        for name, error in errors:
+            self.logger.error(f"Failed to draw chart {name}: {error}")
+        if errors:
+            raise errors[0][1]
         
-        for long_chart_name, new_chart_name in name_mapping.items():
-            chart_des = await self._generate_description(new_chart_name)
-            name_description_mapping[long_chart_name] = chart_des
-            # Persist updated description mapping
-            await self.save(
-                state={
-                    'charts_state': {
-                        'completed': list(charts_completed),
-                        'name_mapping': name_mapping,
-                        'name_description_mapping': name_description_mapping,
-                        'chart_code_mapping': chart_code_mapping,
-                    }
-                },
-                checkpoint_name='charts.pkl',
+        # Caption stage: describe charts in batches of `description_concurrency` VLM calls,
+        # persisting charts.pkl once per batch (charts described before a resume are kept)
+        description_concurrency = max(1, int(self.config.config.get('description_concurrency', 4)))
+        to_describe = [name for name in name_mapping if name not in name_description_mapping]
+        for start in range(0, len(to_describe), description_concurrency):
+            batch = to_describe[start:start + description_concurrency]
+            self.logger.info(f"Describing charts {start + 1}-{start + len(batch)} of {len(to_describe)}")
+            results = await asyncio.gather(
+                *[self._generate_description(name_mapping[name]) for name in batch],
+                return_exceptions=True,
             )
+            errors = []
+            for long_chart_name, result in zip(batch, results):
+                if isinstance(result, Exception):
+                    self.logger.error(f"Failed to describe chart {long_chart_name}: {result}")
+                    errors.append(result)
+                else:
+                    name_description_mapping[long_chart_name] = result
+            # Persist updated description mapping
+            await save_charts_state()
+            if errors:
+                raise errors[0]
 
         return chart_code_mapping, name_mapping, name_description_mapping
     
+    def _encode_image(self, image_path: str) -> str:
+        """Base64-encode an image, reusing the previous encoding while the file is unchanged."""
+        try:
+            stat = os.stat(image_path)
+        except OSError:
+            return ""
+        cached = self._image_b64_cache.get(image_path)
+        if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[2]
+        image_b64 = image_to_base64(image_path)
+        if image_b64:
+            self._image_b64_cache[image_path] = (stat.st_mtime_ns, stat.st_size, image_b64)
+        return image_b64
+    
     
     async def _generate_description(self, chart_name: str) -> str:
+        if not chart_name:
+            return ""
         chart_name_path = os.path.join(self.image_save_dir, chart_name)
-        image_b64 = image_to_base64(chart_name_path)
+        image_b64 = self._encode_image(chart_name_path)
         if not image_b64:
             return ""
         
@@ -336,10 +373,12 @@ class DataAnalyzer(BaseAgent):
         report_content: str,
         chart_name: str, 
         current_variables: str,
-        max_iterations: int = 3
+        max_iterations: int = 3,
+        code_executor: AsyncCodeExecutor = None,
     ) -> str:
         """
         Run iterative “code generation → VLM critique” cycles for a single chart.
+        Code runs in `code_executor` (defaults to the agent's own sandbox).
         """
         
         init_prompt = self.DRAW_CHART_PROMPT.format(
@@ -363,7 +402,8 @@ class DataAnalyzer(BaseAgent):
             
             # --- Phase 1: generate/execute code (up to 3 retries) ---
             chart_code, chart_filepath = await self._generate_and_execute_code(
-                conversation_history
+                conversation_history,
+                code_executor=code_executor,
             )
             self.logger.info(f"chart_code: {chart_code}")
             self.logger.info(f"chart_filepath: {chart_filepath}")
@@ -374,7 +414,7 @@ class DataAnalyzer(BaseAgent):
             last_successful_chart_path = chart_filepath
 
             # --- Phase 2: VLM evaluation ---
-            image_b64 = image_to_base64(chart_filepath)
+            image_b64 = self._encode_image(chart_filepath)
             if not image_b64:
                 return last_successful_code, os.path.basename(last_successful_chart_path)
             critic_response = await self.vlm.generate(
@@ -407,13 +447,18 @@ class DataAnalyzer(BaseAgent):
         return last_successful_code, os.path.basename(last_successful_chart_path)
 
 
-    async def _generate_and_execute_code(self, conversation_history: list) -> tuple[str | None, str | None]:
+    async def _generate_and_execute_code(
+        self,
+        conversation_history: list,
+        code_executor: AsyncCodeExecutor = None,
+    ) -> tuple[str | None, str | None]:
         """
         Attempt (up to three times) to generate and execute the chart code.
 
         Returns:
             (llm_response, chart_filepath) on success; otherwise (None, None).
         """
+        code_executor = code_executor or self.code_executor
         for _ in range(3):  # internal retries
             self.logger.info(f"Generating code, attempt {_ + 1}")
             llm_response = await self.llm.generate(
@@ -430,7 +475,7 @@ class DataAnalyzer(BaseAgent):
                 conversation_history.append({"role": "user", "content": "Your reply did not include a valid <execute> code block. Please provide Python code that draws the chart."})
                 continue  # retry
 
-            code_result = await self.code_executor.execute(code=action_content)
+            code_result = await code_executor.execute(code=action_content)
             self.logger.info(f"code_result: {code_result}")
             if code_result['error']:
                 conversation_history.append({"role": "assistant", "content": llm_response})
@@ -491,6 +536,7 @@ class DataAnalyzer(BaseAgent):
 
         # Phase 1: conversational analysis (handled by BaseAgent)
         if self.current_phase == 'phase1':
+            set_usage_phase('analysis')
             run_result = await super().async_run(
                 input_data=input_data,
                 max_iterations=max_iterations,
@@ -525,6 +571,7 @@ class DataAnalyzer(BaseAgent):
 
         # Phase 2: draw charts (separate checkpoint charts.pkl)
         if self.current_phase == 'phase3' and enable_chart:
+            set_usage_phase('charts')
             chart_code_mapping, name_mapping, name_description_mapping = await self._draw_chart(input_data, run_result)
             # Clean up/checkpoint bookkeeping once finished
             self.current_phase = 'phase4'
@@ -3,6 +3,8 @@ import asyncio
 from src.agents.base_agent import BaseAgent
 from src.agents import DeepSearchAgent
 from src.tools import ToolResult, get_tool_categories, get_tool_by_name
+from src.utils import set_usage_phase
+from src.utils.prompt_loader import format_with_stable_prefix
 
 
 class DataCollector(BaseAgent):
@@ -118,7 +120,9 @@ class DataCollector(BaseAgent):
             
         return [{
             "role": "user",
-            "content": self.DATA_COLLECT_PROMPT.format(
+            "content": format_with_stable_prefix(
+                self.DATA_COLLECT_PROMPT,
+                ['task'],
                 api_descriptions=self._get_api_descriptions(),
                 current_time=self.current_time,
                 task=task,
@@ -141,6 +145,7 @@ class DataCollector(BaseAgent):
         # Reset collected-data cache for each run
         self.collected_data_list = []
         self.logger.info(f"DataCollector started: task={input_data.get('task','')} resume={resume}")
+        set_usage_phase('collect')
         await self._prepare_executor()
         run_result = await super().async_run(
             input_data=input_data,
@@ -3,6 +3,8 @@ import asyncio
 import os
 import re
 import copy
+import hashlib
+import threading
 import subprocess
 import numpy as np
 import docx2pdf
@@ -13,6 +15,11 @@ from src.tools import ToolResult, get_tool_categories, get_tool_by_name
 from src.agents.report_generator.report_class import Report, Section
 from src.utils.helper import extract_markdown, get_md_img
 from src.utils.index_builder import IndexBuilder
+from src.utils.llm_usage import set_usage_phase
+from src.utils.prompt_loader import format_with_stable_prefix
+from src.utils.vector_index import greedy_assignment
+from src.utils.code_executor_async import AsyncCodeExecutor
+from src.utils.single_flight import SingleFlight
 from src.utils.figure_helper import draw_kline_chart
 class ReportGenerator(BaseAgent):
     AGENT_NAME = 'report_generator'
@@ -76,8 +83,13 @@ class ReportGenerator(BaseAgent):
         self.use_embedding_name = use_embedding_name
         # Phase checkpoints: outline → sections → post_process
         self._phase: str = 'outline'
-        # Section-level progress counter
-        self._section_index_done: int = 0
+        # Indices of sections already drafted and polished (sections may finish out of order)
+        self._sections_done: set = set()
+        # Sections search on private copies of the shared DeepSearchAgent; this only
+        # guards forking from / merging link state back into the shared instance
+        self._deepsearch_lock = threading.Lock()
+        # Identical searches in flight (same task, section and query) run once
+        self._deepsearch_flight = SingleFlight()
         # Post-process sub-stages: 0-image, 1-abstract/title, 2-cover, 3-reference, 4-render
         self._post_stage: int = 0
         
@@ -128,12 +140,11 @@ class ReportGenerator(BaseAgent):
             if not self.tools or not self.tools[0]:
                 self.logger.error("DeepSearchAgent not found in tools list")
                 return "Error: DeepSearchAgent not available."
-                
-            ds_agent = self.tools[0]
+
             try:
                 # Use run_async_safely to avoid deadlock when called from within an async context
                 from src.utils import run_async_safely
-                output = run_async_safely(ds_agent.async_run(input_data={
+                output = run_async_safely(self._run_deepsearch({
                     'task': self.current_task_data.get('task', ''),
                     'query': query
                 }))
@@ -174,37 +185,55 @@ class ReportGenerator(BaseAgent):
             data_info += f"**分析报告 ID {idx}:**\n{item.brief_str()}\n\n"
         data_info += "\n你可以使用 `get_analysis_result(analysis_result_id)` 在代码中访问这些分析报告。\n"
         
-        if self.enable_chart:
-            return [{
-                "role": "user",
-                "content": self.SECTION_WRITING_PROMPT.format(
-                    task=task,
-                    report_theme=input_data.get('task'),
-                    section_description=section_outline,
-                    data_api=data_api_description,
-                    data_info=data_info,
-                    max_iterations=max_iterations,
-                    target_language=self.target_language_name,
-                    current_time=self.current_time
-                )
-            }]
-        else:
-            return [{
-                "role": "user",
-                "content": self.SECTION_WRITING_WO_CHART_PROMPT.format(
-                    task=task,
-                    report_theme=input_data.get('task'),
-                    section_description=section_outline,
-                    data_api=data_api_description,
-                    data_info=data_info,
-                    max_iterations=max_iterations,
-                    target_language=self.target_language_name,
-                    current_time=self.current_time
-                )
-            }]
+        # Only the section outline differs between sibling sections; keep it at the tail
+        # so every section shares a byte-identical prompt prefix (provider prefix caching).
+        prompt_template = self.SECTION_WRITING_PROMPT if self.enable_chart else self.SECTION_WRITING_WO_CHART_PROMPT
+        return [{
+            "role": "user",
+            "content": format_with_stable_prefix(
+                prompt_template,
+                ['section_description'],
+                task=task,
+                report_theme=input_data.get('task'),
+                section_description=section_outline,
+                data_api=data_api_description,
+                data_info=data_info,
+                max_iterations=max_iterations,
+                target_language=self.target_language_name,
+                current_time=self.current_time
+            )
+        }]
+
+    async def _run_deepsearch(self, input_data: dict) -> dict:
+        """
+        Run one deep search on a fork of the shared DeepSearchAgent, so concurrent
+        sections search in parallel.
+
+        A search is identified by the task, the section it serves and the query:
+        that identity names its resume checkpoint, and identical searches already
+        in flight are shared instead of run twice against the same checkpoint.
+        """
+        scope = '\n'.join([
+            input_data.get('task') or self.current_task_data.get('task', ''),
+            self.current_task_data.get('section_outline', ''),
+            input_data.get('query', ''),
+        ])
+        key = hashlib.sha1(scope.encode('utf-8')).hexdigest()[:16]
+
+        async def search():
+            ds_agent = self.tools[0]
+            with self._deepsearch_lock:
+                worker = ds_agent.fork()
+            try:
+                return await worker.async_run(input_data=input_data, checkpoint_name=f"deepsearch_{key}.pkl")
+            finally:
+                with self._deepsearch_lock:
+                    ds_agent.merge_sources(worker)
+
+        return await self._deepsearch_flight.do(key, search, share=copy.deepcopy)
 
     async def _handle_search_action(self, action_content: str):
-        search_result = await self.tools[0].async_run(input_data={'query': action_content})
+        search_result = await self._run_deepsearch({'query': action_content})
         return {
             'action': 'search',
             'action_content': action_content,
@@ -298,52 +327,39 @@ class ReportGenerator(BaseAgent):
         if len(img_captions) == 0:
             self.logger.warning("No image captions found, skip image path replacement")
             return report
-        self.logger.info(f"Building index for {len(img_captions)} images")
+        # Collect every placeholder occurrence in document order
+        placeholders = []  # (section index, paragraph index, placeholder string)
+        for s_idx, section in enumerate(report.sections):
+            for p_idx, p_paragraph in enumerate(section._content):
+                # Use a non-greedy regex to match individual @import statements
+                for img_name in re.findall(r'@import\s*".*?"', p_paragraph):
+                    placeholders.append((s_idx, p_idx, img_name))
+        if len(placeholders) == 0:
+            return report
+        self.logger.info(f"Matching {len(placeholders)} image placeholders against {len(img_captions)} images")
+
+        # Embed placeholders and captions in one batch, then assign images globally
+        # (highest similarity first, each image used at most once)
         index = IndexBuilder(config=self.config, embedding_model=self.use_embedding_name, working_dir=self.working_dir)
-        await index._build_index(img_captions)
+        queries = [re.sub(r'^@import\s*"(.*)"$', r'\1', img_name, flags=re.DOTALL) for _, _, img_name in placeholders]
+        embeddings = await index.embed_texts(queries + img_captions)
+        query_embeddings, caption_embeddings = embeddings[:len(queries)], embeddings[len(queries):]
+        valid = np.outer(query_embeddings.any(axis=1), caption_embeddings.any(axis=1))
+        assignment = greedy_assignment(query_embeddings @ caption_embeddings.T, mask=valid)
+        if len(placeholders) > len(img_captions):
+            self.logger.info("All available images have been used.")
 
-        used_img_list = []
         figure_idx = 1
-        for section in report.sections:
-            section_new_content = []
-            for p_paragraph in section._content:
-                # Use a non-greedy regex to match individual @import statements
-                match = re.findall(r'@import\s*".*?"', p_paragraph)
-                try:
-                    self.logger.debug(f"Section image placeholders: {len(match)}")
-                except Exception:
-                    pass
-                if match and len(match) > 0:
-                    for img_name in match:
-                        # img_name is the short placeholder string
-                        search_results = await index.search(img_name)
-                        if not search_results:
-                            self.logger.warning(f"No match found for image placeholder: {img_name}")
-                            p_paragraph = p_paragraph.replace(img_name, "")
-                            continue
-                            
-                        most_similar_idx = search_results[0]['id']
-                        detect_img_name = img_captions[most_similar_idx]
-                        detect_img_path = img_paths[most_similar_idx]
-                        
-                        # 使用匹配的图像并将其从可用池中移除
-                        new_string = get_md_img(detect_img_path, remove_suffix(os.path.basename(detect_img_path)), figure_idx)
-                        figure_idx += 1
-                        used_img_list.append(detect_img_name)
-                        p_paragraph = p_paragraph.replace(img_name, new_string)
-
-                        del img_captions[most_similar_idx]
-                        del img_paths[most_similar_idx]
-
-                        if len(img_captions) > 0:
-                            # Rebuild the index after consuming this caption
-                            await index._build_index(img_captions)
-                        else:
-                            # No more images left for future placeholders
-                            self.logger.info("All available images have been used.")
-
-                section_new_content.append(p_paragraph)
-            section._content = section_new_content
+        for (s_idx, p_idx, img_name), img_idx in zip(placeholders, assignment):
+            content = report.sections[s_idx]._content
+            if img_idx < 0:
+                self.logger.warning(f"No match found for image placeholder: {img_name}")
+                content[p_idx] = content[p_idx].replace(img_name, "", 1)
+                continue
+            detect_img_path = img_paths[img_idx]
+            new_string = get_md_img(detect_img_path, remove_suffix(os.path.basename(detect_img_path)), figure_idx)
+            figure_idx += 1
+            content[p_idx] = content[p_idx].replace(img_name, new_string, 1)
         return report
 
     
@@ -478,6 +494,7 @@ class ReportGenerator(BaseAgent):
         """
         collect_data_list = self.memory.get_collect_data() # only use data, without analysis result
         all_data = []
+        seen_content = set()
         for item in collect_data_list:
             # TODO: directly set these keys in ToolResult
             name = item.name + '\n' + item.description # used for index
@@ -491,71 +508,65 @@ class ReportGenerator(BaseAgent):
                 content = f"{title}\n{url}"
 
             # content = item.name + '\n' + item.link  # used for display citation
-            if content not in [ii['content'] for ii in all_data]:
+            if content not in seen_content:
+                seen_content.add(content)
                 all_data.append({
                     'name': name,
                     'content': content 
                 })
         self.logger.info(f"Total data for reference: {len(all_data)}")
         
-        total_corpus = [item['name'] for item in all_data]
-        index = IndexBuilder(config=self.config, embedding_model=self.use_embedding_name, working_dir=self.working_dir)
-        await index._build_index(total_corpus)
+        # Collect the distinct citation placeholders of the whole report
+        cite_pattern = r'\[[Ss]ource[：:]\s*(.*?)\]'
+        queries = list(dict.fromkeys(
+            match_item
+            for section in report.sections
+            for p_paragraph in section._content
+            for match_item in re.findall(cite_pattern, p_paragraph)
+        ))
+        self.logger.debug(f"Citation placeholders: {queries}")
+
+        # Embed corpus and placeholders in one batch, score all pairs with one matrix product
+        cite_map = {}  # placeholder -> corpus ids
+        if queries and all_data:
+            total_corpus = [item['name'] for item in all_data]
+            index = IndexBuilder(config=self.config, embedding_model=self.use_embedding_name, working_dir=self.working_dir)
+            embeddings = await index.embed_texts(total_corpus + queries)
+            corpus_embeddings, query_embeddings = embeddings[:len(total_corpus)], embeddings[len(total_corpus):]
+            score_matrix = query_embeddings @ corpus_embeddings.T
+            score_matrix[:, ~corpus_embeddings.any(axis=1)] = -np.inf
+            top_ids = np.argsort(-score_matrix, axis=1, kind='stable')[:, :5]
+
+            for row, match_item in enumerate(queries):
+                id_list = [int(idx) for idx in top_ids[row] if np.isfinite(score_matrix[row, idx])]
+                if not query_embeddings[row].any() or len(id_list) == 0:
+                    continue
+                score_list = score_matrix[row, id_list]
+                self.logger.debug(f"Score list: {score_list.tolist()}")
+                self.logger.debug(f"ID list: {id_list}")
+                score_list = np.exp(score_list) / np.sum(np.exp(score_list))
+                cite_list = [idx for idx, score in zip(id_list, score_list) if score > 0.2]
+                if len(cite_list) == 0:
+                    # If no item meets threshold, use the top result
+                    cite_list.append(id_list[0])
+                cite_map[match_item] = cite_list
 
+        # Rewrite every paragraph in one pass, numbering sources by first citation
         total_cited_dict = {}
-        for section in report.sections:
-            # Optional: log section length
-            try:
-                self.logger.debug(f"Processing section, content length={len(section.content)}")
-            except Exception:
-                pass
-            section_new_content = []
-            for p_paragraph in section._content:
-                content = p_paragraph
-                # Locate citation placeholders
-                match_list = re.findall(r'\[[Ss]ource[：:]\s*(.*?)\]',content)
-                self.logger.debug(f"Match list: {match_list}")
-                for match_item in match_list:
-                    # Use BM25/embedding search
-                    search_result = await index.search(match_item, top_k=5)
-                    if not search_result:
-                        self.logger.warning(f"No reference data found for citation: {match_item}")
-                        continue
-                        
-                    score_list = [item['score'] for item in search_result]
-                    id_list = [item['id'] for item in search_result]  # Get actual data indices
-                    self.logger.debug(f"Score list: {score_list}")
-                    self.logger.debug(f"ID list: {id_list}")
-                    # Sort by score (descending) and get corresponding indices
-                    sorted_idx = np.argsort(score_list)[::-1]
-                    
-                    if len(sorted_idx) == 0:
-                        continue
-
-                    score_list = np.array(score_list)
-                    score_list = np.exp(score_list) / np.sum(np.exp(score_list))
-
-                    cite_list = []
-                    for pos in sorted_idx:
-                        pos = int(pos)
-                        actual_idx = id_list[pos]  # Get the actual data index
-                        if score_list[pos] > 0.2 and len(cite_list) < 5:
-                            cite_list.append(actual_idx)
-                    if len(cite_list) == 0:
-                        # If no item meets threshold, use the top result
-                        cite_list.append(id_list[sorted_idx[0]])
-                    new_cite_list = []
-                    for idx in cite_list:
-                        if idx not in total_cited_dict:
-                            total_cited_dict[idx] = len(total_cited_dict) + 1
-                    new_cite_list = [total_cited_dict[idx] for idx in cite_list]
-                    # Build the regex for replacement
-                    pattern_to_replace = r'\[[Ss]ource[：:]\s*' + re.escape(match_item) + r'\]'
-                    content = re.sub(pattern_to_replace, f'[{",".join([str(item) for item in new_cite_list])}]', content)
-
-                section_new_content.append(content)
-            section._content = section_new_content
+        def replace_citation(match):
+            cite_list = cite_map.get(match.group(1))
+            if cite_list is None:
+                return match.group(0)
+            for idx in cite_list:
+                if idx not in total_cited_dict:
+                    total_cited_dict[idx] = len(total_cited_dict) + 1
+            return f'[{",".join([str(total_cited_dict[idx]) for idx in cite_list])}]'
 
+        for section in report.sections:
+            section._content = [re.sub(cite_pattern, replace_citation, p_paragraph) for p_paragraph in section._content]
+        for match_item in queries:
+            if match_item not in cite_map:
+                self.logger.warning(f"No reference data found for citation: {match_item}")
 
         reference_str = "## Reference Data Sources\n\n"
         for old_index, new_index in total_cited_dict.items():
@@ -696,7 +707,7 @@ class ReportGenerator(BaseAgent):
         """
         return {
             'phase': getattr(self, '_phase', 'outline'),
-            'section_index': getattr(self, '_section_index_done', 0),
+            'sections_done': sorted(getattr(self, '_sections_done', set())),
             'post_stage': getattr(self, '_post_stage', 0),
         }
 
@@ -711,12 +722,17 @@ class ReportGenerator(BaseAgent):
         if isinstance(phase, str):
             self._phase = phase
         
-        section_index = extra.get('section_index') or state.get('section_index')
-        if section_index is not None:
-            try:
-                self._section_index_done = int(section_index)
-            except Exception:
-                pass
+        sections_done = extra.get('sections_done') or state.get('sections_done')
+        if sections_done is not None:
+            self._sections_done = set(sections_done)
+        else:
+            # Older checkpoints only recorded a contiguous progress pointer
+            section_index = extra.get('section_index') or state.get('section_index')
+            if section_index is not None:
+                try:
+                    self._sections_done = set(range(int(section_index)))
+                except Exception:
+                    pass
         
         post_stage = extra.get('post_stage') or state.get('post_stage')
         if post_stage is not None:
@@ -811,6 +827,88 @@ class ReportGenerator(BaseAgent):
 
 
 
+    def _fork_section_worker(self, idx: int) -> 'ReportGenerator':
+        """
+        Shallow copy of this agent for drafting one section concurrently with others.
+
+        The worker shares config/memory/tools/LLM clients but owns its conversation
+        state and a separate code-executor namespace, so sections cannot clobber
+        each other's variables or checkpoint payloads.
+        """
+        worker = copy.copy(self)
+        worker.state = None
+        worker.current_checkpoint = {}
+        worker._conversation_logs = {}
+        worker.current_task_data = {}
+        worker._resume_state = None
+        if self.enable_code:
+            worker.executor_path = os.path.join(self.working_dir, '.executor_cache', f'section_{idx}')
+            os.makedirs(worker.executor_path, exist_ok=True)
+            worker.code_executor = AsyncCodeExecutor(worker.executor_path, frame_store=self.frame_store)
+            worker.executor_state_path = os.path.join(worker.executor_path, 'state.dill')
+        return worker
+
+    async def _generate_section(
+        self,
+        report: Report,
+        idx: int,
+        input_data: dict,
+        max_iterations: int,
+        stop_words: list[str],
+        echo: bool,
+        resume: bool,
+        checkpoint_name: str,
+    ):
+        """Draft, polish and checkpoint a single section (each section has its own section_{idx}.pkl)."""
+        section = report.sections[idx]
+        section_input_data = input_data.copy()
+        section_input_data['section_outline'] = section.outline
+        self.logger.info(f"[Phase1] Section {idx+1}/{len(report.sections)} start")
+
+        worker = self._fork_section_worker(idx)
+        # 在准备执行器之前设置当前任务数据
+        worker.current_task_data = section_input_data
+        # Prepare executor with data access functions for agentic workflow
+        await worker._prepare_executor()
+
+        section_result = await BaseAgent.async_run(
+            worker,
+            input_data=section_input_data,
+            max_iterations=max_iterations,
+            stop_words=stop_words,
+            echo=echo,
+            resume=resume,
+            checkpoint_name=f'section_{idx}.pkl'
+        )
+        draft_section = section_result['final_result']
+        self.logger.debug(f"[Phase1] Draft section length={len(draft_section)}")
+
+        # Final polish for the section content
+        final_section = await self._final_polish(section_input_data, draft_section)
+        self.logger.debug(f"[Phase1] Final section length={len(final_section)}")
+        self.memory.add_log(
+            id=self.id,
+            type=self.type,
+            input_data=section_input_data,
+            output_data=section_result,
+            error=False,
+            note=f"Report generator executed successfully"
+        )
+        section.set_content(final_section)
+        self._sections_done.add(idx)
+        # Save global progress after each section to resume later
+        await self.save(
+            state={
+                'phase': 'sections',
+                'sections_done': sorted(self._sections_done),
+                'report_obj': report,
+                'input_data': input_data,
+            },
+            checkpoint_name=checkpoint_name,
+        )
+        self.memory.save()
+        self.logger.info(f"[Phase1] Section {idx+1} done, checkpoint saved (sections_done={len(self._sections_done)}/{len(report.sections)})")
+
     async def async_run(
         self, 
         input_data: dict, 
@@ -822,7 +920,8 @@ class ReportGenerator(BaseAgent):
         checkpoint_name: str = 'report_latest.pkl',
         enable_chart = True,
         add_introduction: bool = None,  # None means auto-detect based on target_type
-        add_reference_section: bool = True
+        add_reference_section: bool = True,
+        section_concurrency: int = None,  # None means config['section_concurrency'] (default 1)
     ) -> dict:
         """
         Three-stage execution flow for the report generator:
@@ -832,7 +931,6 @@ class ReportGenerator(BaseAgent):
         """
         # Initialize/restore stage state
         report = None
-        start_index = 0
         self.enable_chart = enable_chart
         input_data['max_iterations'] = max_iterations
         
@@ -853,7 +951,7 @@ class ReportGenerator(BaseAgent):
             if state is not None:
                 # Restore extra metadata
                 self._load_persist_extra_state(state)
-                self.logger.info(f"[Resume] phase={getattr(self, '_phase', None)}, section_index={getattr(self, '_section_index_done', None)}, post_stage={getattr(self, '_post_stage', None)}")
+                self.logger.info(f"[Resume] phase={getattr(self, '_phase', None)}, sections_done={sorted(self._sections_done)}, post_stage={getattr(self, '_post_stage', None)}")
                 
                 # If the workflow already finished, return the saved report
                 if state.get('finished'):
@@ -866,12 +964,12 @@ class ReportGenerator(BaseAgent):
                 restored_report = state.get('report_obj')
                 if restored_report is not None:
                     report = restored_report
-                    start_index = self._section_index_done
-                    self.logger.info(f"[Resume] Restored report object, will resume from section_index={start_index}")
+                    self.logger.info(f"[Resume] Restored report object, sections already done: {sorted(self._sections_done)}")
         
         # Phase 0: outline generation
         if self._phase == 'outline' or report is None:
             self.logger.info("[Phase0] Generating Report Outline")
+            set_usage_phase('outline')
             report = await self.generate_outline(
                 input_data, 
                 max_iterations=max_iterations,
@@ -895,69 +993,39 @@ class ReportGenerator(BaseAgent):
             self.logger.info(f"[Phase0] Completed: outline sections={len(report.sections)}")
 
         
-        # Phase 1: per-section generation
+        # Phase 1: per-section generation (up to `section_concurrency` sections at once)
         if self._phase == 'sections':
-            self.logger.info("[Phase1] Begin generating sections")
-            # TODO: parallel generation of sections
-            for idx, section in enumerate(report.sections):
-                if idx < start_index:
-                    continue
-                section_input_data = input_data.copy()
-                section_input_data['section_outline'] = section.outline
-                self.logger.info(f"[Phase1] Section {idx+1}/{len(report.sections)} start")
-                
-                # 在准备执行器之前设置当前任务数据
-                self.current_task_data = section_input_data
-                
-                # Prepare executor with data access functions for agentic workflow
-                await self._prepare_executor()
+            if section_concurrency is None:
+                section_concurrency = self.config.config.get('section_concurrency', 1)
+            section_concurrency = max(1, int(section_concurrency))
+            pending = [idx for idx in range(len(report.sections)) if idx not in self._sections_done]
+            self.logger.info(f"[Phase1] Begin generating sections: pending={pending}, concurrency={section_concurrency}")
+            set_usage_phase('sections')
+            semaphore = asyncio.Semaphore(section_concurrency)
 
-                
-                # Each section run has its own checkpoint for resume support
-                section_result = await super().async_run(
-                    input_data=section_input_data,
-                    max_iterations=max_iterations,
-                    stop_words=stop_words,
-                    echo=echo,
-                    resume=resume and idx == start_index,
-                    checkpoint_name=f'section_{idx}.pkl'
-                )
-                draft_section = section_result['final_result']
-                self.logger.debug(f"[Phase1] Draft section length={len(draft_section)}")
-                
-                # Final polish for the section content
-                final_section = await self._final_polish(section_input_data, draft_section)
-                self.logger.debug(f"[Phase1] Final section length={len(final_section)}")
-                self.memory.add_log(
-                    id=self.id,
-                    type=self.type,
-                    input_data=section_input_data,
-                    output_data=section_result,
-                    error=False,
-                    note=f"Report generator executed successfully"
-                )
-                section.set_content(final_section) 
-                # Save global progress after each section to resume later
-                await self.save(
-                    state={
-                        'phase': 'sections',
-                        'section_index': idx + 1,
-                        'report_obj': report,
-                        'input_data': input_data,
-                    },
-                    checkpoint_name=checkpoint_name,
-                )
-                self.memory.save()
-                # Update in-memory progress pointer
-                self._section_index_done = idx + 1
-                self.logger.info(f"[Phase1] Section {idx+1} done, checkpoint saved (section_index={self._section_index_done})")
+            async def run_section(idx: int):
+                async with semaphore:
+                    await self._generate_section(
+                        report, idx, input_data,
+                        max_iterations=max_iterations,
+                        stop_words=stop_words,
+                        echo=echo,
+                        resume=resume,
+                        checkpoint_name=checkpoint_name,
+                    )
+
+            results = await asyncio.gather(*[run_section(idx) for idx in pending], return_exceptions=True)
+            errors = [result for result in results if isinstance(result, Exception)]
+            if errors:
+                self.logger.error(f"[Phase1] {len(errors)} section(s) failed; finished sections are checkpointed: {sorted(self._sections_done)}")
+                raise errors[0]
             
             # Move to post-process stage once all sections are done
             self._phase = 'post_process'
             await self.save(
                 state={
                     'phase': self._phase,
-                    'section_index': self._section_index_done,
+                    'sections_done': sorted(self._sections_done),
                     'post_stage': self._post_stage,
                     'report_obj': report,
                     'input_data': input_data,
@@ -970,6 +1038,7 @@ class ReportGenerator(BaseAgent):
         # Phase 2: post processing (resumable)
         if self._phase == 'post_process':
             self.logger.info("[Phase2] Begin post processing")
+            set_usage_phase('post_process')
             report = await self.post_process_report(input_data, report)
             self.memory.save()
             self.logger.info("[Phase2] Completed post processing")
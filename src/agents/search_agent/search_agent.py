@@ -1,3 +1,4 @@
+import copy
 from typing import List, Dict, Any, Tuple
 
 from src.agents.base_agent import BaseAgent
@@ -15,6 +16,7 @@ class DeepSearchAgent(BaseAgent):
         "avoid loose keyword lists).\n"
     )
     NECESSARY_KEYS = ['task', 'query']
+    MAX_CLICKS_PER_ACTION = 5  # links opened concurrently by one <click>
     def __init__(
         self,
         config,
@@ -181,14 +183,48 @@ class DeepSearchAgent(BaseAgent):
             "continue": True
         }
     
+    def _parse_click_urls(self, action_content: str) -> List[str]:
+        """One <click> may list several URLs, separated by newlines or spaces."""
+        return list(dict.fromkeys(url.strip().rstrip(',;') for url in action_content.split() if url.strip()))
+
+    async def _record_click_result(self, click_engine, url: str, click_result) -> str:
+        """Track a finished click as a used source and store it in memory; returns the page content."""
+        content = click_result.content
+        failed = content.startswith("Error fetching content:")
+        if not failed:
+            # Track this as a used source with content summary
+            source_title = self.link2name.get(url, self.valid_links.get(url, {}).get('title', 'Unknown'))
+            self.used_sources[url] = {
+                'title': source_title,
+                'content_preview': content[:500] if len(content) > 500 else content
+            }
+            if click_result.link in self.link2name:
+                click_result.name = self.link2name[click_result.link]
+            if not ('error' in click_result.name.lower()):
+                self.memory.add_data(click_result)
+        self.memory.add_log(
+            id = click_engine.id, 
+            type=click_engine.type,
+            input_data = {'url': url}, 
+            output_data = {"result": content}, 
+            error=failed, 
+            note=f"Click engine {click_engine.name} executed {'failed' if failed else 'successfully'}"
+        )
+        self.logger.info(f"Click action done: url={url}, success={not failed}")
+        return content
+
     async def _handle_click_action(self, action_content):
-        click_engine = [item for item in self.tools if 'content fetcher' in item.name.lower()][0]
-        current_task = self.current_task_data.get('task', '')
-        query = self.current_task_data.get('query', '')
+        click_engine = [item for item in self.tools if isinstance(item, Click)][0]
+        urls = self._parse_click_urls(action_content)
 
-        # Validate that the URL was from search results
-        if action_content not in self.valid_links:
-            self.logger.warning(f"Click rejected: URL not found in search results: {action_content}")
+        # Validate that the URLs were from search results
+        rejected = [url for url in urls if url not in self.valid_links]
+        urls = [url for url in urls if url in self.valid_links]
+        skipped = urls[self.MAX_CLICKS_PER_ACTION:]
+        urls = urls[:self.MAX_CLICKS_PER_ACTION]
+        rejection_note = ""
+        if rejected:
+            self.logger.warning(f"Click rejected: URL not found in search results: {rejected}")
             # Provide available links as guidance
             available_links_hint = ""
             if self.valid_links:
@@ -196,61 +232,53 @@ class DeepSearchAgent(BaseAgent):
                 for idx, (url, info) in enumerate(list(self.valid_links.items())[:10], 1):
                     available_links_hint += f"{idx}. {info['title']}\n   URL: {url}\n"
             
-            result = (
-                f"ERROR: The URL '{action_content}' was not found in your search results. "
+            rejection_note = (
+                f"ERROR: The URL '{', '.join(rejected)}' was not found in your search results. "
                 f"You can ONLY click URLs that appeared in previous search results. "
                 f"Please use one of the URLs from your search results, or perform a new search."
                 f"{available_links_hint}"
             )
+        if not urls:
             return {
                 "action": "click",
                 "action_content": action_content,
-                "result": result,
+                "result": rejection_note or "ERROR: No URL found in <click></click>.",
                 "continue": True
             }
 
+        contents = {}
         try:
-            self.logger.info(f"Click action started: url={action_content}")
-            click_result = await click_engine.api_function([action_content], f'Research goal: {current_task}; query: {query}')
-            if len(click_result) == 0:
-                result = "Failed to fetch content for url: " + action_content
-            else:
-                result = click_result[0].data
-                # Track this as a used source with content summary
-                source_title = self.link2name.get(action_content, self.valid_links.get(action_content, {}).get('title', 'Unknown'))
-                self.used_sources[action_content] = {
-                    'title': source_title,
-                    'content_preview': result[:500] if len(result) > 500 else result
-                }
-                # add to memory - only if we have results
-                if click_result[0].link in self.link2name:
-                    click_result[0].name = self.link2name[click_result[0].link]
-                if not ('error' in click_result[0].name.lower()):
-                    self.memory.add_data(click_result[0])
-            
-            self.memory.add_log(
-                id = click_engine.id, 
-                type=click_engine.type,
-                input_data = {'url': action_content}, 
-                output_data = {"result": result}, 
-                error=False, 
-                note=f"Click engine {click_engine.name} executed successfully"
-            )
-            self.logger.info(f"Click action done: url={action_content}")
-
-            
+            self.logger.info(f"Click action started: urls={urls}")
+            # Record each page as soon as it is fetched
+            async for click_result in click_engine.iter_batch(urls):
+                contents[click_result.link] = await self._record_click_result(click_engine, click_result.link, click_result)
         except Exception as e:
-            result =  "Failed to fetch url: " + action_content + "\n"
-            result += f'Error: {e}'
-            self.memory.add_log(
-                id = click_engine.id, 
-                type=click_engine.type,
-                input_data = {'url': action_content}, 
-                output_data = {"result": result}, 
-                error=True, 
-                note=f"Click engine {click_engine.name} executed failed: {str(e)}"
-            )
-            self.logger.error(f"Click action failed: url={action_content}, error={e}", exc_info=True)
+            for url in urls:
+                if url in contents:
+                    continue
+                contents[url] = "Failed to fetch url: " + url + "\n" + f'Error: {e}'
+                self.memory.add_log(
+                    id = click_engine.id, 
+                    type=click_engine.type,
+                    input_data = {'url': url}, 
+                    output_data = {"result": contents[url]}, 
+                    error=True, 
+                    note=f"Click engine {click_engine.name} executed failed: {str(e)}"
+                )
+            self.logger.error(f"Click action failed: urls={urls}, error={e}", exc_info=True)
+
+        if len(urls) == 1 and not rejected and not skipped:
+            result = contents[urls[0]]
+        else:
+            sections = [
+                f"## [{idx}] {self.link2name.get(url, self.valid_links[url].get('title', 'Unknown'))}\nURL: {url}\n\n{contents[url]}"
+                for idx, url in enumerate(urls, 1)
+            ]
+            result = "\n\n".join(sections)
+            if skipped:
+                result += f"\n\nNOTE: Only {self.MAX_CLICKS_PER_ACTION} links are opened per <click>; not opened: {', '.join(skipped)}"
+            if rejection_note:
+                result += "\n\n" + rejection_note
         
         # On the last iteration, append available sources reminder
         if self.current_round >= (self.max_iterations - 1):
@@ -315,6 +343,31 @@ class DeepSearchAgent(BaseAgent):
         self.used_sources = state.get('used_sources', {})
         self.link2name = state.get('link2name', {})
 
+    def fork(self) -> 'DeepSearchAgent':
+        """
+        Shallow copy for one search running concurrently with others.
+
+        The copy shares config/memory/tools/LLM clients but owns its conversation
+        and link-tracking state; `merge_sources` folds its links back afterwards.
+        """
+        worker = copy.copy(self)
+        worker.state = None
+        worker.current_checkpoint = {}
+        worker._conversation_logs = {}
+        worker.current_task_data = {}
+        worker._resume_state = None
+        worker.current_round = 0
+        worker.link2name = dict(self.link2name)
+        worker.valid_links = dict(self.valid_links)
+        worker.used_sources = dict(self.used_sources)
+        return worker
+
+    def merge_sources(self, worker: 'DeepSearchAgent'):
+        """Fold the links seen and used by a forked search back into this agent."""
+        self.link2name.update(worker.link2name)
+        self.valid_links.update(worker.valid_links)
+        self.used_sources.update(worker.used_sources)
+
     async def async_run(
         self, 
         input_data: dict, 
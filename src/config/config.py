@@ -2,9 +2,17 @@ import json
 import os
 import re
 import yaml
+from datetime import datetime
 from typing import Dict, Any
 from pydantic import ValidationError
-from src.utils import AsyncLLM
+from src.utils import AsyncLLM, ResponseCache, UsageTracker, configure_blocking_pool
+from src.utils.rate_limiter import EndpointLimiter
+from src.utils.context_budget import ContextBudgeter
+from src.tools.data_cache import configure_tool_cache
+from src.tools.web.http_client import configure_http_pool, close_http_pool
+from src.tools.web.browser_pool import configure_browser_pools, close_browser_pools
+from src.tools.web.page_cache import configure_page_cache
+from src.tools.web.search_cache import configure_search_cache
 from src.utils.logger import get_logger
 from .models import AppConfig
 
@@ -16,6 +24,9 @@ class Config:
     """
     def __init__(self, config_file_path=None, config_dict={}):
         try:
+            # 本次运行的时间戳：所有Agent提示词中的“当前时间”统一使用它，保证共享前缀一致
+            self.run_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
             # load default config
             current_path = os.path.dirname(os.path.realpath(__file__))
             default_file_path = os.path.join(current_path, "default_config.yaml")
@@ -32,9 +43,26 @@ class Config:
 
             # 使用 Pydantic 验证配置
             self._validate_config()
+            if self.config.get('run_time'):
+                self.run_time = self.config['run_time']
 
             self._set_dirs()
             self._set_llms()
+            # 工具中的同步调用（akshare/efinance等）统一放到有界线程池执行
+            configure_blocking_pool(self.config.get('tool_max_workers', 16))
+            self._set_tool_cache()
+            self._set_page_cache()
+            self._set_search_cache()
+            configure_http_pool(
+                max_connections_per_host=self.config.get('http_max_connections_per_host', 10),
+                timeout=self.config.get('http_timeout', 15.0),
+                retries=self.config.get('http_retries', 2),
+            )
+            configure_browser_pools(
+                max_concurrency=self.config.get('browser_max_pages', 4),
+                max_uses=self.config.get('browser_max_uses', 50),
+                max_waiting=self.config.get('browser_max_waiting', 16),
+            )
 
             logger.info("配置加载成功")
 
@@ -136,6 +164,8 @@ class Config:
     
     def _set_llms(self):
         llm_config_list = self.config.get('llm_config_list', [])
+        response_cache = self._build_response_cache()
+        self.usage_tracker = UsageTracker()  # 所有 LLM 共享的token/耗时统计
         llm_dict = {}
         for llm_config in llm_config_list:
             model_name = llm_config['model_name']
@@ -143,17 +173,83 @@ class Config:
                 base_url=llm_config['base_url'],
                 api_key=llm_config['api_key'],
                 model_name=model_name,
-                generation_params=llm_config.get('generation_params', {})
+                generation_params=llm_config.get('generation_params', {}),
+                response_cache=response_cache,
+                usage_tracker=self.usage_tracker,
+                stream=llm_config.get('stream', False),
+                rate_limiter=self._build_rate_limiter(llm_config),
+                context_budgeter=ContextBudgeter(llm_config.get('context_window'))
             )
             llm_dict[model_name] = llm
         self.llm_dict = llm_dict
+
+    def _build_rate_limiter(self, llm_config):
+        """按 llm_config_list 中的 rpm / tpm / max_concurrency 创建端点限流器，均未配置时返回 None"""
+        if not any(llm_config.get(key) for key in ('rpm', 'tpm', 'max_concurrency')):
+            return None
+        return EndpointLimiter(
+            name=llm_config['model_name'],
+            rpm=llm_config.get('rpm'),
+            tpm=llm_config.get('tpm'),
+            max_concurrency=llm_config.get('max_concurrency'),
+            min_concurrency=llm_config.get('min_concurrency', 1)
+        )
+
+    def _set_tool_cache(self):
+        """启用（进程内共享、跨运行持久化的）数据源缓存，目录默认 <output_dir>/tool_cache"""
+        if not self.config.get('use_tool_data_cache', True):
+            configure_tool_cache(None)
+            return
+        cache_dir = self.config.get('tool_cache_dir') or os.path.join(self.config['output_dir'], 'tool_cache')
+        configure_tool_cache(cache_dir)
+
+    def _set_page_cache(self):
+        """启用Click的网页缓存（进程内共享、跨运行持久化），目录默认 <output_dir>/page_cache"""
+        if not self.config.get('use_page_cache', True):
+            configure_page_cache(None)
+            return
+        cache_dir = self.config.get('page_cache_dir') or os.path.join(self.config['output_dir'], 'page_cache')
+        configure_page_cache(cache_dir, ttl=self.config.get('page_cache_ttl', 86400))
+
+    def _set_search_cache(self):
+        """启用搜索引擎池的结果缓存（进程内共享、跨运行持久化），目录默认 <output_dir>/search_cache"""
+        if not self.config.get('use_search_cache', True):
+            configure_search_cache(None)
+            return
+        cache_dir = self.config.get('search_cache_dir') or os.path.join(self.config['output_dir'], 'search_cache')
+        configure_search_cache(cache_dir, ttl=self.config.get('search_cache_ttl', 21600))
+
+    def _build_response_cache(self):
+        """按配置创建（所有 LLM 共享的）响应缓存，关闭时返回 None"""
+        cache_mode = self.config.get('llm_cache_mode', 'off')
+        if cache_mode == 'off':
+            return None
+        cache_dir = self.config.get('llm_cache_dir') or os.path.join(self.config['output_dir'], 'llm_cache')
+        logger.info(f"启用 LLM 响应缓存: mode={cache_mode}, dir={cache_dir}")
+        response_cache = ResponseCache(
+            cache_dir,
+            mode=cache_mode,
+            ttl=self.config.get('llm_cache_ttl'),
+            max_bytes=self.config.get('llm_cache_max_mb', 1024) * 1024 * 1024
+        )
+        # 提示词含“当前时间”：录制时记下本次的run_time，回放时沿用（除非配置中显式固定了run_time）
+        if response_cache.read_only:
+            recorded_run_time = response_cache.load_run_time()
+            if recorded_run_time and not self.config.get('run_time'):
+                self.run_time = recorded_run_time
+                logger.info(f"回放模式沿用录制时的运行时间: {recorded_run_time}")
+        else:
+            response_cache.save_run_time(self.run_time)
+        return response_cache
             
     def __str__(self):
         return str(self.config)
 
     async def close(self):
-        """关闭所有 LLM 实例"""
+        """关闭所有 LLM 实例、共享的HTTP连接池与浏览器"""
         if hasattr(self, 'llm_dict'):
             for llm in self.llm_dict.values():
                 if hasattr(llm, 'close'):
                     await llm.close()
+        await close_http_pool()
+        await close_browser_pools()
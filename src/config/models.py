@@ -2,6 +2,7 @@
 Pydantic 配置模型
 提供类型安全的配置验证和自动补全
 """
+from datetime import datetime
 from typing import List, Optional, Dict, Any, Literal
 from pydantic import BaseModel, Field, field_validator, model_validator, ConfigDict
 import os
@@ -26,6 +27,12 @@ class LLMConfig(BaseModel):
         default_factory=LLMGenerationParams,
         description="生成参数"
     )
+    stream: bool = Field(default=False, description="流式生成（客户端检测停止词后立即取消请求）")
+    rpm: Optional[int] = Field(default=None, gt=0, description="每分钟请求数上限（客户端令牌桶）")
+    tpm: Optional[int] = Field(default=None, gt=0, description="每分钟token数上限（客户端令牌桶）")
+    max_concurrency: Optional[int] = Field(default=None, ge=1, description="并发请求上限，遇到429或延迟突增时自适应下调（AIMD）")
+    min_concurrency: int = Field(default=1, ge=1, description="自适应并发的下限")
+    context_window: Optional[int] = Field(default=None, gt=0, description="模型上下文窗口（token），设置后发送前按预算压缩对话历史")
 
     @field_validator('base_url')
     @classmethod
@@ -109,12 +116,60 @@ class AppConfig(BaseModel):
     custom_collect_tasks: List[str] = Field(default_factory=list, description="自定义收集任务")
     custom_analysis_tasks: List[str] = Field(default_factory=list, description="自定义分析任务")
 
+    # 并发配置
+    section_concurrency: int = Field(default=1, ge=1, le=32, description="报告章节并发生成数")
+    chart_concurrency: int = Field(default=1, ge=1, le=16, description="分析图表并发绘制数")
+    description_concurrency: int = Field(default=4, ge=1, le=32, description="图表描述（VLM）并发生成数")
+    tool_max_workers: int = Field(default=16, ge=1, le=128, description="同步数据源调用（akshare/efinance/requests）共享线程池大小")
+
+    # 检索配置
+    memory_ann_threshold: int = Field(default=50000, ge=1, description="Memory向量数达到该值且安装faiss时启用近似最近邻检索")
+
+    # LLM响应缓存配置
+    llm_cache_mode: Literal['off', 'readwrite', 'replay'] = Field(
+        default='off',
+        description="LLM响应磁盘缓存模式：off 关闭，readwrite 读写，replay 只读回放（未命中报错）"
+    )
+    llm_cache_dir: Optional[str] = Field(default=None, description="LLM响应缓存目录，默认 <output_dir>/llm_cache")
+    llm_cache_ttl: Optional[float] = Field(default=None, gt=0, description="LLM响应缓存有效期（秒），为空表示不过期")
+    llm_cache_max_mb: int = Field(default=1024, ge=1, description="LLM响应缓存目录大小上限（MB），超出按LRU淘汰")
+    run_time: Optional[str] = Field(
+        default=None,
+        description="固定提示词中的“当前时间”（如 '2025-01-01 09:00:00'），为空时取启动时间；replay模式下为空时沿用录制时的时间"
+    )
+
+    # 数据源缓存配置
+    use_tool_data_cache: bool = Field(default=True, description="跨运行缓存akshare/efinance等数据源结果（按工具TTL过期）")
+    tool_cache_dir: Optional[str] = Field(default=None, description="数据源缓存目录，默认 <output_dir>/tool_cache")
+    use_page_cache: bool = Field(default=True, description="跨运行缓存Click抓取的网页正文（过期后按ETag/Last-Modified条件请求校验）")
+    page_cache_dir: Optional[str] = Field(default=None, description="网页缓存目录，默认 <output_dir>/page_cache")
+    page_cache_ttl: float = Field(default=86400, gt=0, description="网页缓存免校验的有效期（秒）")
+    use_search_cache: bool = Field(default=True, description="跨运行缓存搜索引擎池的结果，并合并并发的重复查询")
+    search_cache_dir: Optional[str] = Field(default=None, description="搜索结果缓存目录，默认 <output_dir>/search_cache")
+    search_cache_ttl: float = Field(default=21600, gt=0, description="搜索结果缓存有效期（秒）")
+
+    # 网络请求配置
+    http_max_connections_per_host: int = Field(default=10, ge=1, le=100, description="网络搜索/抓取工具对每个host的最大连接数")
+    http_timeout: float = Field(default=15.0, gt=0, description="网络搜索/抓取请求的默认超时（秒）")
+    http_retries: int = Field(default=2, ge=0, le=10, description="连接错误与429/5xx响应的重试次数")
+    browser_max_pages: int = Field(default=4, ge=1, le=32, description="共享浏览器（Playwright/crawl4ai）同时打开的页面数")
+    browser_max_uses: int = Field(default=50, ge=1, description="共享浏览器服务该次数后重启，防止内存膨胀")
+    browser_max_waiting: int = Field(default=16, ge=0, description="等待浏览器的调用数上限，超出直接失败（回退到HTTP抓取）")
+
     # 其他配置
     save_note: Optional[str] = Field(default=None, description="保存备注")
     working_dir: Optional[str] = Field(default=None, description="工作目录（自动生成）")
 
     model_config = ConfigDict(extra="allow")  # 允许额外字段以保持向后兼容
 
+    @field_validator('run_time', mode='before')
+    @classmethod
+    def validate_run_time(cls, v: Any) -> Optional[str]:
+        """YAML 会把未加引号的时间解析为 datetime，统一转回字符串"""
+        if isinstance(v, datetime):
+            return v.strftime("%Y-%m-%d %H:%M:%S")
+        return v
+
     @model_validator(mode='after')
     def validate_config(self):
         """模型级别的验证"""
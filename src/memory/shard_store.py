@@ -0,0 +1,52 @@
+import os
+import uuid
+import dill
+from typing import Any, Iterable, List
+
+
+class ShardStore:
+    """
+    Directory of immutable dill shard files referenced from a Memory manifest.
+
+    Every shard holds a list of items and is written once under a fresh name, so a
+    crash can only leave unreferenced files behind; `cleanup` removes them once the
+    manifest that no longer points at them has been committed.
+    """
+
+    def __init__(self, shard_dir: str, frame_store=None):
+        self.shard_dir = shard_dir
+        self.frame_store = frame_store  # DataFrame payloads are written as columnar files and referenced by id
+        os.makedirs(self.shard_dir, exist_ok=True)
+
+    def write(self, kind: str, items: List[Any]) -> str:
+        name = f"{kind}_{uuid.uuid4().hex}.pkl"
+        path = os.path.join(self.shard_dir, name)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            if self.frame_store is not None:
+                self.frame_store.dump(list(items), f)
+            else:
+                dill.dump(list(items), f)
+        os.replace(tmp_path, path)
+        return name
+
+    def read(self, name: str) -> List[Any]:
+        with open(os.path.join(self.shard_dir, name), 'rb') as f:
+            if self.frame_store is not None:
+                return self.frame_store.load(f)
+            return dill.load(f)
+
+    def read_all(self, names: Iterable[str]) -> List[Any]:
+        items = []
+        for name in names:
+            items.extend(self.read(name))
+        return items
+
+    def cleanup(self, keep: Iterable[str]):
+        keep = set(keep)
+        for name in os.listdir(self.shard_dir):
+            if name not in keep:
+                try:
+                    os.remove(os.path.join(self.shard_dir, name))
+                except OSError:
+                    pass
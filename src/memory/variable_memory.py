@@ -4,6 +4,7 @@ import json
 import dill
 import asyncio
 import datetime
+import threading
 import json_repair
 from dataclasses import dataclass, field
 from typing import List, Dict, Any, Optional, Literal, Type
@@ -14,12 +15,21 @@ from src.tools import ToolResult
 from src.agents import AnalysisResult
 from src.agents.base_agent import BaseAgent
 from src.utils.logger import get_logger
+from src.utils.frame_store import get_frame_store
+from src.utils.vector_index import EmbeddingMatrix
+from src.utils.llm_usage import usage_phase
 from src.utils.prompt_loader import get_prompt_loader
+from src.memory.shard_store import ShardStore
 from src.tools.web.base_search import SearchResult
 from src.tools.web.web_crawler import ClickResult
 from src.agents.search_agent.search_agent import DeepSearchResult
 
 
+MEMORY_FORMAT = 'sharded-v1'
+# Collections persisted as append-only shards; everything else lives in the manifest
+SHARDED_FIELDS = ('log', 'data')
+
+
 class Memory:
     def __init__(
         self,
@@ -30,11 +40,31 @@ class Memory:
         self.save_dir = os.path.join(config.working_dir, "memory")
         os.makedirs(self.save_dir, exist_ok=True)
 
-        self.log = []
-        self.data = []
+        # Sharded collections are loaded lazily (see `_ensure_loaded`)
+        self._log = []
+        self._data = []
+        # name+description -> embedding, as one normalized float32 matrix saved to <stem>_embeddings.npy
+        self._embeddings: Optional[EmbeddingMatrix] = None
+        self._pending_embeddings: Optional[tuple] = None  # (checkpoint_name, legacy shard names) not read yet
+        self._embeddings_saved_to: Optional[str] = None
+        self._pending_shards: Dict[str, tuple] = {}  # field -> (checkpoint_name, shard names) not read yet
+        self._persisted: Dict[str, Dict[str, dict]] = {}  # checkpoint_name -> field -> {container, count, shards, items}
+        self._dirty: set = set()  # collections whose items were modified in place (see `mark_dirty`)
+        self._load_lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        # Secondary indexes, kept in sync incrementally (see `_sync_indexes`)
+        self._index_lock = threading.RLock()
+        self._indexed: Dict[str, tuple] = {}  # collection -> (id(container), indexed count)
+        self._log_by_id: Dict[str, List[dict]] = {}
+        self._log_by_type: Dict[str, List[tuple]] = {}  # type -> [(position, entry)]
+        self._collect_data: List[ToolResult] = []
+        self._analysis_results: List[AnalysisResult] = []
+        self._url2title: Dict[str, str] = {}
+        self._task_by_key: Dict[tuple, dict] = {}  # (task_key, agent_class_name) -> latest task_info
+        self._task_by_agent_id: Dict[str, dict] = {}
+        self._dependency_sets: Dict[str, set] = {}
         self.dependency: Dict[str, List[str]] = {} # parent_agent_id -> [child_agent_id]
         self.task_mapping = [] # [{task_key, agent_class_name, task_input, agent_id, agent_kwargs}, ...]
-        self.data2embedding = {} # name+description -> embedding
         self.generated_analysis_tasks = []
         self.generated_collect_tasks = []
         
@@ -50,45 +80,235 @@ class Memory:
         self.prompt_loader = get_prompt_loader('memory', report_type=report_type)
 
     
+    @property
+    def log(self) -> list:
+        self._ensure_loaded('log')
+        return self._log
+
+    @log.setter
+    def log(self, value: list):
+        self._pending_shards.pop('log', None)
+        self._log = value
+
+    @property
+    def data(self) -> list:
+        self._ensure_loaded('data')
+        return self._data
+
+    @data.setter
+    def data(self, value: list):
+        self._pending_shards.pop('data', None)
+        self._data = value
+
+    @property
+    def embeddings(self) -> EmbeddingMatrix:
+        self._ensure_embeddings()
+        return self._embeddings
+
+    @property
+    def data2embedding(self) -> dict:
+        """Snapshot of the embedding matrix as a dict (kept for backward compatibility)."""
+        embeddings = self.embeddings
+        return {key: embeddings.get(key) for key in embeddings.keys}
+
+    @data2embedding.setter
+    def data2embedding(self, value: dict):
+        self._pending_embeddings = None
+        self._embeddings = self._build_embedding_matrix(value.items())
+
+    def _build_embedding_matrix(self, items) -> EmbeddingMatrix:
+        embeddings = EmbeddingMatrix(ann_threshold=self.config.config.get('memory_ann_threshold', 50000))
+        items = [(key, vector) for key, vector in items if vector is not None and len(vector) > 0]
+        if items:
+            embeddings.add_many([key for key, _ in items], [vector for _, vector in items])
+        return embeddings
+
+    def _embedding_path(self, checkpoint_name: str) -> str:
+        return os.path.join(self.save_dir, f"{os.path.splitext(checkpoint_name)[0]}_embeddings.npy")
+
+    def _ensure_embeddings(self):
+        """Memory-map the embedding matrix on first access (migrating legacy embedding shards)."""
+        if self._embeddings is not None:
+            return
+        with self._load_lock:
+            if self._embeddings is not None:
+                return
+            if self._pending_embeddings is None:
+                self._embeddings = self._build_embedding_matrix([])
+                return
+            checkpoint_name, legacy_shards = self._pending_embeddings
+            path = self._embedding_path(checkpoint_name)
+            embeddings = EmbeddingMatrix.load(path, ann_threshold=self.config.config.get('memory_ann_threshold', 50000))
+            self._embeddings_saved_to = path if len(embeddings) else None
+            if legacy_shards:
+                legacy = self._shard_store(checkpoint_name).read_all(legacy_shards)
+                legacy = [(key, vector) for key, vector in legacy if key not in embeddings and vector is not None and len(vector) > 0]
+                if legacy:
+                    embeddings.add_many([key for key, _ in legacy], [vector for _, vector in legacy])
+            self._embeddings = embeddings
+            self._pending_embeddings = None
+            self.logger.debug(f"Memory embeddings loaded: rows={len(embeddings)}, dim={embeddings.dim}")
+
+    def _shard_store(self, checkpoint_name: str) -> ShardStore:
+        return ShardStore(
+            os.path.join(self.save_dir, f"{os.path.splitext(checkpoint_name)[0]}_shards"),
+            frame_store=get_frame_store(os.path.join(self.config.working_dir, 'frames')),
+        )
+
+    def _ensure_loaded(self, field_name: str):
+        """Read the shards of a lazily loaded collection on first access."""
+        if field_name not in self._pending_shards:
+            return
+        with self._load_lock:
+            pending = self._pending_shards.get(field_name)
+            if pending is None:
+                return
+            checkpoint_name, shard_names = pending
+            container = self._shard_store(checkpoint_name).read_all(shard_names)
+            setattr(self, f'_{field_name}', container)
+            persisted = self._persisted.get(checkpoint_name, {}).get(field_name)
+            if persisted is not None:
+                persisted['container'] = id(container)
+                persisted['items'] = list(container)
+            del self._pending_shards[field_name]
+            self.logger.debug(f"Memory shards loaded: field={field_name}, shards={len(shard_names)}, items={len(container)}")
+
     def save(self, checkpoint_name: str = 'memory.pkl'):
         """
         Persist memory state to a checkpoint.
+
+        The checkpoint file is a small manifest; `log` and `data` are stored as
+        immutable shard files and only items added since the previous save are written
+        (one shard per data item, one shard per batch of log entries). A collection
+        that was replaced, shrunk, had an already saved item swapped for another
+        object, or was flagged with `mark_dirty` is rewritten in full. Embeddings are
+        written as a float32 `.npy` matrix only when new vectors were added.
         """
         # Note: agent instances themselves are not saved—only metadata.
         # Agents are reloaded on demand from their checkpoints.
-        memory_state = {
-            'log': self.log,
-            'data': self.data,
-            'dependency': self.dependency,
-            'task_mapping': self.task_mapping,
-            'data2embedding': {k: v.tolist() if isinstance(v, np.ndarray) else v 
-                              for k, v in self.data2embedding.items()},
-            'generated_analysis_tasks': self.generated_analysis_tasks,
-            'generated_collect_tasks': self.generated_collect_tasks,
-        }
-        target_path = os.path.join(self.save_dir, checkpoint_name)
-        tmp_path = target_path + '.tmp'
-        try:
-            self.logger.info(f"Memory save start: path={target_path}, log={len(self.log)}, data={len(self.data)}, tasks={len(self.task_mapping)}")
-        except Exception:
-            pass
-        
-        try:
-            with open(tmp_path, 'wb') as f:
-                dill.dump(memory_state, f)
-            os.replace(tmp_path, target_path)
+        with self._save_lock:
+            target_path = os.path.join(self.save_dir, checkpoint_name)
+            tmp_path = target_path + '.tmp'
+            store = self._shard_store(checkpoint_name)
+            previous = self._persisted.get(checkpoint_name, {})
+            for field_name, (pending_checkpoint, _) in list(self._pending_shards.items()):
+                if pending_checkpoint != checkpoint_name:
+                    self._ensure_loaded(field_name)
+            if self._pending_embeddings is not None and (
+                self._pending_embeddings[0] != checkpoint_name or self._pending_embeddings[1]
+            ):
+                self._ensure_embeddings()
+
+            memory_state = {
+                'format': MEMORY_FORMAT,
+                'dependency': self.dependency,
+                'task_mapping': self.task_mapping,
+                'generated_analysis_tasks': self.generated_analysis_tasks,
+                'generated_collect_tasks': self.generated_collect_tasks,
+                'shards': {},
+                'counts': {},
+            }
+            persisted = {}
+            rewritten = False
+            written = 0
             try:
-                file_size = os.path.getsize(target_path) if os.path.exists(target_path) else 0
-                self.logger.info(f"Memory saved: path={target_path}, size={file_size} bytes")
-            except Exception:
-                pass
-        except Exception as e:
-            self.logger.error(f"Failed to save memory state: {e}", exc_info=True)
-            raise
+                for field_name in SHARDED_FIELDS:
+                    if field_name in self._pending_shards and field_name not in self._dirty:
+                        # Never accessed since load, so nothing can have been added
+                        persisted[field_name] = dict(previous[field_name])
+                    else:
+                        self._ensure_loaded(field_name)
+                        container = getattr(self, f'_{field_name}')
+                        items = list(container)
+                        prev = previous.get(field_name)
+                        if prev and field_name not in self._dirty and self._is_prefix(prev, container, items):
+                            shard_names = list(prev['shards'])
+                            new_items = items[prev['count']:]
+                        else:
+                            shard_names = []
+                            new_items = items
+                            rewritten = rewritten or bool(prev)
+                        if new_items:
+                            if field_name == 'data':
+                                shard_names.extend(store.write(field_name, [item]) for item in new_items)
+                            else:
+                                shard_names.append(store.write(field_name, new_items))
+                            written += len(new_items)
+                        persisted[field_name] = {
+                            'container': id(container),
+                            'count': len(items),
+                            'shards': shard_names,
+                            'items': items,
+                        }
+                    memory_state['shards'][field_name] = persisted[field_name]['shards']
+                    memory_state['counts'][field_name] = persisted[field_name]['count']
+
+                embedding_path = self._embedding_path(checkpoint_name)
+                if self._embeddings is not None:
+                    if len(self._embeddings) and (self._embeddings.dirty or self._embeddings_saved_to != embedding_path):
+                        self._embeddings.save(embedding_path)
+                        self._embeddings_saved_to = embedding_path
+                        rewritten = True  # drops legacy embedding shards, if any
+                    memory_state['counts']['embeddings'] = len(self._embeddings)
+                memory_state['embeddings'] = os.path.basename(embedding_path) if os.path.exists(embedding_path) else None
+
+                self.logger.info(f"Memory save start: path={target_path}, counts={memory_state['counts']}, tasks={len(self.task_mapping)}, new_items={written}")
+                with open(tmp_path, 'wb') as f:
+                    dill.dump(memory_state, f)
+                os.replace(tmp_path, target_path)
+                self._persisted[checkpoint_name] = persisted
+                self._dirty.clear()
+                if rewritten or not previous:
+                    store.cleanup(name for info in persisted.values() for name in info['shards'])
+                try:
+                    file_size = os.path.getsize(target_path) if os.path.exists(target_path) else 0
+                    self.logger.info(f"Memory saved: path={target_path}, manifest_size={file_size} bytes")
+                except Exception:
+                    pass
+                self._save_usage_summary()
+            except Exception as e:
+                self.logger.error(f"Failed to save memory state: {e}", exc_info=True)
+                raise
     
+    @staticmethod
+    def _is_prefix(prev: dict, container: list, items: list) -> bool:
+        """Whether the saved items are still, object for object, the head of `container`."""
+        saved = prev.get('items')
+        return (
+            prev['container'] == id(container)
+            and saved is not None
+            and len(saved) <= len(items)
+            and all(old is new for old, new in zip(saved, items))
+        )
+
+    def mark_dirty(self, field_name: str):
+        """
+        Flag `log` or `data` as modified in place (an item's contents changed), so
+        the next `save` rewrites it in full. Appending via `add_log`/`add_data`,
+        assigning a new list, or replacing an item with another object is detected
+        without this.
+        """
+        if field_name not in SHARDED_FIELDS:
+            raise ValueError(f"Unknown memory collection: {field_name}")
+        self._dirty.add(field_name)
+
+    def _save_usage_summary(self):
+        """Write the LLM usage summary of this run next to the memory checkpoint."""
+        usage_tracker = getattr(self.config, 'usage_tracker', None)
+        if usage_tracker is None:
+            return
+        try:
+            usage_tracker.save(os.path.join(self.save_dir, 'llm_usage.json'))
+        except Exception as e:
+            self.logger.warning(f"Failed to save LLM usage summary: {e}")
+
     def load(self, checkpoint_name: str = 'memory.pkl'):
         """
         Load memory state from a checkpoint.
+
+        Only the manifest is read here; shard payloads are read on first access.
+        Legacy single-file checkpoints are loaded eagerly and rewritten as shards on
+        the next save.
         """
         target_path = os.path.join(self.save_dir, checkpoint_name)
         if not os.path.exists(target_path):
@@ -102,22 +322,44 @@ class Memory:
             with open(target_path, 'rb') as f:
                 memory_state = dill.load(f)
             
-            self.log = memory_state.get('log', [])
-            self.data = memory_state.get('data', [])
             self.dependency = memory_state.get('dependency', {})
             self.task_mapping = memory_state.get('task_mapping', [])
-            # Restore embeddings (convert lists back to numpy arrays)
-            data2embedding_raw = memory_state.get('data2embedding', {})
-            self.data2embedding = {k: np.array(v) if isinstance(v, list) else v 
-                                  for k, v in data2embedding_raw.items()}
             self.generated_analysis_tasks = memory_state.get('generated_analysis_tasks', [])
             self.generated_collect_tasks = memory_state.get('generated_collect_tasks', [])
+            if memory_state.get('format') == MEMORY_FORMAT:
+                counts = memory_state.get('counts', {})
+                shards = memory_state.get('shards', {})
+                self._persisted[checkpoint_name] = {}
+                for field_name in SHARDED_FIELDS:
+                    shard_names = list(shards.get(field_name, []))
+                    setattr(self, field_name, [])
+                    self._pending_shards[field_name] = (checkpoint_name, shard_names)
+                    self._persisted[checkpoint_name][field_name] = {
+                        'container': None,
+                        'count': counts.get(field_name, 0),
+                        'shards': shard_names,
+                        'items': None,
+                    }
+                self._embeddings = None
+                self._pending_embeddings = (checkpoint_name, list(shards.get('data2embedding', [])))
+            else:
+                counts = None
+                self.log = memory_state.get('log', [])
+                self.data = memory_state.get('data', [])
+                # Restore embeddings into the matrix (legacy checkpoints store them as lists)
+                self.data2embedding = memory_state.get('data2embedding', {})
+                self._persisted.pop(checkpoint_name, None)
+            self._dirty.clear()
             # Reset agent caches; they will be reloaded on demand
             self._agents = {}
             self._restored_agents = {}
+            self._dependency_sets = {}
             
             try:
-                self.logger.info(f"Memory loaded: log={len(self.log)}, data={len(self.data)}, tasks={len(self.task_mapping)}")
+                if counts is not None:
+                    self.logger.info(f"Memory loaded (lazy): log={counts.get('log', 0)}, data={counts.get('data', 0)}, tasks={len(self.task_mapping)}")
+                else:
+                    self.logger.info(f"Memory loaded: log={len(self.log)}, data={len(self.data)}, tasks={len(self.task_mapping)}")
             except Exception:
                 pass
             return True
@@ -125,6 +367,54 @@ class Memory:
             self.logger.error(f"Failed to load memory state: {e}", exc_info=True)
             return False
 
+    def _sync_index(self, name: str, container: list, reset, add):
+        """Index items appended to `container` since the last sync; rebuild if it was replaced or shrunk."""
+        container_id, count = self._indexed.get(name, (None, 0))
+        if container_id != id(container) or count > len(container):
+            reset()
+            count = 0
+        for position in range(count, len(container)):
+            add(position, container[position])
+        self._indexed[name] = (id(container), len(container))
+
+    def _reset_log_index(self):
+        self._log_by_id = {}
+        self._log_by_type = {}
+
+    def _index_log_entry(self, position: int, entry: dict):
+        self._log_by_id.setdefault(entry.get('id'), []).append(entry)
+        self._log_by_type.setdefault(entry.get('type') or '', []).append((position, entry))
+
+    def _reset_data_index(self):
+        self._collect_data = []
+        self._analysis_results = []
+        self._url2title = {}
+
+    def _index_data_item(self, position: int, item: Any):
+        if isinstance(item, ToolResult) and not isinstance(item, DeepSearchResult):
+            self._collect_data.append(item)
+        if isinstance(item, AnalysisResult):
+            self._analysis_results.append(item)
+        if isinstance(item, SearchResult):
+            self._url2title[item.link] = item.name
+
+    def _reset_task_index(self):
+        self._task_by_key = {}
+        self._task_by_agent_id = {}
+
+    def _index_task(self, position: int, task_info: dict):
+        self._task_by_key[(task_info.get('task_key'), task_info.get('agent_class_name'))] = task_info
+        self._task_by_agent_id.setdefault(task_info.get('agent_id'), task_info)
+
+    def _sync_indexes(self, *names: str):
+        with self._index_lock:
+            if 'log' in names:
+                self._sync_index('log', self.log, self._reset_log_index, self._index_log_entry)
+            if 'data' in names:
+                self._sync_index('data', self.data, self._reset_data_index, self._index_data_item)
+            if 'task_mapping' in names:
+                self._sync_index('task_mapping', self.task_mapping, self._reset_task_index, self._index_task)
+
     def _get_task_key(self, agent_class: Type[BaseAgent], task_input: dict) -> str:
         """Generate a unique identifier for the agent/task combination."""
         input_data = task_input.get('input_data', {})
@@ -170,13 +460,12 @@ class Memory:
         saved_task_info = None
         
         if resume:
-            for task_info in self.task_mapping[::-1]:
-                if (task_info.get('task_key') == task_key and 
-                    task_info.get('agent_class_name') == agent_class.AGENT_NAME):
-                    agent_id = task_info.get('agent_id')
-                    saved_task_info = task_info
-                    self.logger.info(f"Find {agent_id} in task_mapping")
-                    break
+            self._sync_indexes('task_mapping')
+            task_info = self._task_by_key.get((task_key, agent_class.AGENT_NAME))
+            if task_info is not None:
+                agent_id = task_info.get('agent_id')
+                saved_task_info = task_info
+                self.logger.info(f"Find {agent_id} in task_mapping")
         
         # Attempt to restore an agent if possible
         agent = None
@@ -248,6 +537,7 @@ class Memory:
                 'priority': priority,  # persisted priority
             }
             self.task_mapping.append(task_info)
+            self._sync_indexes('task_mapping')
         else:
             # During resume: prefer saved priority; fallback to incoming value
             if saved_task_info:
@@ -266,7 +556,42 @@ class Memory:
     def get_tasks_by_priority(self) -> List[Dict[str, Any]]:
         """Return task metadata sorted by priority (lower value first)."""
         return sorted(self.task_mapping, key=lambda x: x.get('priority', 0))
-    
+
+    def set_task_dependencies(self, agent_id: str, depends_on: List[str]):
+        """Record the agent ids whose outputs the given task consumes."""
+        self._sync_indexes('task_mapping')
+        task_info = self._task_by_agent_id.get(agent_id)
+        if task_info is None:
+            return False
+        task_info['depends_on'] = list(depends_on)
+        return True
+
+    def get_task_dependencies(self, agent_id: str) -> List[str]:
+        """
+        Return the agent ids a task must wait for before it can start.
+
+        Explicit `depends_on` entries in task_mapping take precedence; otherwise the
+        task waits for every task in the nearest lower priority tier. Tool/sub-agent
+        edges from `self.dependency` are excluded, since those run inside their parent.
+        """
+        self._sync_indexes('task_mapping')
+        task_info = self._task_by_agent_id.get(agent_id)
+        if task_info is None:
+            return []
+        children = set(self.dependency.get(agent_id, []))
+        if 'depends_on' in task_info:
+            return [dep for dep in task_info['depends_on'] if dep not in children]
+
+        priority = task_info.get('priority', 0)
+        lower_priorities = {item.get('priority', 0) for item in self.task_mapping if item.get('priority', 0) < priority}
+        if not lower_priorities:
+            return []
+        nearest = max(lower_priorities)
+        return [
+            item['agent_id'] for item in self.task_mapping
+            if item.get('priority', 0) == nearest and item.get('agent_id') not in children
+        ]
+
     def get_agent(self, agent_id: str) -> Optional[BaseAgent]:
         """Retrieve an agent instance by id."""
         return self._agents.get(agent_id)
@@ -283,60 +608,70 @@ class Memory:
         
         try:
             with open(checkpoint_path, 'rb') as f:
-                state = dill.load(f)
+                state = agent.frame_store.load(f)
             return state.get('finished', False)
         except Exception:
             return False
         
         
     def add_data(self, data: Any):
-        self.data.append(data)
+        with self._index_lock:
+            self.data.append(data)
+            self._sync_indexes('data')
         return True
 
     def add_dependency(self, child_id: str, parent_id: str):
-        if parent_id not in self.dependency:
-            self.dependency[parent_id] = []
-        if child_id not in self.dependency[parent_id]:
-            self.dependency[parent_id].append(child_id)
+        with self._index_lock:
+            children = self.dependency.setdefault(parent_id, [])
+            child_set = self._dependency_sets.get(parent_id)
+            if child_set is None or len(child_set) != len(children):
+                child_set = set(children)
+                self._dependency_sets[parent_id] = child_set
+            if child_id not in child_set:
+                children.append(child_id)
+                child_set.add(child_id)
         return True
 
     def add_log(self, id: str, type: str, input_data: dict, output_data: dict, error: bool = False, note: str = ''):
-        self.log.append({
-            'timestamp': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'id': id,
-            'type': type,
-            'input_data': input_data,
-            'output_data': output_data,
-            'error': error,
-            'note': note
-        })
+        with self._index_lock:
+            self.log.append({
+                'timestamp': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'id': id,
+                'type': type,
+                'input_data': input_data,
+                'output_data': output_data,
+                'error': error,
+                'note': note
+            })
+            self._sync_indexes('log')
         return True
     
     def get_log(self, parent_id: str, key: str=None):
+        self._sync_indexes('log')
         child_list = self.dependency.get(parent_id, [])
         return_log = []
         for child_id in child_list:
             if key is not None:
                 if key not in child_id:
                     continue
-            child_log = [item for item in self.log if item['id'] == child_id]
-            return_log.extend(child_log)
+            return_log.extend(self._log_by_id.get(child_id, []))
         return return_log
     
     def get_log_by_type(self, input_type: str):
-        return [item for item in self.log if input_type in item['type']]
+        self._sync_indexes('log')
+        matched = [entries for log_type, entries in self._log_by_type.items() if input_type in log_type]
+        if len(matched) == 1:
+            return [entry for _, entry in matched[0]]
+        return [entry for _, entry in sorted((pair for entries in matched for pair in entries), key=lambda pair: pair[0])]
 
     def get_url_title(self, url: str):
-        # select search result in data
-        search_result = [item for item in self.data if isinstance(item, SearchResult)]
-        url2title = {}
-        for item in search_result:
-            url2title[item.link] = item.name
-        return url2title.get(url, '')
+        # title of the URL from search results in data (latest wins)
+        self._sync_indexes('data')
+        return self._url2title.get(url, '')
 
     def get_collect_data(self, exclude_type: List[str] = []):
-        collected_data = [item for item in self.data if isinstance(item, ToolResult)]
-        collected_data = [item for item in collected_data if not isinstance(item, DeepSearchResult)]
+        self._sync_indexes('data')
+        collected_data = list(self._collect_data)
         
         if exclude_type != []:
             for exclude_type_item in exclude_type:
@@ -347,7 +682,8 @@ class Memory:
         return collected_data
     
     def get_analysis_result(self):
-        return [item for item in self.data if isinstance(item, AnalysisResult)]
+        self._sync_indexes('data')
+        return list(self._analysis_results)
 
     def get_formatted_analysis_result(self, analysis_result_list: List[AnalysisResult] = None):
         if analysis_result_list is None:
@@ -378,7 +714,8 @@ class Memory:
             data_description = self.get_formatted_data_description(),
             section_description = query,
         )
-        output = await model.generate(messages=[{"role": "user", "content": prompt}], response_format={"type": "json_object"})
+        with usage_phase('data_selection'):
+            output = await model.generate(messages=[{"role": "user", "content": prompt}], response_format={"type": "json_object"})
         
         if output is not None:
             match = re.search(r'```json([\s\S]*?)```', output)
@@ -398,7 +735,8 @@ class Memory:
             analysis_description = self.get_formatted_analysis_result(),
             section_description = query,
         )
-        output = await model.generate(messages=[{"role": "user", "content": prompt}], response_format={"type": "json_object"})
+        with usage_phase('data_selection'):
+            output = await model.generate(messages=[{"role": "user", "content": prompt}], response_format={"type": "json_object"})
         if output is not None:
             match = re.search(r'```json([\s\S]*?)```', output)
             if match:
@@ -418,25 +756,19 @@ class Memory:
             return collect_data_list
 
         # Embed entries that lack vector representations
-        need_to_embed_data = []
-        for item in collect_data_list:
-            key = item.name + item.description
-            if key not in self.data2embedding:
-                need_to_embed_data.append(item)
+        embeddings = self.embeddings
+        keys = [item.name + item.description for item in collect_data_list]
+        need_to_embed_data = {}
+        for key, item in zip(keys, collect_data_list):
+            if key not in embeddings and key not in need_to_embed_data:
+                need_to_embed_data[key] = item
         if len(need_to_embed_data) > 0:
-            embedding_list = await self.embedding_model.generate_embeddings([item.brief_str() for item in need_to_embed_data])
-            for i, item in enumerate(need_to_embed_data):
-                key = item.name + item.description
-                self.data2embedding[key] = np.array(embedding_list[i])
+            embedding_list = await self.embedding_model.generate_embeddings([item.brief_str() for item in need_to_embed_data.values()])
+            embeddings.add_many(list(need_to_embed_data.keys()), embedding_list)
         
-        # Perform semantic search
+        # Perform semantic search over the rows of the current collect data
         query_embedding = await self.embedding_model.generate_embeddings([query])
-        query_embedding = query_embedding[0]
-        query_embedding = np.array(query_embedding)
-
-        data_embeddings = [self.data2embedding[item.name + item.description] for item in collect_data_list]
-        distances = np.dot(data_embeddings, query_embedding)
-        top_k_indices = np.argsort(distances)[::-1][:top_k]
+        top_k_indices, _ = embeddings.search(query_embedding[0], top_k=top_k, rows=embeddings.rows(keys))
         top_k_data = [collect_data_list[i] for i in top_k_indices]
         return top_k_data
     
@@ -465,7 +797,8 @@ class Memory:
             existing_tasks=existing_tasks_str,
             max_num=max_num,
         )
-        output = await llm.generate(messages=[{"role": "user", "content": prompt}], response_format={"type": "json_object"})
+        with usage_phase('task_generation'):
+            output = await llm.generate(messages=[{"role": "user", "content": prompt}], response_format={"type": "json_object"})
         output = json_repair.loads(output)
         
         # Handle both list and dict responses
@@ -502,7 +835,8 @@ class Memory:
             existing_tasks=existing_tasks_str,
             max_num=max_num,
         )
-        output = await llm.generate(messages=[{"role": "user", "content": prompt}], response_format={"type": "json_object"})
+        with usage_phase('task_generation'):
+            output = await llm.generate(messages=[{"role": "user", "content": prompt}], response_format={"type": "json_object"})
         output = json_repair.loads(output)
         
         # Handle both list and dict responses
@@ -1,9 +1,11 @@
 import pandas as pd
 import uuid
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 from pydantic import BaseModel, Field, ConfigDict, model_validator
 from ..utils.retry import async_retry, async_safe_execute
 from ..utils.logger import get_logger
+from ..utils.async_helpers import run_blocking
+from .data_cache import get_tool_cache, make_data_key
 
 logger = get_logger()
 
@@ -11,14 +13,20 @@ class Tool:
     """
     工具基类，提供统一的工具接口和错误处理
 
-    所有工具都应该继承此类并实现 api_function 方法
+    所有工具都应该继承此类并实现 api_function 方法；
+    akshare/efinance/requests 等同步调用必须经 `run_sync` 放到线程池执行，不能直接阻塞事件循环；
+    设置了 `cache_ttl` 的工具，其返回DataFrame的同步调用结果会写入跨运行共享的数据源缓存（见 data_cache.py）
     """
+    DEFAULT_TIMEOUT = 60.0  # 单次同步调用的默认超时（秒）
+
     def __init__(
         self,
         name: str,
         description: str,
         parameters: List[Dict[str, Any]],
-        max_retries: int = 3
+        max_retries: int = 3,
+        timeout: Optional[float] = DEFAULT_TIMEOUT,
+        cache_ttl: Optional[float] = None
     ):
         self.name = name
         self.type = f'tool_{name}'
@@ -26,6 +34,8 @@ class Tool:
         self.short_description = description
         self.parameters = parameters
         self.max_retries = max_retries
+        self.timeout = timeout
+        self.cache_ttl = cache_ttl  # 数据源缓存有效期（秒），None 表示不缓存
 
     def prepare_params(self, task) -> dict:
         """
@@ -47,6 +57,24 @@ class Tool:
         """
         raise NotImplementedError
 
+    async def run_sync(self, func: Callable, *args, **kwargs):
+        """
+        在共享的有界线程池中执行同步（阻塞）函数，超时时间为 `self.timeout`。
+
+        超时从线程开始执行时计起（排队时间不计入），超时抛出 TimeoutError；
+        调用方被取消时，尚未开始的调用会从队列中移除。
+        设置了 `cache_ttl` 且启用了数据源缓存时，先查缓存，并发的相同调用只执行一次。
+        """
+        cache = get_tool_cache()
+        if self.cache_ttl is None or cache is None:
+            return await run_blocking(func, *args, timeout=self.timeout, **kwargs)
+        key = make_data_key(self.name, func, args, kwargs)
+        return await cache.fetch(
+            key,
+            self.cache_ttl,
+            lambda: run_blocking(func, *args, timeout=self.timeout, **kwargs),
+        )
+
     async def get_data(self, task):
         """
         获取数据的主方法，带错误处理和重试机制
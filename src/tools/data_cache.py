@@ -0,0 +1,150 @@
+"""
+跨运行共享的数据源缓存：工具的同步后端（akshare/efinance等）返回的DataFrame按
+(工具名, 后端函数, 参数) 寻址，以Arrow IPC列式文件落盘，按工具各自的TTL过期。
+
+- 多个Agent/多次运行同时请求同一份数据时只抓取一次（请求合并），其余调用等待并共享结果
+- 跨线程、跨事件循环生效（`call_tool` 通过 `run_async_safely` 在新事件循环中执行工具）
+- 只缓存DataFrame；其他返回值（HTTP响应、dict等）照常返回但不落盘
+- 未安装pyarrow时只做请求合并，不落盘
+"""
+import os
+import json
+import time
+import hashlib
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:  # 缺少pyarrow时不落盘
+    pa = None
+
+from ..utils.logger import get_logger
+from ..utils.single_flight import SingleFlight
+
+logger = get_logger()
+
+ONE_HOUR = 3600
+ONE_DAY = 24 * ONE_HOUR
+
+_tool_cache: Optional['ToolDataCache'] = None
+
+
+def configure_tool_cache(cache_dir: Optional[str]) -> Optional['ToolDataCache']:
+    """设置进程内共享的数据源缓存目录；传入 None 关闭缓存。"""
+    global _tool_cache
+    if cache_dir is None:
+        _tool_cache = None
+    elif _tool_cache is None or _tool_cache.cache_dir != os.path.abspath(cache_dir):
+        _tool_cache = ToolDataCache(cache_dir)
+    return _tool_cache
+
+
+def get_tool_cache() -> Optional['ToolDataCache']:
+    return _tool_cache
+
+
+def make_data_key(tool_name: str, func: Callable, args: tuple, kwargs: Dict[str, Any]) -> str:
+    """计算缓存键：工具名 + 后端函数全名 + 参数。"""
+    func_name = f"{getattr(func, '__module__', '')}.{getattr(func, '__qualname__', repr(func))}"
+    payload = json.dumps(
+        {'tool': tool_name, 'func': func_name, 'args': list(args), 'kwargs': kwargs},
+        sort_keys=True,
+        ensure_ascii=False,
+        default=repr,
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _copy_frame(result: Any) -> Any:
+    return result.copy() if isinstance(result, pd.DataFrame) else result
+
+
+class ToolDataCache:
+    """
+    按键寻址的DataFrame缓存目录，每条数据一个 `<key>.arrow` 文件，文件mtime即抓取时间。
+
+    Args:
+        cache_dir: 缓存目录（跨运行、跨研究对象共享）
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = os.path.abspath(cache_dir)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self._flight = SingleFlight()
+
+    @property
+    def coalesced(self) -> int:
+        return self._flight.coalesced
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.arrow")
+
+    def get(self, key: str, ttl: float) -> Optional[pd.DataFrame]:
+        """读取未过期的缓存；未命中返回 None。"""
+        if pa is None:
+            return None
+        path = self._path(key)
+        try:
+            if time.time() - os.path.getmtime(path) > ttl:
+                return None
+            with pa.memory_map(path, 'r') as source:
+                return pa.ipc.open_file(source).read_all().to_pandas()
+        except (OSError, pa.ArrowInvalid):
+            return None
+
+    def put(self, key: str, df: pd.DataFrame) -> bool:
+        """写入DataFrame（原子替换）；无法转换为Arrow表时跳过并返回 False。"""
+        if pa is None:
+            return False
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError, TypeError, ValueError) as e:
+            logger.debug(f"数据源缓存跳过无法列式存储的结果: {e}")
+            return False
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with pa.OSFile(tmp_path, 'wb') as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"写入数据源缓存失败: {e}")
+            return False
+        return True
+
+    async def fetch(self, key: str, ttl: float, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        读缓存；未命中时调用 loader 抓取并写入。同一键的并发调用只执行一次 loader。
+        """
+        cached = self.get(key, ttl)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        async def load():
+            # 排队期间其他线程/运行可能刚刚写入
+            result = self.get(key, ttl)
+            if result is not None:
+                self.hits += 1
+                return result
+            self.misses += 1
+            result = await loader()
+            if isinstance(result, pd.DataFrame):
+                self.put(key, result)
+            return result
+
+        return await self._flight.do(key, load, share=_copy_frame)
+
+    def clear(self):
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith('.arrow'):
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
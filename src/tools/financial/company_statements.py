@@ -1,6 +1,7 @@
 import akshare as ak
 import pandas as pd
 from ..base import Tool, ToolResult
+from ..data_cache import ONE_DAY
 
 def preprocess_balance_data(data: pd.DataFrame) -> pd.DataFrame:
     data.drop(['SECUCODE','SECURITY_CODE','SECURITY_NAME_ABBR','ORG_CODE', 'DATE_TYPE_CODE', 'FISCAL_YEAR','STD_ITEM_CODE','REPORT_DATE'], axis=1, inplace=True)
@@ -86,6 +87,7 @@ class BalanceSheet(Tool):
                 {"name": "market", "type": "str", "description": "Market flag: HK or A", "required": True},
                 {"name": "period", "type": "str", "description": "Reporting period (defaults to annual)", "required": False},
             ],
+            cache_ttl = ONE_DAY,
         )
 
     def prepare_params(self, task) -> dict:
@@ -174,7 +176,8 @@ class BalanceSheet(Tool):
         try:
             log_info(f"Attempting to fetch balance sheet from Eastmoney for {stock_code}")
             if market == "HK":
-                data = ak.stock_financial_hk_report_em(
+                data = await self.run_sync(
+                    ak.stock_financial_hk_report_em,
                     stock = stock_code,
                     symbol = "资产负债表",
                     indicator = period,
@@ -188,7 +191,8 @@ class BalanceSheet(Tool):
                     data_source = "Eastmoney (HK, raw)"
                     # Keep raw data if preprocessing fails
             elif market == "A":
-                data = ak.stock_balance_sheet_by_yearly_em(
+                data = await self.run_sync(
+                    ak.stock_balance_sheet_by_yearly_em,
                     symbol = stock_code,
                 )
                 data_source = "Eastmoney (A-share)"
@@ -207,7 +211,8 @@ class BalanceSheet(Tool):
                     log_info(f"Falling back to Sina Finance API for {stock_code}")
                     # 新浪财经API需要添加市场前缀（sh/sz）
                     sina_code = f"sh{stock_code}" if stock_code.startswith('6') else f"sz{stock_code}"
-                    data = ak.stock_financial_report_sina(
+                    data = await self.run_sync(
+                        ak.stock_financial_report_sina,
                         stock=sina_code,
                         symbol="资产负债表"
                     )
@@ -245,6 +250,7 @@ class IncomeStatement(Tool):
                 {"name": "stock_code", "type": "str", "description": "Ticker, e.g., 000001", "required": True},
                 {"name": "market", "type": "str", "description": "Market flag: HK or A", "required": True},
             ],
+            cache_ttl = ONE_DAY,
         )
 
     def prepare_params(self, task) -> dict:
@@ -303,13 +309,13 @@ class IncomeStatement(Tool):
         period = "年度"
         try:
             if market == "HK":
-                data = ak.stock_financial_hk_report_em(stock=stock_code, symbol="利润表", indicator=period)
+                data = await self.run_sync(ak.stock_financial_hk_report_em, stock=stock_code, symbol="利润表", indicator=period)
                 try:
                     data = self._preprocess_data(data)
                 except Exception as e:
                     print("Failed to preprocess income-statement data", e)
             elif market == "A":
-                data = ak.stock_financial_benefit_ths(symbol=stock_code, indicator='按年度')
+                data = await self.run_sync(ak.stock_financial_benefit_ths, symbol=stock_code, indicator='按年度')
             else:
                 raise ValueError(f"Unsupported market flag: {market}. Use 'HK' or 'A'.")
         except Exception as e:
@@ -336,6 +342,7 @@ class CashFlowStatement(Tool):
                 {"name": "stock_code", "type": "str", "description": "Ticker, e.g., 000001", "required": True},
                 {"name": "market", "type": "str", "description": "Market flag: HK or A", "required": True},
             ],
+            cache_ttl=ONE_DAY,
         )
 
     def prepare_params(self, task) -> dict:
@@ -393,14 +400,14 @@ class CashFlowStatement(Tool):
         period = "年度"
         try:
             if market == "HK":
-                data = ak.stock_financial_hk_report_em(stock=stock_code, symbol="现金流量表", indicator=period)
+                data = await self.run_sync(ak.stock_financial_hk_report_em, stock=stock_code, symbol="现金流量表", indicator=period)
                 try:
                     data = self._preprocess_data(data)
                 except Exception as e:
                     print("Failed to preprocess cash-flow data", e)
             elif market == "A":
                 #data = ak.stock_cash_flow_sheet_by_yearly_em(symbol=stock_code)
-                data = ak.stock_financial_cash_ths(symbol=stock_code, indicator='按年度')
+                data = await self.run_sync(ak.stock_financial_cash_ths, symbol=stock_code, indicator='按年度')
             else:
                 raise ValueError(f"Unsupported market flag: {market}. Use 'HK' or 'A'.")
         except Exception as e:
@@ -1,6 +1,7 @@
 import akshare as ak
 import pandas as pd
 from ..base import Tool, ToolResult
+from ..data_cache import ONE_HOUR
 
 
 class HuShen_Index(Tool):
@@ -8,7 +9,8 @@ class HuShen_Index(Tool):
         super().__init__(
             name="CSI 300 daily data",
             description="Daily CSI 300 index data, including OHLC, volume, turnover, returns, and turnover ratio.",
-            parameters=[]
+            parameters=[],
+            cache_ttl=6 * ONE_HOUR,
         )
 
     def prepare_params(self, task) -> dict:
@@ -22,7 +24,7 @@ class HuShen_Index(Tool):
         Fetch the CSI 300 time series.
         """
         try:
-            data = ak.stock_zh_index_daily(symbol="sh000300")
+            data = await self.run_sync(ak.stock_zh_index_daily, symbol="sh000300")
         except Exception as e:
             print("Failed to fetch CSI 300 data", e)
             data = None
@@ -44,7 +46,8 @@ class HengSheng_Index(Tool):
         super().__init__(
             name="Hang Seng Index daily data",
             description="Daily Hang Seng Index data including OHLC, volume, turnover, returns, and turnover ratio.",
-            parameters=[]
+            parameters=[],
+            cache_ttl=6 * ONE_HOUR,
         )
 
     def prepare_params(self, task) -> dict:
@@ -58,7 +61,7 @@ class HengSheng_Index(Tool):
         Fetch the Hang Seng Index time series.
         """
         try:
-            data = ak.stock_hk_index_daily_sina(symbol="HSI")
+            data = await self.run_sync(ak.stock_hk_index_daily_sina, symbol="HSI")
         except Exception as e:
             print("Failed to fetch Hang Seng data", e)
             data = None
@@ -79,7 +82,8 @@ class ShangZheng_Index(Tool):
         super().__init__(
             name="SSE Composite daily data",
             description="Daily Shanghai Composite index data with OHLC, volume, turnover, returns, and turnover ratio.",
-            parameters=[]
+            parameters=[],
+            cache_ttl=6 * ONE_HOUR,
         )
 
     def prepare_params(self, task) -> dict:
@@ -93,7 +97,7 @@ class ShangZheng_Index(Tool):
         Fetch the SSE Composite time series.
         """
         try:
-            data = ak.stock_zh_index_daily(symbol="sh000001")
+            data = await self.run_sync(ak.stock_zh_index_daily, symbol="sh000001")
         except Exception as e:
             print("Failed to fetch SSE Composite data", e)
             data = None
@@ -115,7 +119,8 @@ class NSDK_Index(Tool):
         super().__init__(
             name="Nasdaq Composite daily data",
             description="Daily Nasdaq Composite data covering OHLC, volume, turnover, returns, and turnover ratio.",
-            parameters=[]
+            parameters=[],
+            cache_ttl=6 * ONE_HOUR,
         )
 
     def prepare_params(self, task) -> dict:
@@ -129,7 +134,7 @@ class NSDK_Index(Tool):
         Fetch the Nasdaq Composite time series.
         """
         try:
-            data = ak.index_us_stock_sina(symbol=".IXIC")
+            data = await self.run_sync(ak.index_us_stock_sina, symbol=".IXIC")
         except Exception as e:
             print("Failed to fetch Nasdaq data", e)
             data = None
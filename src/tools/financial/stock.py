@@ -6,6 +6,7 @@ import efinance as ef
 from bs4 import BeautifulSoup
 
 from ..base import Tool, ToolResult
+from ..data_cache import ONE_DAY, ONE_HOUR
 
 # TODO: 后续可针对雪球不同市场（先区分上交所/深交所）使用更细致接口。
 class StockBasicInfo(Tool):
@@ -17,6 +18,7 @@ class StockBasicInfo(Tool):
                 {"name": "stock_code", "type": "str", "description": "股票代码，如 000001", "required": True},
                 {"name": "market", "type": "str", "description": "市场标识: A 为 A 股，HK 为港股", "required": True},
             ],
+            cache_ttl=ONE_DAY,
         )
 
     def prepare_params(self, task) -> dict:
@@ -35,9 +37,9 @@ class StockBasicInfo(Tool):
         """
         try:
             if market == "A":
-                data = ak.stock_zyjs_ths(symbol=stock_code)
+                data = await self.run_sync(ak.stock_zyjs_ths, symbol=stock_code)
             elif market == "HK":
-                data = ak.stock_hk_company_profile_em(symbol=stock_code)
+                data = await self.run_sync(ak.stock_hk_company_profile_em, symbol=stock_code)
             else:
                 raise ValueError(f"不支持的市场标识: {market}，请使用 'HK' 或 'A'。")
         except Exception as e:
@@ -62,6 +64,7 @@ class ShareHoldingStructure(Tool):
                 {"name": "stock_code", "type": "str", "description": "股票代码，如 000001", "required": True},
                 {"name": "market", "type": "str", "description": "市场标识: A 为 A 股，HK 为港股", "required": True},
             ],
+            cache_ttl=ONE_DAY,
         )
 
     def prepare_params(self, task) -> dict:
@@ -80,15 +83,17 @@ class ShareHoldingStructure(Tool):
         """
         try:
             if market == "A":
-                data = ak.stock_main_stock_holder(stock=stock_code)
+                data = await self.run_sync(ak.stock_main_stock_holder, stock=stock_code)
             elif market == "HK":
                 # 从东方财富网抓取数据
                 headers = {
                     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
                 }
-                output = requests.get(
+                output = await self.run_sync(
+                    requests.get,
                     f"https://datacenter.eastmoney.com/securities/api/data/v1/get?reportName=RPT_HKF10_EQUITYCHG_HOLDER&columns=SECURITY_CODE%2CSECUCODE%2CORG_CODE%2CNOTICE_DATE%2CREPORT_DATE%2CHOLDER_NAME%2CTOTAL_SHARES%2CTOTAL_SHARES_RATIO%2CDIRECT_SHARES%2CSHARES_CHG_RATIO%2CSHARES_TYPE%2CEQUITY_TYPE%2CHOLD_IDENTITY%2CIS_ZJ&quoteColumns=&filter=(SECUCODE%3D%22{stock_code}.HK%22)(REPORT_DATE%3D%272024-12-31%27)&pageNumber=1&pageSize=&sortTypes=-1%2C-1&sortColumns=EQUITY_TYPE%2CTOTAL_SHARES&source=F10&client=PC&v=032666133943694553",
                     headers = headers,
+                    timeout = self.timeout,
                 )
                 try:
                     html = output.text
@@ -132,6 +137,7 @@ class StockBaseInfo(Tool):
             parameters=[
                 {"name": "stock_code", "type": "str", "description": "股票代码，如 000001", "required": True},
             ],
+            cache_ttl=ONE_HOUR,  # 估值指标随股价变化
         )
 
     def prepare_params(self, task) -> dict:
@@ -142,7 +148,7 @@ class StockBaseInfo(Tool):
         获取指定股票的估值及盈利能力核心指标。
         """
         try:
-            data = ef.stock.get_base_info(stock_code)
+            data = await self.run_sync(ef.stock.get_base_info, stock_code)
         except Exception as e:
             print("获取股票估值指标失败", e)
             data = None
@@ -164,6 +170,8 @@ class StockPrice(Tool):
             parameters=[
                 {"name": "stock_code", "type": "str", "description": "股票代码（支持A股与港股），如 000001", "required": True},
             ],
+            timeout=120.0,  # 全量日线历史，响应较大
+            cache_ttl=ONE_HOUR,
         )
 
     def prepare_params(self, task) -> dict:
@@ -174,7 +182,7 @@ class StockPrice(Tool):
         获取指定股票的历史行情数据（日线K线）。
         """
         try:
-            data = ef.stock.get_quote_history(stock_code)
+            data = await self.run_sync(ef.stock.get_quote_history, stock_code)
         except Exception as e:
             print("获取股票历史行情失败", e)
             data = None
@@ -1,6 +1,7 @@
 import akshare as ak
 import pandas as pd
 from ..base import Tool, ToolResult
+from ..data_cache import ONE_DAY
 
 
 class Industry_gyzjz(Tool):
@@ -9,10 +10,11 @@ class Industry_gyzjz(Tool):
             name = "Industrial value-added growth",
             description = "China industrial value-added growth from 2008 onward (Eastmoney).",
             parameters = [],
+            cache_ttl = ONE_DAY,
         ) 
         
     async def api_function(self):
-        data = ak.macro_china_gyzjz()
+        data = await self.run_sync(ak.macro_china_gyzjz)
         return [
             ToolResult(
                 name=self.name,
@@ -28,10 +30,11 @@ class Industry_production_yoy(Tool):
             name = "Above-scale industrial production YoY",
             description = "China's YoY industrial production growth for enterprises above designated size, from 1990 onward.",
             parameters = [],
+            cache_ttl = ONE_DAY,
         )
         
     async def api_function(self):
-        data = ak.macro_china_industrial_production_yoy()
+        data = await self.run_sync(ak.macro_china_industrial_production_yoy)
         return [
             ToolResult(
                 name=self.name,
@@ -47,10 +50,11 @@ class Industry_China_PMI(Tool):
             name = "Official manufacturing PMI",
             description = "China's official manufacturing PMI series from 2005 onward.",
             parameters = [],
+            cache_ttl = ONE_DAY,
         )
         
     async def api_function(self):
-        data = ak.macro_china_pmi_yearly()
+        data = await self.run_sync(ak.macro_china_pmi_yearly)
         return [
             ToolResult(
                 name=self.name,
@@ -66,10 +70,11 @@ class Industry_China_CX_services_PMI(Tool):
             name = "Caixin services PMI",
             description = "China's Caixin services PMI report from 2012 onward.",
             parameters = [],
+            cache_ttl = ONE_DAY,
         )
         
     async def api_function(self):
-        data = ak.macro_china_cx_services_pmi_yearly()
+        data = await self.run_sync(ak.macro_china_cx_services_pmi_yearly)
         return [
             ToolResult(
                 name=self.name,
@@ -85,10 +90,11 @@ class Industry_China_CPI(Tool):
             name = "Consumer price index",
             description = "Monthly CPI data for China from 2008 onward.",
             parameters = [],
+            cache_ttl = ONE_DAY,
         )
         
     async def api_function(self):
-        data = ak.macro_china_cpi()
+        data = await self.run_sync(ak.macro_china_cpi)
         return [
             ToolResult(
                 name=self.name,
@@ -104,10 +110,11 @@ class Industry_China_GDP(Tool):
             name = "Gross domestic product",
             description = "Monthly GDP-related statistics for China from 2006 onward.",
             parameters = [],
+            cache_ttl = ONE_DAY,
         )
         
     async def api_function(self):
-        data = ak.macro_china_gdp()
+        data = await self.run_sync(ak.macro_china_gdp)
         return [
             ToolResult(
                 name=self.name,
@@ -123,10 +130,11 @@ class Industry_China_PPI(Tool):
             name = "Producer price index",
             description = "Monthly producer price index (ex-factory) for China from 2006 onward.",
             parameters = [],
+            cache_ttl = ONE_DAY,
         )
         
     async def api_function(self):
-        data = ak.macro_china_ppi()
+        data = await self.run_sync(ak.macro_china_ppi)
         return [
             ToolResult(
                 name=self.name,
@@ -142,10 +150,11 @@ class Industry_China_xfzxx(Tool):
             name = "Consumer confidence index",
             description = "Historical consumer confidence index with YoY and MoM changes (Eastmoney).",
             parameters = [],
+            cache_ttl = ONE_DAY,
         )
         
     async def api_function(self):
-        data = ak.macro_china_xfzxx()
+        data = await self.run_sync(ak.macro_china_xfzxx)
         return [
             ToolResult(
                 name=self.name,
@@ -161,10 +170,11 @@ class Industry_China_consumer_goods_retail(Tool):
             name = "Total retail sales of consumer goods",
             description = "Historical stats for total retail sales of consumer goods with YoY and MoM changes.",
             parameters = [],
+            cache_ttl = ONE_DAY,
         )
         
     async def api_function(self):
-        data = ak.macro_china_consumer_goods_retail()
+        data = await self.run_sync(ak.macro_china_consumer_goods_retail)
         return [
             ToolResult(
                 name=self.name,
@@ -180,10 +190,11 @@ class Industry_China_retail_price_index(Tool):
             name = "Retail price index",
             description = "Historical retail price index from the National Bureau of Statistics.",
             parameters = [],
+            cache_ttl = ONE_DAY,
         )
         
     async def api_function(self):
-        data = ak.macro_china_retail_price_index()
+        data = await self.run_sync(ak.macro_china_retail_price_index)
         return [
             ToolResult(
                 name=self.name,
@@ -199,10 +210,11 @@ class Industry_China_qyspjg(Tool):
             name = "Enterprise commodity price index",
             description = "Enterprise commodity price index series from 2005 onward (Eastmoney).",
             parameters = [],
+            cache_ttl = ONE_DAY,
         )
         
     async def api_function(self):
-        data = ak.macro_china_qyspjg()
+        data = await self.run_sync(ak.macro_china_qyspjg)
         return [
             ToolResult(
                 name=self.name,
@@ -1,6 +1,7 @@
 import akshare as ak
 import pandas as pd
 from ..base import Tool, ToolResult
+from ..data_cache import ONE_DAY
 
 
 class Macro_China_Leverage_Ratio(Tool):
@@ -9,10 +10,11 @@ class Macro_China_Leverage_Ratio(Tool):
             name = "China macro leverage ratio",
             description = "Historical leverage ratios for households, non-financial corporates, government, and financial sectors in China.",
             parameters = [],
+            cache_ttl = ONE_DAY,
         )
         
     async def api_function(self):
-        data = ak.macro_cnbs()
+        data = await self.run_sync(ak.macro_cnbs)
         return [
             ToolResult(
                 name=self.name,
@@ -28,10 +30,11 @@ class Macro_China_qyspjg(Tool):
             name = "Enterprise commodity price index",
             description = "China's enterprise commodity price index from 2005 onward, covering aggregate, agricultural, mineral, and energy sub-indices with YoY/MoM changes.",
             parameters = [],
+            cache_ttl = ONE_DAY,
         )
         
     async def api_function(self):
-        data = ak.macro_china_qyspjg()
+        data = await self.run_sync(ak.macro_china_qyspjg)
         return [
             ToolResult(
                 name=self.name,
@@ -47,10 +50,11 @@ class Macro_China_LPR(Tool):
             name = "China LPR benchmark rates",
             description = "Loan Prime Rate time series from 1991 onward, including 1Y, 5Y, and benchmark short-/long-term lending rates.",
             parameters = [],
+            cache_ttl = ONE_DAY,
         )
         
     async def api_function(self):
-        data = ak.macro_china_lpr()
+        data = await self.run_sync(ak.macro_china_lpr)
         return [
             ToolResult(
                 name=self.name,
@@ -66,10 +70,11 @@ class Macro_China_urban_unemployment(Tool):
             name = "Urban surveyed unemployment rate",
             description = "Historical surveyed unemployment rate across Chinese urban areas, broken down by age groups and other categories.",
             parameters = [],
+            cache_ttl = ONE_DAY,
         )
         
     async def api_function(self):
-        data = ak.macro_china_urban_unemployment()
+        data = await self.run_sync(ak.macro_china_urban_unemployment)
         return [
             ToolResult(
                 name=self.name,
@@ -85,10 +90,11 @@ class Macro_China_shrzgm(Tool):
             name = "Total social financing increment",
             description = "Incremental total social financing data since 2015, covering RMB loans, entrusted loans, trust loans, bankers' acceptances, corporate bonds, and onshore equity financing.",
             parameters = [],
+            cache_ttl = ONE_DAY,
         )
         
     async def api_function(self):
-        data = ak.macro_china_shrzgm()
+        data = await self.run_sync(ak.macro_china_shrzgm)
         return [
             ToolResult(
                 name=self.name,
@@ -104,10 +110,11 @@ class Macro_China_GDP_yearly(Tool):
             name = "China GDP YoY",
             description = "China GDP year-over-year growth report, covering 2010 to present.",
             parameters = [],
+            cache_ttl = ONE_DAY,
         )
         
     async def api_function(self):
-        data = ak.macro_china_gdp_yearly()
+        data = await self.run_sync(ak.macro_china_gdp_yearly)
         return [
             ToolResult(
                 name=self.name,
@@ -123,10 +130,11 @@ class Macro_China_CPI_yearly(Tool):
             name = "China CPI YoY",
             description = "Annual CPI time series for China from 1986 to present.",
             parameters = [],
+            cache_ttl = ONE_DAY,
         )
         
     async def api_function(self):
-        data = ak.macro_china_cpi_yearly()
+        data = await self.run_sync(ak.macro_china_cpi_yearly)
         return [
             ToolResult(
                 name=self.name,
@@ -142,10 +150,11 @@ class Macro_China_PPI_yearly(Tool):
             name = "China PPI YoY",
             description = "Annual PPI time series for China from 1995 onward.",
             parameters = [],
+            cache_ttl = ONE_DAY,
         )
         
     async def api_function(self):
-        data = ak.macro_china_ppi_yearly()
+        data = await self.run_sync(ak.macro_china_ppi_yearly)
         return [
             ToolResult(
                 name=self.name,
@@ -161,10 +170,11 @@ class Macro_USA_CPI_yearly(Tool):
             name = "US CPI YoY",
             description = "Annual CPI report for the United States from 2008 to present.",
             parameters = [],
+            cache_ttl = ONE_DAY,
         )
         
     async def api_function(self):
-        data = ak.macro_usa_cpi_yoy()
+        data = await self.run_sync(ak.macro_usa_cpi_yoy)
         return [
             ToolResult(
                 name=self.name,
@@ -180,10 +190,11 @@ class Macro_China_exports_yearly(Tool):
             name = "China exports YoY (USD)",
             description = "Year-over-year export growth for China measured in USD, from 1982 onward.",
             parameters = [],
+            cache_ttl = ONE_DAY,
         )
         
     async def api_function(self):
-        data = ak.macro_china_exports_yoy()
+        data = await self.run_sync(ak.macro_china_exports_yoy)
         return [
             ToolResult(
                 name=self.name,
@@ -199,10 +210,11 @@ class Macro_China_imports_yearly(Tool):
             name = "China imports YoY (USD)",
             description = "Year-over-year import growth for China measured in USD, from 1996 onward.",
             parameters = [],
+            cache_ttl = ONE_DAY,
         )
         
     async def api_function(self):
-        data = ak.macro_china_imports_yoy()
+        data = await self.run_sync(ak.macro_china_imports_yoy)
         return [
             ToolResult(
                 name=self.name,
@@ -218,10 +230,11 @@ class Macro_China_trade_balance(Tool):
             name = "China trade balance (USD bn)",
             description = "China's trade balance expressed in USD billions, from 1981 onward.",
             parameters = [],
+            cache_ttl = ONE_DAY,
         )
         
     async def api_function(self):
-        data = ak.macro_china_trade_balance()
+        data = await self.run_sync(ak.macro_china_trade_balance)
         return [
             ToolResult(
                 name=self.name,
@@ -237,10 +250,11 @@ class Macro_China_czsr(Tool):
             name = "Fiscal revenue",
             description = "Monthly fiscal revenue data for China from 2008 to present.",
             parameters = [],
+            cache_ttl = ONE_DAY,
         )
         
     async def api_function(self):
-        data = ak.macro_china_czsr()
+        data = await self.run_sync(ak.macro_china_czsr)
         return [
             ToolResult(
                 name=self.name,
@@ -256,10 +270,11 @@ class Macro_China_whxd(Tool):
             name = "Foreign-exchange loan data",
             description = "Monthly FX loan balances for China since 2008, including YoY and MoM change metrics.",
             parameters = [],
+            cache_ttl = ONE_DAY,
         )
         
     async def api_function(self):
-        data = ak.macro_china_whxd()
+        data = await self.run_sync(ak.macro_china_whxd)
         return [
             ToolResult(
                 name=self.name,
@@ -275,10 +290,11 @@ class Macro_China_bond_public(Tool):
             name = "New bond issuance",
             description = "Recent bond issuance statistics; prices are quoted in CNY and planned size in 100 million CNY.",
             parameters = [],
+            cache_ttl = ONE_DAY,
         )
         
     async def api_function(self):
-        data = ak.macro_china_bond_public()
+        data = await self.run_sync(ak.macro_china_bond_public)
         return [
             ToolResult(
                 name=self.name,
@@ -294,10 +310,11 @@ class Macro_China_bank_balance(Tool):
             name = "Central bank balance sheet",
             description = "People's Bank of China balance sheet statistics.",
             parameters = [],
+            cache_ttl = ONE_DAY,
         )
         
     async def api_function(self):
-        data = ak.macro_china_central_bank_balance()
+        data = await self.run_sync(ak.macro_china_central_bank_balance)
         return [
             ToolResult(
                 name=self.name,
@@ -313,10 +330,11 @@ class Macro_China_supply_of_money(Tool):
             name = "Money supply",
             description = "Chinese monetary aggregates (M0/M1/M2) time series.",
             parameters = [],
+            cache_ttl = ONE_DAY,
         )
         
     async def api_function(self):
-        data = ak.macro_china_supply_of_money()
+        data = await self.run_sync(ak.macro_china_supply_of_money)
         return [
             ToolResult(
                 name=self.name,
@@ -332,10 +350,11 @@ class Macro_China_reserve_requirement_ratio(Tool):
             name = "Reserve requirement ratio",
             description = "Statutory reserve requirement ratios for Chinese financial institutions.",
             parameters = [],
+            cache_ttl = ONE_DAY,
         )
         
     async def api_function(self):
-        data = ak.macro_china_reserve_requirement_ratio()
+        data = await self.run_sync(ak.macro_china_reserve_requirement_ratio)
         return [
             ToolResult(
                 name=self.name,
@@ -351,10 +370,11 @@ class Macro_China_fx_gold(Tool):
             name = "FX and gold reserves",
             description = "Monthly foreign-exchange and gold reserve balances for China since 2008.",
             parameters = [],
+            cache_ttl = ONE_DAY,
         )
         
     async def api_function(self):
-        data = ak.macro_china_fx_gold()
+        data = await self.run_sync(ak.macro_china_fx_gold)
         return [
             ToolResult(
                 name=self.name,
@@ -370,10 +390,11 @@ class Macro_China_stock_market_cap(Tool):
             name = "National stock trading statistics",
             description = "Monthly nationwide stock-trading statistics from 2008 onward.",
             parameters = [],
+            cache_ttl = ONE_DAY,
         )
         
     async def api_function(self):
-        data = ak.macro_china_stock_market_cap()
+        data = await self.run_sync(ak.macro_china_stock_market_cap)
         return [
             ToolResult(
                 name=self.name,
@@ -389,10 +410,11 @@ class Macro_China_epu_index(Tool):
             name = "Economic policy uncertainty (China)",
             description = "Monthly economic policy uncertainty (EPU) index for China.",
             parameters = [],
+            cache_ttl = ONE_DAY,
         )
         
     async def api_function(self):
-        data = ak.article_epu_index(symbol="China")
+        data = await self.run_sync(ak.article_epu_index, symbol="China")
         return [
             ToolResult(
                 name=self.name,
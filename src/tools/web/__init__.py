@@ -8,8 +8,19 @@ This module provides comprehensive web search capabilities including:
 """
 
 from .base_search import SearchResult, ImageSearchResult
+from .http_client import HttpClientPool, configure_http_pool, get_http_pool, close_http_pool
+from .browser_pool import (
+    BrowserPool,
+    CrawlerPool,
+    BrowserPoolBusy,
+    configure_browser_pools,
+    get_browser_pool,
+    get_crawler_pool,
+    close_browser_pools
+)
 from .quota_manager import QuotaManager
 from .search_engine_pool import SearchEnginePool, SearchStrategy, create_default_pool
+from .search_cache import SearchResultCache, configure_search_cache, get_search_cache, normalize_query
 from .search_engines import (
     TavilySearch,
     SerperSearch,
@@ -22,12 +33,28 @@ from .search_engines import (
     PlaywrightSearch
 )
 from .web_crawler import Click, ClickResult
+from .page_cache import PageCache, configure_page_cache, get_page_cache, normalize_url
 
 __all__ = [
     # Base classes
     "SearchResult",
     "ImageSearchResult",
     
+    # Shared HTTP client pool
+    "HttpClientPool",
+    "configure_http_pool",
+    "get_http_pool",
+    "close_http_pool",
+    
+    # Shared browser pools
+    "BrowserPool",
+    "CrawlerPool",
+    "BrowserPoolBusy",
+    "configure_browser_pools",
+    "get_browser_pool",
+    "get_crawler_pool",
+    "close_browser_pools",
+    
     # Quota management
     "QuotaManager",
     
@@ -36,6 +63,12 @@ __all__ = [
     "SearchStrategy",
     "create_default_pool",
     
+    # Search result cache
+    "SearchResultCache",
+    "configure_search_cache",
+    "get_search_cache",
+    "normalize_query",
+    
     # Search engines
     "TavilySearch",
     "SerperSearch",
@@ -50,4 +83,10 @@ __all__ = [
     # Crawler
     "Click",
     "ClickResult",
+    
+    # Page cache
+    "PageCache",
+    "configure_page_cache",
+    "get_page_cache",
+    "normalize_url",
 ]
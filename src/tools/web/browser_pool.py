@@ -0,0 +1,349 @@
+"""
+Long-lived browser pools for the browser-driven web tools.
+
+Launching Chromium takes seconds, so `PlaywrightSearch` and `Click` borrow
+from shared pools instead of starting a browser for every call:
+
+- `BrowserPool` keeps one Playwright Chromium per event loop and hands out
+  fresh pages from reusable browser contexts.
+- `CrawlerPool` keeps one started crawl4ai `AsyncWebCrawler` per event loop.
+
+Both bound the number of concurrent leases, reject callers once too many are
+queued, replace a browser that fails its health check, and recycle it after
+`max_uses` leases (the old one is closed once its last lease returns).
+Browsers are bound to the loop that launched them; on the temporary loops of
+`run_async_safely` they are closed when that loop finishes.
+"""
+
+import asyncio
+import json
+import threading
+import weakref
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional
+
+try:
+    from playwright.async_api import async_playwright
+    PLAYWRIGHT_AVAILABLE = True
+except ImportError:
+    PLAYWRIGHT_AVAILABLE = False
+
+from ...utils.async_helpers import add_loop_finalizer, run_cleanup
+from ...utils.logger import get_logger
+
+logger = get_logger()
+
+CLOSE_TIMEOUT = 30.0  # seconds `aclose` waits for browsers owned by other loops
+
+
+class BrowserPoolBusy(RuntimeError):
+    """Raised when a lease cannot be granted: too many waiters or waited too long."""
+
+
+class _Holder:
+    """One live browser and its lease bookkeeping."""
+
+    __slots__ = ('resource', 'uses', 'active', 'retired')
+
+    def __init__(self, resource: Any):
+        self.resource = resource
+        self.uses = 0
+        self.active = 0
+        self.retired = False
+
+
+class _LoopState:
+    """Pool state of a single event loop."""
+
+    def __init__(self, max_concurrency: int):
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.waiting = 0
+        self.leased = 0
+        self.current: Optional[_Holder] = None
+        self.holders: set = set()
+        self.start_lock = asyncio.Lock()
+
+
+class _LeasePool:
+    """
+    Shared lease logic: one long-lived resource per event loop.
+
+    Args:
+        max_concurrency: Leases granted at the same time on one loop.
+        max_uses: Leases served before the resource is recycled.
+        max_waiting: Callers allowed to queue for a lease; more are rejected.
+        acquire_timeout: Seconds a caller may wait in the queue.
+    """
+
+    name = 'pool'
+    retire_on_error = False
+
+    def __init__(
+        self,
+        max_concurrency: int = 4,
+        max_uses: int = 50,
+        max_waiting: int = 16,
+        acquire_timeout: float = 120.0,
+    ):
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.max_uses = max(1, int(max_uses))
+        self.max_waiting = max(0, int(max_waiting))
+        self.acquire_timeout = acquire_timeout
+        self.launches = 0
+        self._states: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    async def _start(self) -> Any:
+        raise NotImplementedError
+
+    async def _stop(self, resource: Any):
+        raise NotImplementedError
+
+    def _is_healthy(self, resource: Any) -> bool:
+        return True
+
+    def _state(self) -> _LoopState:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            state = self._states.get(loop)
+            if state is None:
+                state = _LoopState(self.max_concurrency)
+                self._states[loop] = state
+                created = True
+            else:
+                created = False
+        if created:
+            add_loop_finalizer(lambda: self._finalize_state(state), loop)
+        return state
+
+    async def _finalize_state(self, state: _LoopState):
+        """Loop finalizer: close the finishing loop's browsers and drop its entry."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._states.get(loop) is state:
+                del self._states[loop]
+        await self._close_state(state)
+
+    async def _current(self, state: _LoopState) -> _Holder:
+        async with state.start_lock:
+            holder = state.current
+            if holder is not None and not self._is_healthy(holder.resource):
+                logger.warning(f"{self.name}: browser failed its health check, restarting")
+                await self._retire(state, holder)
+                holder = None
+            if holder is None:
+                holder = _Holder(await self._start())
+                self.launches += 1
+                state.current = holder
+                state.holders.add(holder)
+            return holder
+
+    async def _retire(self, state: _LoopState, holder: _Holder):
+        holder.retired = True
+        if state.current is holder:
+            state.current = None
+        if holder.active == 0:
+            await self._discard(state, holder)
+
+    async def _discard(self, state: _LoopState, holder: _Holder):
+        if holder not in state.holders:
+            return
+        state.holders.discard(holder)
+        try:
+            await self._stop(holder.resource)
+        except Exception as e:
+            logger.debug(f"{self.name}: error while closing browser: {e}")
+
+    @asynccontextmanager
+    async def lease(self):
+        """Borrow the loop's shared resource, starting or replacing it as needed."""
+        state = self._state()
+        if state.waiting + state.leased >= self.max_concurrency + self.max_waiting:
+            raise BrowserPoolBusy(f"{self.name}: {state.waiting} callers are already waiting")
+        state.waiting += 1
+        try:
+            await asyncio.wait_for(state.semaphore.acquire(), self.acquire_timeout)
+        except asyncio.TimeoutError:
+            raise BrowserPoolBusy(f"{self.name}: no browser available within {self.acquire_timeout}s")
+        finally:
+            state.waiting -= 1
+
+        state.leased += 1
+        try:
+            holder = await self._current(state)
+            holder.active += 1
+            holder.uses += 1
+            if holder.uses >= self.max_uses:
+                holder.retired = True
+                if state.current is holder:
+                    state.current = None
+            failed = False
+            try:
+                yield holder.resource
+            except Exception:
+                failed = True
+                raise
+            finally:
+                holder.active -= 1
+                if failed and not holder.retired and (self.retire_on_error or not self._is_healthy(holder.resource)):
+                    await self._retire(state, holder)
+                elif holder.retired and holder.active == 0:
+                    await self._discard(state, holder)
+        finally:
+            state.leased -= 1
+            state.semaphore.release()
+
+    async def _close_state(self, state: _LoopState):
+        state.current = None
+        for holder in list(state.holders):
+            await self._discard(state, holder)
+
+    async def aclose(self):
+        """
+        Close every pooled browser. Browsers of the running loop are closed
+        directly, those of other live loops on their own loop (waiting up to
+        `CLOSE_TIMEOUT`), and those of loops that have already stopped are dropped.
+        """
+        current_loop = asyncio.get_running_loop()
+        with self._lock:
+            pooled = list(self._states.items())
+            self._states = weakref.WeakKeyDictionary()
+        pending = []
+        for loop, state in pooled:
+            if loop is current_loop:
+                await self._close_state(state)
+            elif loop.is_running():
+                future = asyncio.run_coroutine_threadsafe(self._close_state(state), loop)
+                pending.append(asyncio.wrap_future(future))
+        if pending:
+            _, not_done = await asyncio.wait(pending, timeout=CLOSE_TIMEOUT)
+            if not_done:
+                logger.warning(f"{self.name}: {len(not_done)} loop(s) did not close their browsers within {CLOSE_TIMEOUT}s")
+
+
+class _BrowserSession:
+    """A launched Chromium with one reusable context per set of context options."""
+
+    def __init__(self, playwright: Any, browser: Any):
+        self.playwright = playwright
+        self.browser = browser
+        self.contexts: Dict[str, Any] = {}
+        self._lock = asyncio.Lock()
+
+    async def context(self, options: Dict[str, Any]) -> Any:
+        key = json.dumps(options, sort_keys=True, default=str)
+        async with self._lock:
+            context = self.contexts.get(key)
+            if context is None:
+                context = await self.browser.new_context(**options)
+                self.contexts[key] = context
+            return context
+
+
+class BrowserPool(_LeasePool):
+    """Shared headless Playwright Chromium; each lease gets its own page."""
+
+    name = 'BrowserPool'
+
+    async def _start(self) -> _BrowserSession:
+        if not PLAYWRIGHT_AVAILABLE:
+            raise RuntimeError("playwright package not available")
+        playwright = await async_playwright().start()
+        try:
+            browser = await playwright.chromium.launch(headless=True)
+        except Exception:
+            await playwright.stop()
+            raise
+        return _BrowserSession(playwright, browser)
+
+    async def _stop(self, session: _BrowserSession):
+        try:
+            await session.browser.close()
+        finally:
+            await session.playwright.stop()
+
+    def _is_healthy(self, session: _BrowserSession) -> bool:
+        return session.browser.is_connected()
+
+    @asynccontextmanager
+    async def page(self, **context_options):
+        """Open a page in the shared browser; `context_options` go to `new_context`."""
+        async with self.lease() as session:
+            context = await session.context(context_options)
+            page = await context.new_page()
+            try:
+                yield page
+            finally:
+                try:
+                    await page.close()
+                except Exception:
+                    pass
+
+
+class CrawlerPool(_LeasePool):
+    """Shared, already started crawl4ai `AsyncWebCrawler`."""
+
+    name = 'CrawlerPool'
+    retire_on_error = True  # crawl4ai reports page failures in its result; exceptions mean the browser broke
+
+    async def _start(self) -> Any:
+        from crawl4ai import AsyncWebCrawler, BrowserConfig
+
+        crawler = AsyncWebCrawler(config=BrowserConfig(headless=True, verbose=False))
+        await crawler.start()
+        return crawler
+
+    async def _stop(self, crawler: Any):
+        await crawler.close()
+
+    def _is_healthy(self, crawler: Any) -> bool:
+        return getattr(crawler, 'ready', True)
+
+
+_pool_settings: Dict[str, Any] = {}
+_browser_pool: Optional[BrowserPool] = None
+_crawler_pool: Optional[CrawlerPool] = None
+_pools_lock = threading.Lock()
+
+
+def configure_browser_pools(**settings):
+    """
+    Set the options of both pools (see `_LeasePool`). Live pools are kept when
+    the options are unchanged; otherwise they are closed and replaced lazily.
+    """
+    global _pool_settings, _browser_pool, _crawler_pool
+    with _pools_lock:
+        if settings == _pool_settings:
+            return
+        replaced = [pool for pool in (_browser_pool, _crawler_pool) if pool is not None]
+        _pool_settings = dict(settings)
+        _browser_pool = None
+        _crawler_pool = None
+    for pool in replaced:
+        run_cleanup(pool.aclose())
+
+
+def get_browser_pool() -> BrowserPool:
+    """Return the process-wide Playwright browser pool."""
+    global _browser_pool
+    with _pools_lock:
+        if _browser_pool is None:
+            _browser_pool = BrowserPool(**_pool_settings)
+        return _browser_pool
+
+
+def get_crawler_pool() -> CrawlerPool:
+    """Return the process-wide crawl4ai crawler pool."""
+    global _crawler_pool
+    with _pools_lock:
+        if _crawler_pool is None:
+            _crawler_pool = CrawlerPool(**_pool_settings)
+        return _crawler_pool
+
+
+async def close_browser_pools():
+    """Close all pooled browsers (called from `Config.close`)."""
+    with _pools_lock:
+        pools = [pool for pool in (_browser_pool, _crawler_pool) if pool is not None]
+    for pool in pools:
+        await pool.aclose()
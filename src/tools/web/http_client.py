@@ -0,0 +1,209 @@
+"""
+Shared HTTP client pool for the web tools.
+
+One `httpx.AsyncClient` is kept per (event loop, host), so repeated requests
+to the same search API or site reuse keep-alive connections (and HTTP/2 when
+the optional `h2` package is installed) instead of paying TCP/TLS setup on
+every call. Clients are bound to the loop that created them because tools
+also run inside the short-lived loops created by `run_async_safely`; a loop's
+clients are closed and forgotten when that loop finishes.
+"""
+
+import asyncio
+import random
+import threading
+import weakref
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+try:
+    import h2  # noqa: F401  # optional: enables HTTP/2
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+from ...utils.async_helpers import add_loop_finalizer, run_cleanup
+from ...utils.logger import get_logger
+
+logger = get_logger()
+
+RETRY_STATUS_CODES = (429, 502, 503, 504)
+CLOSE_TIMEOUT = 10.0  # seconds `aclose` waits for clients owned by other loops
+
+
+class HttpClientPool:
+    """
+    Per-host pooled async HTTP clients with a shared retry policy.
+
+    Args:
+        max_connections_per_host: Connection limit of each host's client.
+        max_keepalive_per_host: Idle connections kept open per host.
+        keepalive_expiry: Seconds an idle connection is kept.
+        timeout: Default request timeout in seconds.
+        retries: Extra attempts for connection errors and 429/5xx responses.
+        backoff: Base delay in seconds for exponential backoff between retries.
+    """
+
+    def __init__(
+        self,
+        max_connections_per_host: int = 10,
+        max_keepalive_per_host: int = 5,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 15.0,
+        retries: int = 2,
+        backoff: float = 0.5,
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections_per_host,
+            max_keepalive_connections=max_keepalive_per_host,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, httpx.AsyncClient]]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def client(self, url: str) -> httpx.AsyncClient:
+        """Return the pooled client for the host of `url` on the running loop."""
+        loop = asyncio.get_running_loop()
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            clients = self._clients.get(loop)
+            created = clients is None
+            if created:
+                clients = {}
+                self._clients[loop] = clients
+            client = clients.get(host)
+            if client is None or client.is_closed:
+                client = httpx.AsyncClient(
+                    limits=self.limits,
+                    timeout=self.timeout,
+                    http2=HTTP2_AVAILABLE,
+                )
+                clients[host] = client
+        if created:
+            # The clients' transports reference the loop, so the weak entry alone would never expire
+            add_loop_finalizer(lambda: self._close_loop_clients(clients), loop)
+        return client
+
+    async def _close_loop_clients(self, clients: Dict[str, httpx.AsyncClient]):
+        """Loop finalizer: close the finishing loop's clients and drop its entry."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._clients.get(loop) is clients:
+                del self._clients[loop]
+        await self._close_clients(clients)
+
+    @staticmethod
+    async def _close_clients(clients: Dict[str, httpx.AsyncClient]):
+        for client in clients.values():
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.debug(f"Error while closing HTTP client: {e}")
+
+    def _retry_delay(self, attempt: int, response: Optional[httpx.Response] = None) -> float:
+        if response is not None:
+            retry_after = response.headers.get('Retry-After')
+            if retry_after:
+                try:
+                    return min(float(retry_after), 30.0)
+                except ValueError:
+                    pass
+        return self.backoff * (2 ** attempt) * random.uniform(0.8, 1.2)
+
+    async def request(self, method: str, url: str, retries: Optional[int] = None, **kwargs) -> httpx.Response:
+        """
+        Send a request through the pooled client of the target host.
+
+        Connection errors, timeouts and 429/502/503/504 responses are retried
+        with exponential backoff (honouring `Retry-After`); the last response
+        is returned as-is, the last transport error is re-raised.
+        """
+        retries = self.retries if retries is None else retries
+        for attempt in range(retries + 1):
+            try:
+                response = await self.client(url).request(method, url, **kwargs)
+            except httpx.TransportError as e:
+                if attempt >= retries:
+                    raise
+                logger.debug(f"HTTP {method} {url} failed ({e!r}), retrying")
+                await asyncio.sleep(self._retry_delay(attempt))
+                continue
+            if response.status_code in RETRY_STATUS_CODES and attempt < retries:
+                logger.debug(f"HTTP {method} {url} returned {response.status_code}, retrying")
+                await asyncio.sleep(self._retry_delay(attempt, response))
+                continue
+            return response
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request('GET', url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request('POST', url, **kwargs)
+
+    async def aclose(self):
+        """
+        Close every pooled client. Clients of the running loop are closed
+        directly, clients of other live loops are closed on their own loop
+        (waiting up to `CLOSE_TIMEOUT`), and clients of loops that have
+        already stopped are dropped.
+        """
+        current_loop = asyncio.get_running_loop()
+        with self._lock:
+            pooled = list(self._clients.items())
+            self._clients = weakref.WeakKeyDictionary()
+        pending = []
+        for loop, clients in pooled:
+            if loop is current_loop:
+                await self._close_clients(clients)
+            elif loop.is_running():
+                future = asyncio.run_coroutine_threadsafe(self._close_clients(clients), loop)
+                pending.append(asyncio.wrap_future(future))
+        if pending:
+            _, not_done = await asyncio.wait(pending, timeout=CLOSE_TIMEOUT)
+            if not_done:
+                logger.warning(f"HttpClientPool: {len(not_done)} loop(s) did not close their clients within {CLOSE_TIMEOUT}s")
+
+
+_http_pool: Optional[HttpClientPool] = None
+_http_pool_settings: Optional[Dict[str, Any]] = None
+_http_pool_lock = threading.Lock()
+
+
+def configure_http_pool(**settings) -> HttpClientPool:
+    """
+    Use a shared pool built from `settings` (see `HttpClientPool`). The current
+    pool is kept when its settings are unchanged (runs in flight keep their
+    connections); otherwise it is replaced and closed.
+    """
+    global _http_pool, _http_pool_settings
+    with _http_pool_lock:
+        if _http_pool is not None and settings == _http_pool_settings:
+            return _http_pool
+        replaced, _http_pool = _http_pool, HttpClientPool(**settings)
+        _http_pool_settings = dict(settings)
+        pool = _http_pool
+    if replaced is not None:
+        run_cleanup(replaced.aclose())
+    return pool
+
+
+def get_http_pool() -> HttpClientPool:
+    """Return the process-wide pool, creating one with default settings if needed."""
+    global _http_pool
+    with _http_pool_lock:
+        if _http_pool is None:
+            _http_pool = HttpClientPool()
+        return _http_pool
+
+
+async def close_http_pool():
+    """Close all pooled clients (called from `Config.close`)."""
+    with _http_pool_lock:
+        pool = _http_pool
+    if pool is not None:
+        await pool.aclose()
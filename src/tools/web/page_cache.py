@@ -0,0 +1,220 @@
+"""
+On-disk cache of crawled pages for `Click`.
+
+Entries are keyed by the normalized URL and store the extracted markdown
+together with the `ETag` / `Last-Modified` validators of the response. The
+markdown itself is content-addressed (`blobs/<sha256>.md`), so mirrors of
+the same report under different URLs are stored once.
+
+- Within `ttl` an entry is served without touching the network.
+- After `ttl` it is revalidated with a conditional GET; a 304 keeps the
+  cached content, anything else triggers a full re-crawl.
+- Concurrent requests for the same URL (across agents, threads and event
+  loops) share a single fetch.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Awaitable, Callable, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from ...utils.logger import get_logger
+from ...utils.single_flight import SingleFlight
+
+logger = get_logger()
+
+DEFAULT_PAGE_TTL = 24 * 3600
+
+# Query parameters that only track the visitor and never change the page
+_TRACKING_PARAMS = {'spm', 'from', 'source', 'share_token', 'fbclid', 'gclid', 'msclkid', 'yclid', 'ref', 'ref_src'}
+
+_page_cache: Optional['PageCache'] = None
+
+
+def normalize_url(url: str) -> str:
+    """
+    Canonical form of `url` used as cache key: lower-case scheme and host,
+    no default port, no fragment, no tracking parameters, sorted query and
+    no trailing slash.
+    """
+    parts = urlsplit(url.strip())
+    scheme = (parts.scheme or 'http').lower()
+    host = (parts.hostname or '').lower()
+    if parts.port and not ((scheme == 'http' and parts.port == 80) or (scheme == 'https' and parts.port == 443)):
+        host = f"{host}:{parts.port}"
+    path = parts.path.rstrip('/') or '/'
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith('utm_') and key.lower() not in _TRACKING_PARAMS
+    )
+    return urlunsplit((scheme, host, path, urlencode(query), ''))
+
+
+def configure_page_cache(cache_dir: Optional[str], ttl: float = DEFAULT_PAGE_TTL) -> Optional['PageCache']:
+    """Set the process-wide page cache directory; `None` disables caching."""
+    global _page_cache
+    if cache_dir is None:
+        _page_cache = None
+    elif _page_cache is None or _page_cache.cache_dir != os.path.abspath(cache_dir):
+        _page_cache = PageCache(cache_dir, ttl=ttl)
+    else:
+        _page_cache.ttl = ttl
+    return _page_cache
+
+
+def get_page_cache() -> Optional['PageCache']:
+    return _page_cache
+
+
+@dataclass
+class PageEntry:
+    """A cached page: extracted content plus the validators of its response."""
+    url: str
+    content_hash: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    fetched_at: float = 0.0
+    validated_at: float = 0.0
+
+
+@dataclass
+class FetchedPage:
+    """What a page loader returns: extracted content and response headers."""
+    content: str
+    headers: Optional[Dict[str, str]] = None
+
+
+def _header(headers: Optional[Dict[str, str]], name: str) -> Optional[str]:
+    if not headers:
+        return None
+    for key, value in headers.items():
+        if key.lower() == name.lower():
+            return value
+    return None
+
+
+class PageCache:
+    """
+    Args:
+        cache_dir: Directory shared across runs (`entries/` and `blobs/` inside).
+        ttl: Seconds a page is served without revalidation.
+    """
+
+    def __init__(self, cache_dir: str, ttl: float = DEFAULT_PAGE_TTL):
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.ttl = ttl
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self._entry_dir = os.path.join(self.cache_dir, 'entries')
+        self._blob_dir = os.path.join(self.cache_dir, 'blobs')
+        os.makedirs(self._entry_dir, exist_ok=True)
+        os.makedirs(self._blob_dir, exist_ok=True)
+        self._flight = SingleFlight()
+
+    @property
+    def coalesced(self) -> int:
+        return self._flight.coalesced
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self._entry_dir, hashlib.sha256(key.encode('utf-8')).hexdigest() + '.json')
+
+    def _blob_path(self, content_hash: str) -> str:
+        return os.path.join(self._blob_dir, f"{content_hash}.md")
+
+    @staticmethod
+    def _write_atomic(path: str, text: str):
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+
+    def _load(self, key: str) -> Optional[PageEntry]:
+        try:
+            with open(self._entry_path(key), 'r', encoding='utf-8') as f:
+                return PageEntry(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def _read_content(self, entry: PageEntry) -> Optional[str]:
+        try:
+            with open(self._blob_path(entry.content_hash), 'r', encoding='utf-8') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _save(self, key: str, entry: PageEntry, content: Optional[str] = None):
+        try:
+            if content is not None:
+                blob_path = self._blob_path(entry.content_hash)
+                if not os.path.exists(blob_path):
+                    self._write_atomic(blob_path, content)
+            self._write_atomic(self._entry_path(key), json.dumps(asdict(entry), ensure_ascii=False))
+        except OSError as e:
+            logger.warning(f"PageCache: failed to write entry for {entry.url}: {e}")
+
+    def get(self, url: str) -> Optional[str]:
+        """Return cached content for `url` regardless of age, or None."""
+        entry = self._load(normalize_url(url))
+        return self._read_content(entry) if entry is not None else None
+
+    async def fetch(
+        self,
+        url: str,
+        loader: Callable[[], Awaitable[FetchedPage]],
+        revalidate: Callable[[str, Dict[str, str]], Awaitable[bool]],
+    ) -> str:
+        """
+        Return the content of `url`, using the cache when possible.
+
+        Args:
+            url: Page URL (normalized for the cache key).
+            loader: Crawls and extracts the page; exceptions are not cached.
+            revalidate: Sends a conditional request with the given headers and
+                returns True when the server answered 304 Not Modified.
+        """
+        key = normalize_url(url)
+        return await self._flight.do(key, lambda: self._fetch_owned(url, key, loader, revalidate))
+
+    async def _fetch_owned(self, url, key, loader, revalidate) -> str:
+        now = time.time()
+        entry = self._load(key)
+        content = self._read_content(entry) if entry is not None else None
+        if content is not None:
+            if now - entry.validated_at <= self.ttl:
+                self.hits += 1
+                return content
+            conditional = {}
+            if entry.etag:
+                conditional['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                conditional['If-Modified-Since'] = entry.last_modified
+            if conditional:
+                try:
+                    not_modified = await revalidate(url, conditional)
+                except Exception as e:
+                    logger.warning(f"PageCache: revalidation of {url} failed ({e}), serving cached copy")
+                    not_modified = True
+                if not_modified:
+                    self.revalidated += 1
+                    entry.validated_at = now
+                    self._save(key, entry)
+                    return content
+
+        self.misses += 1
+        page = await loader()
+        content_hash = hashlib.sha256(page.content.encode('utf-8')).hexdigest()
+        entry = PageEntry(
+            url=url,
+            content_hash=content_hash,
+            etag=_header(page.headers, 'ETag'),
+            last_modified=_header(page.headers, 'Last-Modified'),
+            fetched_at=now,
+            validated_at=now,
+        )
+        self._save(key, entry, page.content)
+        return page.content
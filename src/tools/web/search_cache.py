@@ -0,0 +1,152 @@
+"""
+搜索结果缓存
+
+SearchEnginePool 合并去重后的结果按 (规范化查询, 策略, 引擎组合) 寻址：
+- 规范化只折叠不改变含义的差异：全角转半角、小写、合并空白，如 "宁德时代　２０２４年报" 与 "宁德时代 2024年报"
+  视为同一查询；标点、引号、`-`排除词、`site:`等搜索运算符与词序原样保留
+- 每条结果一个JSON文件，文件mtime即写入时间，超过TTL视为过期；跨运行共享
+- 同一查询的并发请求只执行一次搜索（请求合并），跨线程、跨事件循环生效
+- 空结果（全部引擎失败或超时）不缓存
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+import unicodedata
+from typing import Awaitable, Callable, List, Optional
+
+from .base_search import SearchResult
+from ...utils.logger import get_logger
+from ...utils.single_flight import SingleFlight
+
+logger = get_logger()
+
+DEFAULT_SEARCH_TTL = 6 * 3600
+
+# 大写布尔运算符区分大小写（小写的 or/and 只是普通词）
+_BOOLEAN_OPERATORS = {'OR', 'AND'}
+
+_search_cache: Optional['SearchResultCache'] = None
+
+
+def normalize_query(query: str) -> str:
+    """规范化查询：NFKC（全角转半角）、小写（大写 OR/AND 除外）、合并空白；运算符与词序保持不变。"""
+    tokens = unicodedata.normalize('NFKC', query).split()
+    return ' '.join(token if token in _BOOLEAN_OPERATORS else token.lower() for token in tokens)
+
+
+def configure_search_cache(cache_dir: Optional[str], ttl: float = DEFAULT_SEARCH_TTL) -> Optional['SearchResultCache']:
+    """设置进程内共享的搜索结果缓存目录；传入 None 关闭缓存。"""
+    global _search_cache
+    if cache_dir is None:
+        _search_cache = None
+    elif _search_cache is None or _search_cache.cache_dir != os.path.abspath(cache_dir):
+        _search_cache = SearchResultCache(cache_dir, ttl=ttl)
+    else:
+        _search_cache.ttl = ttl
+    return _search_cache
+
+
+def get_search_cache() -> Optional['SearchResultCache']:
+    return _search_cache
+
+
+def _copy_results(results: List[SearchResult]) -> List[SearchResult]:
+    return [result.model_copy(deep=True) for result in results]
+
+
+class SearchResultCache:
+    """
+    搜索结果缓存目录，每条查询一个 `<key>.json` 文件。
+
+    Args:
+        cache_dir: 缓存目录（跨运行共享）
+        ttl: 结果有效期（秒）
+    """
+
+    def __init__(self, cache_dir: str, ttl: float = DEFAULT_SEARCH_TTL):
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.ttl = ttl
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self._flight = SingleFlight()
+
+    @property
+    def coalesced(self) -> int:
+        return self._flight.coalesced
+
+    @staticmethod
+    def make_key(query: str, strategy: str, engines: List[str]) -> str:
+        """缓存键：规范化查询 + 策略 + 引擎组合（引擎顺序决定合并优先级，保留顺序）。"""
+        payload = json.dumps(
+            {'query': normalize_query(query), 'strategy': strategy, 'engines': list(engines)},
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[List[SearchResult]]:
+        """读取未过期的结果；未命中返回 None。"""
+        path = self._path(key)
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl:
+                return None
+            with open(path, 'r', encoding='utf-8') as f:
+                return [SearchResult(**item) for item in json.load(f)['results']]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def put(self, key: str, query: str, strategy: str, engines: List[str], results: List[SearchResult]):
+        """写入结果（原子替换）。"""
+        payload = {
+            'query': query,
+            'strategy': strategy,
+            'engines': list(engines),
+            'created_at': time.time(),
+            'results': [result.model_dump() for result in results],
+        }
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(payload, f, ensure_ascii=False, default=str)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"写入搜索结果缓存失败: {e}")
+
+    async def fetch(
+        self,
+        query: str,
+        strategy: str,
+        engines: List[str],
+        loader: Callable[[], Awaitable[List[SearchResult]]],
+    ) -> List[SearchResult]:
+        """
+        读缓存；未命中时调用 loader 搜索并写入。同一键的并发调用只执行一次 loader。
+        返回结果的副本，调用方可以自由修改。
+        """
+        key = self.make_key(query, strategy, engines)
+        cached = self.get(key)
+        if cached is not None:
+            self.hits += 1
+            logger.info(f"Search cache hit for query: '{query}' ({len(cached)} results)")
+            return cached
+
+        async def load() -> List[SearchResult]:
+            # 排队期间其他线程/运行可能刚刚写入
+            results = self.get(key)
+            if results is not None:
+                self.hits += 1
+                return results
+            self.misses += 1
+            results = await loader()
+            if results:
+                self.put(key, query, strategy, engines, results)
+            return results
+
+        return await self._flight.do(key, load, share=_copy_results)
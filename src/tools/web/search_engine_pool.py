@@ -5,6 +5,7 @@
 - 并发查询多个引擎
 - 自动配额管理和降级
 - 结果去重和合并
+- 搜索结果缓存与重复查询合并（见 search_cache.py）
 """
 
 import asyncio
@@ -12,6 +13,7 @@ from typing import List, Dict, Set, Optional
 from dataclasses import dataclass
 from .quota_manager import QuotaManager
 from .base_search import SearchResult
+from .search_cache import SearchResultCache, get_search_cache
 from ...utils.logger import get_logger
 
 logger = get_logger()
@@ -61,7 +63,12 @@ class SearchEnginePool:
         )
     }
     
-    def __init__(self, engines: Dict, quota_manager: Optional[QuotaManager] = None):
+    def __init__(
+        self,
+        engines: Dict,
+        quota_manager: Optional[QuotaManager] = None,
+        result_cache: Optional[SearchResultCache] = None
+    ):
         """
         初始化搜索引擎池
         
@@ -72,9 +79,11 @@ class SearchEnginePool:
                     "duckduckgo": DuckDuckGoSearch()
                 }
             quota_manager: 配额管理器实例，None则自动创建
+            result_cache: 搜索结果缓存，None则使用进程级缓存（由Config设置，未设置时不缓存）
         """
         self.engines = engines
         self.quota_manager = quota_manager or QuotaManager()
+        self.result_cache = result_cache
         
         logger.info(f"SearchEnginePool initialized with {len(engines)} engines: {list(engines.keys())}")
     
@@ -120,7 +129,33 @@ class SearchEnginePool:
         
         logger.info(f"Available engines: {available_engines}")
         
-        # 执行搜索（带超时）
+        # 命中缓存时不调用引擎、不消耗配额；相同查询并发时只搜索一次
+        result_cache = self.result_cache or get_search_cache()
+        if result_cache is not None:
+            merged_results = await result_cache.fetch(
+                query,
+                strategy,
+                available_engines,
+                lambda: self._search_engines(query, search_strategy, available_engines, timeout)
+            )
+        else:
+            merged_results = await self._search_engines(query, search_strategy, available_engines, timeout)
+        
+        # 限制结果数量
+        final_results = merged_results[:max_results]
+        
+        logger.info(f"Search completed: {len(final_results)} unique results from {len(available_engines)} engines")
+        
+        return final_results
+    
+    async def _search_engines(
+        self,
+        query: str,
+        search_strategy: SearchStrategy,
+        available_engines: List[str],
+        timeout: float
+    ) -> List[SearchResult]:
+        """执行搜索（带超时）并合并去重，超时返回空列表"""
         try:
             if search_strategy.parallel and len(available_engines) > 1:
                 results_list = await asyncio.wait_for(
@@ -137,14 +172,7 @@ class SearchEnginePool:
             return []
         
         # 合并去重
-        merged_results = self._merge_and_deduplicate(results_list)
-        
-        # 限制结果数量
-        final_results = merged_results[:max_results]
-        
-        logger.info(f"Search completed: {len(final_results)} unique results from {len(available_engines)} engines")
-        
-        return final_results
+        return self._merge_and_deduplicate(results_list)
     
     def _select_strategy(self) -> str:
         """
@@ -26,6 +26,8 @@ except ImportError:
 
 from ..base import Tool, ToolResult
 from .base_search import SearchResult, ImageSearchResult
+from .http_client import get_http_pool
+from .browser_pool import get_browser_pool
 from ...utils.logger import get_logger
 
 logger = get_logger()
@@ -89,7 +91,8 @@ class TavilySearch(Tool):
             
             # 执行搜索
             # search_depth: "basic" 或 "advanced"
-            response = client.search(
+            response = await self.run_sync(
+                client.search,
                 query=query,
                 search_depth="basic",
                 max_results=10,
@@ -173,17 +176,12 @@ class PlaywrightSearch(Tool):
             return []
 
         results = []
-        async with async_playwright() as p:
-            # Launch Chromium
-            browser = await p.chromium.launch(headless=True)
-            context = await browser.new_context(
+        try:
+            async with get_browser_pool().page(
                 user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36 Edg/125.0.0.0",
                 locale="zh-CN",
                 viewport={'width': 2560, 'height': 1440}
-            )
-            page = await context.new_page()
-                
-            try:
+            ) as page:
                 # Build the search URL
                 search_url = f"https://cn.bing.com/search?q={urllib.parse.quote_plus(query)}"
                 
@@ -232,10 +230,8 @@ class PlaywrightSearch(Tool):
                             source=f'{title}\n{link}'
                         ))
                         
-            except Exception as e:
-                logger.error(f"PlaywrightSearch: An error occurred during the search: {e}")
-            finally:
-                await browser.close()
+        except Exception as e:
+            logger.error(f"PlaywrightSearch: An error occurred during the search: {e}")
         
         return results
 
@@ -274,35 +270,34 @@ class BingSearch(Tool):
         encoded_query = urllib.parse.quote_plus(query)
         url = f"https://cn.bing.com/search?q={encoded_query}"
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=self.headers)
+        response = await get_http_pool().get(url, headers=self.headers)
 
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
-                result_list = []
-
-                # Extract the primary search-result content
-                for item in soup.find_all('li', class_='b_algo'):
-                    try:
-                        title = item.find('h2').text
-                        description_tag = item.find('p')
-                        description = description_tag.text if description_tag else "No description available"
-                        link = item.find('a')['href']
-                        result_list.append(SearchResult(
-                            query=query,
-                            name=title,
-                            description=description,
-                            link=link,
-                            data=[{'title': title, 'description': description, 'link': link}],
-                            source=f'{title}\n{link}'
-                        ))
-                    except Exception as e:
-                        logger.warning(f"BingSearch: error extracting result: {e}")
+        if response.status_code == 200:
+            soup = BeautifulSoup(response.content, 'html.parser')
+            result_list = []
 
-                return result_list
-            else:
-                logger.error(f"BingSearch: Request failed with status code {response.status_code}")
-                return []
+            # Extract the primary search-result content
+            for item in soup.find_all('li', class_='b_algo'):
+                try:
+                    title = item.find('h2').text
+                    description_tag = item.find('p')
+                    description = description_tag.text if description_tag else "No description available"
+                    link = item.find('a')['href']
+                    result_list.append(SearchResult(
+                        query=query,
+                        name=title,
+                        description=description,
+                        link=link,
+                        data=[{'title': title, 'description': description, 'link': link}],
+                        source=f'{title}\n{link}'
+                    ))
+                except Exception as e:
+                    logger.warning(f"BingSearch: error extracting result: {e}")
+
+            return result_list
+        else:
+            logger.error(f"BingSearch: Request failed with status code {response.status_code}")
+            return []
 
 
 class BochaSearch(Tool):
@@ -326,38 +321,37 @@ class BochaSearch(Tool):
         }
 
     async def api_function(self, query: str) -> List[ToolResult]:
-        async with httpx.AsyncClient() as client:
-            url = "https://api.bochaai.com/v1/web-search"
-            payload = json.dumps({
-                "query": query,
-                "summary": True,
-                "count": 10
-            })
-            
-            response = await client.post(url, headers=self.headers, data=payload)
-            try:
-                result = response.json()['data']['webPages']['value']
-                result_list = []
-                if len(result) > 0:
-                    for item in result:
-                        if 'name' in item and 'url' in item and 'snippet' in item:
-                            title = item['name']
-                            link = item['url']
-                            description = item['summary']
-                            result_list.append(SearchResult(
-                                query=query,
-                                name=title,
-                                description=description,
-                                link=link,
-                                data=[{'title': title, 'link': link, 'description': description}],
-                                source=f'{title}\n{link}'
-                            ))
-                    return result_list
-                else:
-                    return []
-            except Exception as e:
-                logger.error(f"BochaSearch: Error parsing response: {e}")
+        url = "https://api.bochaai.com/v1/web-search"
+        payload = json.dumps({
+            "query": query,
+            "summary": True,
+            "count": 10
+        })
+        
+        response = await get_http_pool().post(url, headers=self.headers, data=payload)
+        try:
+            result = response.json()['data']['webPages']['value']
+            result_list = []
+            if len(result) > 0:
+                for item in result:
+                    if 'name' in item and 'url' in item and 'snippet' in item:
+                        title = item['name']
+                        link = item['url']
+                        description = item['summary']
+                        result_list.append(SearchResult(
+                            query=query,
+                            name=title,
+                            description=description,
+                            link=link,
+                            data=[{'title': title, 'link': link, 'description': description}],
+                            source=f'{title}\n{link}'
+                        ))
+                return result_list
+            else:
                 return []
+        except Exception as e:
+            logger.error(f"BochaSearch: Error parsing response: {e}")
+            return []
 
 
 class SerperSearch(Tool):
@@ -381,35 +375,34 @@ class SerperSearch(Tool):
         }
 
     async def api_function(self, query: str) -> List[ToolResult]:
-        async with httpx.AsyncClient() as client:
-            url = "https://google.serper.dev/search"
-            payload = json.dumps({
-                "q": query,
-            })
-            
-            response = await client.post(url, headers=self.headers, data=payload)
-            try:
-                result = response.json().get('organic', [])
-                result_list = []
-                if len(result) > 0:
-                    for item in result:
-                        title = item.get('title', '')
-                        link = item.get('link', '')
-                        description = item.get('snippet', '')
-                        result_list.append(SearchResult(
-                            query=query,
-                            name=title,
-                            description=description,
-                            link=link,
-                            data=[{'title': title, 'link': link, 'description': description}],
-                            source=f'{title}\n{link}'
-                        ))
-                    return result_list
-                else:
-                    return []
-            except Exception as e:
-                logger.error(f"SerperSearch: Error parsing response: {e}")
+        url = "https://google.serper.dev/search"
+        payload = json.dumps({
+            "q": query,
+        })
+        
+        response = await get_http_pool().post(url, headers=self.headers, data=payload)
+        try:
+            result = response.json().get('organic', [])
+            result_list = []
+            if len(result) > 0:
+                for item in result:
+                    title = item.get('title', '')
+                    link = item.get('link', '')
+                    description = item.get('snippet', '')
+                    result_list.append(SearchResult(
+                        query=query,
+                        name=title,
+                        description=description,
+                        link=link,
+                        data=[{'title': title, 'link': link, 'description': description}],
+                        source=f'{title}\n{link}'
+                    ))
+                return result_list
+            else:
                 return []
+        except Exception as e:
+            logger.error(f"SerperSearch: Error parsing response: {e}")
+            return []
 
 
 class DuckDuckGoSearch(Tool):
@@ -436,45 +429,44 @@ class DuckDuckGoSearch(Tool):
         logger.info(f"Searching DuckDuckGo for '{query}'...")
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(URL, headers=self.headers, params=params)
-                response.raise_for_status()
+            response = await get_http_pool().get(URL, headers=self.headers, params=params)
+            response.raise_for_status()
 
-                soup = BeautifulSoup(response.text, 'html.parser')
-                results_container = soup.find_all('div', class_='result')
-                
-                if not results_container:
-                    return []
+            soup = BeautifulSoup(response.text, 'html.parser')
+            results_container = soup.find_all('div', class_='result')
+            
+            if not results_container:
+                return []
 
-                search_results = []
-                for result in results_container:
-                    title_element = result.find('a', class_='result__a')
-                    if not title_element:
-                        continue
+            search_results = []
+            for result in results_container:
+                title_element = result.find('a', class_='result__a')
+                if not title_element:
+                    continue
 
-                    title = title_element.text.strip()
-                    raw_link = title_element.get('href', '')
-                    
-                    # Handle DuckDuckGo redirect links
-                    if raw_link and 'uddg=' in raw_link:
-                        from urllib.parse import unquote
-                        link = unquote(raw_link.split('uddg=')[-1])
-                    else:
-                        link = raw_link
+                title = title_element.text.strip()
+                raw_link = title_element.get('href', '')
+                
+                # Handle DuckDuckGo redirect links
+                if raw_link and 'uddg=' in raw_link:
+                    from urllib.parse import unquote
+                    link = unquote(raw_link.split('uddg=')[-1])
+                else:
+                    link = raw_link
 
-                    snippet_element = result.find('a', class_='result__snippet')
-                    snippet = snippet_element.text.strip() if snippet_element else "..."
+                snippet_element = result.find('a', class_='result__snippet')
+                snippet = snippet_element.text.strip() if snippet_element else "..."
 
-                    search_results.append(SearchResult(
-                        query=query,
-                        name=title,
-                        description=snippet,
-                        link=link,
-                        data=[{'title': title, 'link': link, 'description': snippet}],
-                        source=f'{title}\n{link}'
-                    ))
+                search_results.append(SearchResult(
+                    query=query,
+                    name=title,
+                    description=snippet,
+                    link=link,
+                    data=[{'title': title, 'link': link, 'description': snippet}],
+                    source=f'{title}\n{link}'
+                ))
 
-                return search_results
+            return search_results
         except Exception as e:
             logger.error(f"DuckDuckGoSearch: Error: {e}")
             return []
@@ -503,46 +495,44 @@ class SogouSearch(Tool):
     async def api_function(self, query: str) -> List[ToolResult]:
         search_results = []
         try:
-            import httpx
             from bs4 import BeautifulSoup
             
             url = "https://www.sogou.com/web"
             params = {"query": query}
             
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                response = await client.get(url, params=params, headers=self.headers)
-                if response.status_code == 200:
-                    soup = BeautifulSoup(response.text, 'html.parser')
-                    # Sogou results are usually in 'vrwrap' or 'rb' classes
-                    results_container = soup.find_all('div', class_=['vrwrap', 'rb'])
+            response = await get_http_pool().get(url, params=params, headers=self.headers, timeout=15.0)
+            if response.status_code == 200:
+                soup = BeautifulSoup(response.text, 'html.parser')
+                # Sogou results are usually in 'vrwrap' or 'rb' classes
+                results_container = soup.find_all('div', class_=['vrwrap', 'rb'])
+                
+                for result in results_container:
+                    title_tag = result.find('h3')
+                    if not title_tag:
+                        continue
                     
-                    for result in results_container:
-                        title_tag = result.find('h3')
-                        if not title_tag:
-                            continue
-                        
-                        a_tag = title_tag.find('a')
-                        if not a_tag:
-                            continue
-                            
-                        title = a_tag.get_text(strip=True)
-                        link = a_tag.get('href', '')
+                    a_tag = title_tag.find('a')
+                    if not a_tag:
+                        continue
                         
-                        # Sogou links are often redirects
-                        if link.startswith('/'):
-                            link = "https://www.sogou.com" + link
-                            
-                        abstract_tag = result.find('div', class_=['vr-abstract', 'str-text-info', 'content-extract'])
-                        description = abstract_tag.get_text(strip=True) if abstract_tag else "..."
+                    title = a_tag.get_text(strip=True)
+                    link = a_tag.get('href', '')
+                    
+                    # Sogou links are often redirects
+                    if link.startswith('/'):
+                        link = "https://www.sogou.com" + link
                         
-                        search_results.append(SearchResult(
-                            query=query,
-                            name=title,
-                            description=description,
-                            link=link,
-                            data=[{'title': title, 'link': link, 'description': description}],
-                            source=f'{title}\n{link}'
-                        ))
+                    abstract_tag = result.find('div', class_=['vr-abstract', 'str-text-info', 'content-extract'])
+                    description = abstract_tag.get_text(strip=True) if abstract_tag else "..."
+                    
+                    search_results.append(SearchResult(
+                        query=query,
+                        name=title,
+                        description=description,
+                        link=link,
+                        data=[{'title': title, 'link': link, 'description': description}],
+                        source=f'{title}\n{link}'
+                    ))
             return search_results
         except Exception as e:
             logger.error(f"SogouSearch: Error: {e}")
@@ -585,42 +575,41 @@ class InDomainSearch_Request(Tool):
 
     async def api_function(self, query: str) -> List[ToolResult]:
         final_result_list = []
-        async with httpx.AsyncClient() as client:
-            for domain in self.domain_list[:2]:  # Limit the number of domains per call
-                domain_query = f"site:{domain} {query}"
-                params = {
-                    "q": domain_query, 
-                    "sc": "0-10", 
-                    "ajaxnorecss": "1", 
-                    "jsoncbid": "0", 
-                    "qs": "n", 
-                    "form": "QBRE", 
-                    "sp": "-1"
-                }
-                url = "https://www.bing.com/search"
-                try:
-                    response = await client.get(url, headers=self.headers, params=params)
-                    
-                    if response.status_code == 200:
-                        soup = BeautifulSoup(response.content, 'html.parser')
-                        for item in soup.find_all('li', class_='b_algo'):
-                            try:
-                                title = item.find('h2').text
-                                description_tag = item.find('p')
-                                description = description_tag.text if description_tag else "No description available"
-                                link = item.find('a')['href']
-                                final_result_list.append(SearchResult(
-                                    query=query,
-                                    name=title,
-                                    description=description,
-                                    link=link,
-                                    data=[{'title': title, 'description': description, 'link': link}],
-                                    source=f'{title}\n{link}'
-                                ))
-                            except Exception:
-                                continue
-                except Exception as e:
-                    logger.error(f"InDomainSearch_Request: Error searching domain {domain}: {e}")
+        for domain in self.domain_list[:2]:  # Limit the number of domains per call
+            domain_query = f"site:{domain} {query}"
+            params = {
+                "q": domain_query, 
+                "sc": "0-10", 
+                "ajaxnorecss": "1", 
+                "jsoncbid": "0", 
+                "qs": "n", 
+                "form": "QBRE", 
+                "sp": "-1"
+            }
+            url = "https://www.bing.com/search"
+            try:
+                response = await get_http_pool().get(url, headers=self.headers, params=params)
+                
+                if response.status_code == 200:
+                    soup = BeautifulSoup(response.content, 'html.parser')
+                    for item in soup.find_all('li', class_='b_algo'):
+                        try:
+                            title = item.find('h2').text
+                            description_tag = item.find('p')
+                            description = description_tag.text if description_tag else "No description available"
+                            link = item.find('a')['href']
+                            final_result_list.append(SearchResult(
+                                query=query,
+                                name=title,
+                                description=description,
+                                link=link,
+                                data=[{'title': title, 'description': description, 'link': link}],
+                                source=f'{title}\n{link}'
+                            ))
+                        except Exception:
+                            continue
+            except Exception as e:
+                logger.error(f"InDomainSearch_Request: Error searching domain {domain}: {e}")
         return final_result_list
 
 
@@ -653,46 +642,45 @@ class BingImageSearch(Tool):
         url = f"https://www.bing.com/images/search?q={query}&form=HDRSC3&first=1"
         
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url=url, headers=self.headers, timeout=10)
-                response.raise_for_status()
+            response = await get_http_pool().get(url=url, headers=self.headers, timeout=10)
+            response.raise_for_status()
 
-                # Parse the HTML payload
-                soup = BeautifulSoup(response.text, 'html.parser')
-                result_list = []
+            # Parse the HTML payload
+            soup = BeautifulSoup(response.text, 'html.parser')
+            result_list = []
 
-                # Locate image metadata
-                image_items = soup.find_all('a', class_='iusc')
+            # Locate image metadata
+            image_items = soup.find_all('a', class_='iusc')
 
-                for item in image_items:
-                    try:
-                        # Parse the embedded JSON metadata
-                        json_data = json.loads(item['m'])
-                        
-                        # Extract fields
-                        title = json_data.get('t', "Untitled")
-                        image_url = json_data.get('murl')
-                        page_url = json_data.get('purl')
+            for item in image_items:
+                try:
+                    # Parse the embedded JSON metadata
+                    json_data = json.loads(item['m'])
+                    
+                    # Extract fields
+                    title = json_data.get('t', "Untitled")
+                    image_url = json_data.get('murl')
+                    page_url = json_data.get('purl')
 
-                        if image_url and page_url:
-                            result_list.append(ImageSearchResult(
-                                query=query,
-                                name=title,
-                                description=f"Image search result: {title}",
-                                link=page_url,
-                                data=[{
-                                    'title': title,
-                                    'image_url': image_url,
-                                    'page_url': page_url
-                                }]
-                            ))
-                    except (KeyError, json.JSONDecodeError, TypeError):
-                        continue
+                    if image_url and page_url:
+                        result_list.append(ImageSearchResult(
+                            query=query,
+                            name=title,
+                            description=f"Image search result: {title}",
+                            link=page_url,
+                            data=[{
+                                'title': title,
+                                'image_url': image_url,
+                                'page_url': page_url
+                            }]
+                        ))
+                except (KeyError, json.JSONDecodeError, TypeError):
+                    continue
 
-                if not result_list:
-                    return []
+            if not result_list:
+                return []
 
-                return result_list
+            return result_list
         except httpx.RequestError as e:
             logger.error(f"BingImageSearch: Error: {e}")
             return []
@@ -1,8 +1,14 @@
 import asyncio
-import httpx
-from typing import List, Dict, Any, Optional
+import time
+import weakref
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Dict, Any, Optional, Union
+from urllib.parse import urlsplit
 from pydantic import Field
 from .base_search import SearchResult
+from .http_client import get_http_pool
+from .browser_pool import get_crawler_pool
+from .page_cache import FetchedPage, get_page_cache
 from ..base import Tool, ToolResult
 from ...utils.logger import get_logger
 
@@ -19,71 +25,136 @@ class Click(Tool):
     """
     Tool for crawling web pages and extracting content.
     Uses crawl4ai as primary engine with fallback to simple fetch.
+
+    Several URLs can be crawled in one call; they are fetched concurrently,
+    with at most `max_per_domain` requests in flight per domain and at least
+    `domain_delay` seconds between request starts on the same domain.
     """
 
-    def __init__(self):
+    def __init__(self, max_per_domain: int = 2, domain_delay: float = 0.5):
         super().__init__(
             name="Click",
-            description="Extract full content from a given URL. Useful for reading specific articles or reports.",
+            description="Extract full content from one or more URLs. Useful for reading specific articles or reports.",
             parameters=[{
                 "name": "url",
-                "type": "str",
-                "description": "The URL to crawl",
+                "type": "str | List[str]",
+                "description": "The URL to crawl, or a list of URLs to crawl concurrently",
                 "required": True
             }]
         )
         self.backend = 'crawl4ai'
         self.type = 'tool_crawler'
+        self.max_per_domain = max(1, max_per_domain)
+        self.domain_delay = domain_delay
+        # Per-domain gates are bound to the event loop that created them
+        self._domain_gates: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, Dict[str, Any]]]" = weakref.WeakKeyDictionary()
+
+    @asynccontextmanager
+    async def _polite(self, url: str):
+        """Hold a per-domain slot and keep `domain_delay` between request starts."""
+        domain = (urlsplit(url).hostname or '').lower()
+        gates = self._domain_gates.setdefault(asyncio.get_running_loop(), {})
+        gate = gates.get(domain)
+        if gate is None:
+            gate = gates[domain] = {'semaphore': asyncio.Semaphore(self.max_per_domain), 'next_start': 0.0}
+        async with gate['semaphore']:
+            now = time.monotonic()
+            start = max(now, gate['next_start'])
+            gate['next_start'] = start + self.domain_delay
+            if start > now:
+                await asyncio.sleep(start - now)
+            yield
+
+    async def _fetch_response(self, url: str, headers: Optional[Dict[str, str]] = None):
+        request_headers = {
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+        }
+        request_headers.update(headers or {})
+        return await get_http_pool().get(url, headers=request_headers, timeout=30.0, follow_redirects=True)
+
+    @staticmethod
+    def _extract_text(html: str) -> str:
+        # Simple markdown-like conversion or just return text
+        from bs4 import BeautifulSoup
+        soup = BeautifulSoup(html, 'html.parser')
+        # Remove script and style elements
+        for script in soup(["script", "style"]):
+            script.decompose()
+        return soup.get_text(separator='\n', strip=True)
 
     async def fetch_url(self, url: str) -> str:
         """Fallback method to fetch URL content using httpx."""
         try:
-            async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
-                headers = {
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-                }
-                response = await client.get(url, headers=headers)
-                response.raise_for_status()
-                # Simple markdown-like conversion or just return text
-                from bs4 import BeautifulSoup
-                soup = BeautifulSoup(response.text, 'html.parser')
-                # Remove script and style elements
-                for script in soup(["script", "style"]):
-                    script.decompose()
-                return soup.get_text(separator='\n', strip=True)
+            response = await self._fetch_response(url)
+            response.raise_for_status()
+            return self._extract_text(response.text)
         except Exception as e:
             logger.error(f"Fallback fetch failed for {url}: {e}")
             return f"Error fetching content: {str(e)}"
 
-    async def api_function(self, url: str) -> List[ClickResult]:
-        """Execute the crawling action."""
-        content = ""
-        success = False
-        
+    async def _crawl(self, url: str) -> FetchedPage:
+        async with self._polite(url):
+            return await self._crawl_page(url)
+
+    async def _crawl_page(self, url: str) -> FetchedPage:
+        """Crawl `url` with crawl4ai, falling back to httpx; raises if both fail."""
         try:
-            from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig
+            from crawl4ai import CrawlerRunConfig
             
-            browser_conf = BrowserConfig(headless=True, verbose=False)
             run_conf = CrawlerRunConfig(cache_mode="BYPASS")
             
-            async with AsyncWebCrawler(config=browser_conf) as crawler:
+            async with get_crawler_pool().lease() as crawler:
                 result = await crawler.arun(url=url, config=run_conf)
                 if result and result.success:
-                    content = result.markdown
-                    success = True
-                else:
-                    logger.warning(f"Crawl4AI failed for {url}, falling back...")
+                    return FetchedPage(content=str(result.markdown), headers=getattr(result, 'response_headers', None))
+                logger.warning(f"Crawl4AI failed for {url}, falling back...")
         except Exception as e:
             logger.warning(f"Crawl4AI error for {url}: {e}, falling back...")
 
-        if not success:
-            content = await self.fetch_url(url)
+        response = await self._fetch_response(url)
+        response.raise_for_status()
+        return FetchedPage(content=self._extract_text(response.text), headers=dict(response.headers))
+
+    async def _revalidate(self, url: str, conditional_headers: Dict[str, str]) -> bool:
+        async with self._polite(url):
+            response = await self._fetch_response(url, conditional_headers)
+        return response.status_code == 304
+
+    async def api_function(self, url: Union[str, List[str]]) -> List[ClickResult]:
+        """Crawl one URL, or several concurrently; results follow the input order."""
+        urls = [url] if isinstance(url, str) else list(dict.fromkeys(url))
+        results = {}
+        async for result in self.iter_batch(urls):
+            results[result.link] = result
+        return [results[item] for item in urls]
+
+    async def iter_batch(self, urls: List[str]) -> AsyncIterator[ClickResult]:
+        """Crawl `urls` concurrently and yield each `ClickResult` as soon as it is ready."""
+        tasks = [asyncio.ensure_future(self._click(url)) for url in dict.fromkeys(urls)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _click(self, url: str) -> ClickResult:
+        """Crawl a single URL (served from the page cache when enabled)."""
+        try:
+            page_cache = get_page_cache()
+            if page_cache is not None:
+                content = await page_cache.fetch(url, lambda: self._crawl(url), self._revalidate)
+            else:
+                content = (await self._crawl(url)).content
+        except Exception as e:
+            logger.error(f"Fallback fetch failed for {url}: {e}")
+            content = f"Error fetching content: {str(e)}"
             
-        return [ClickResult(
+        return ClickResult(
             name="Web Page Content",
             description=f"Extracted content from {url}",
             data={"content": content},
             link=url,
             content=content,
             source=f"Crawled from {url}"
-        )]
+        )
@@ -1,16 +1,41 @@
-from src.utils.llm import LLM, AsyncLLM
+from src.utils.llm import LLM, AsyncLLM, add_stream_listener, remove_stream_listener
 from src.utils.code_executor_async import AsyncCodeExecutor
 from src.utils.index_builder import IndexBuilder
 from src.utils.helper import *
 from src.utils.logger import get_logger, setup_logger
-from src.utils.async_helpers import run_async_safely
+from src.utils.async_helpers import run_async_safely, run_blocking, configure_blocking_pool, add_loop_finalizer, run_cleanup
+from src.utils.dag_scheduler import DAGScheduler
+from src.utils.checkpoint_log import ConversationLog
+from src.utils.frame_store import FrameStore, get_frame_store
+from src.utils.llm_cache import ResponseCache, ReplayCacheMiss
+from src.utils.llm_usage import UsageTracker, usage_phase, set_usage_phase
+from src.utils.context_budget import ContextBudgeter, TokenCounter
+from src.utils.single_flight import SingleFlight
 
 __all__ = [
     "LLM",
     "AsyncLLM",
+    "add_stream_listener",
+    "remove_stream_listener",
     "AsyncCodeExecutor",
     "IndexBuilder",
     "get_logger",
     "setup_logger",
-    "run_async_safely"
+    "run_async_safely",
+    "run_blocking",
+    "configure_blocking_pool",
+    "add_loop_finalizer",
+    "run_cleanup",
+    "DAGScheduler",
+    "ConversationLog",
+    "FrameStore",
+    "get_frame_store",
+    "ResponseCache",
+    "ReplayCacheMiss",
+    "UsageTracker",
+    "usage_phase",
+    "set_usage_phase",
+    "ContextBudgeter",
+    "TokenCounter",
+    "SingleFlight"
 ]
\ No newline at end of file
@@ -1,12 +1,155 @@
 # -*- coding: utf-8 -*-
-"""Async helper utilities for running coroutines safely from sync contexts."""
+"""Async helper utilities for running coroutines safely from sync contexts,
+and blocking functions safely from async contexts."""
 
 import asyncio
 import threading
-from typing import TypeVar, Coroutine, Any
+import contextvars
+import functools
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import TypeVar, Coroutine, Any, Awaitable, Callable, List, Optional, Set
 
 T = TypeVar('T')
 
+DEFAULT_BLOCKING_WORKERS = 16
+_blocking_executor: Optional[ThreadPoolExecutor] = None
+_blocking_workers = DEFAULT_BLOCKING_WORKERS
+_blocking_lock = threading.Lock()
+_loop_finalizers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, List[Callable[[], Awaitable[Any]]]]" = weakref.WeakKeyDictionary()
+_cleanup_tasks: Set["asyncio.Task[Any]"] = set()
+
+
+def add_loop_finalizer(callback: Callable[[], Awaitable[Any]], loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+    """
+    Register an async cleanup callback for `loop` (default: the running loop).
+
+    `run_async_safely` awaits the callbacks registered on its temporary loop
+    right before closing it, so resources bound to that loop (browsers,
+    connection pools) are released instead of leaking.
+    """
+    loop = loop or asyncio.get_running_loop()
+    with _blocking_lock:
+        _loop_finalizers.setdefault(loop, []).append(callback)
+
+
+async def _run_loop_finalizers(loop: asyncio.AbstractEventLoop) -> None:
+    with _blocking_lock:
+        callbacks = _loop_finalizers.pop(loop, [])
+    for callback in callbacks:
+        try:
+            await callback()
+        except Exception:
+            pass
+
+
+def run_cleanup(coro: Coroutine[Any, Any, Any]) -> None:
+    """
+    Run a cleanup coroutine (e.g. closing a replaced pool) from sync code.
+
+    Inside a running event loop the loop cannot be blocked, so the coroutine
+    is scheduled as a task on it (and kept referenced until it finishes);
+    otherwise it runs to completion via `run_async_safely`. Errors are ignored.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    if loop is None:
+        try:
+            run_async_safely(coro)
+        except Exception:
+            pass
+        return
+    task = loop.create_task(coro)
+    _cleanup_tasks.add(task)
+    task.add_done_callback(_forget_cleanup)
+
+
+def _forget_cleanup(task: "asyncio.Task[Any]") -> None:
+    _cleanup_tasks.discard(task)
+    if not task.cancelled():
+        task.exception()  # mark as retrieved; cleanup errors are not fatal
+
+
+def configure_blocking_pool(max_workers: int) -> None:
+    """
+    Set the size of the shared thread pool used by `run_blocking`.
+
+    Takes effect for the next pool creation; an already running pool is
+    shut down (without waiting) and replaced lazily.
+    """
+    global _blocking_executor, _blocking_workers
+    with _blocking_lock:
+        if max_workers == _blocking_workers and _blocking_executor is not None:
+            return
+        _blocking_workers = max(1, int(max_workers))
+        old_executor, _blocking_executor = _blocking_executor, None
+    if old_executor is not None:
+        old_executor.shutdown(wait=False)
+
+
+def _get_blocking_executor() -> ThreadPoolExecutor:
+    global _blocking_executor
+    with _blocking_lock:
+        if _blocking_executor is None:
+            _blocking_executor = ThreadPoolExecutor(
+                max_workers=_blocking_workers,
+                thread_name_prefix='blocking-io',
+            )
+        return _blocking_executor
+
+
+async def run_blocking(func: Callable[..., T], *args, timeout: Optional[float] = None, **kwargs) -> T:
+    """
+    Run a blocking function in the shared, bounded thread pool without
+    freezing the event loop.
+
+    The timeout only counts from the moment a worker thread picks the call
+    up, so time spent queueing behind other calls does not count against it.
+    If the caller is cancelled (or times out) before the call starts, it is
+    removed from the queue; once started, the thread cannot be interrupted,
+    so its result is simply discarded.
+
+    Args:
+        func: The blocking callable.
+        *args: Positional arguments for `func`.
+        timeout: Seconds allowed for the call itself, or None for no limit.
+        **kwargs: Keyword arguments for `func`.
+
+    Raises:
+        TimeoutError: If the call runs longer than `timeout`.
+    """
+    loop = asyncio.get_running_loop()
+    started = asyncio.Event()
+
+    def _notify_started():
+        try:
+            loop.call_soon_threadsafe(started.set)
+        except RuntimeError:
+            pass  # loop already closed; the caller is gone
+
+    def _call():
+        _notify_started()
+        return func(*args, **kwargs)
+
+    # Copy the context so the logger's agent context follows the call into the thread
+    context = contextvars.copy_context()
+    future = loop.run_in_executor(_get_blocking_executor(), functools.partial(context.run, _call))
+    started_waiter = asyncio.ensure_future(started.wait())
+    try:
+        await asyncio.wait({future, started_waiter}, return_when=asyncio.FIRST_COMPLETED)
+        if timeout is None:
+            return await future
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"{getattr(func, '__qualname__', func)} did not finish within {timeout}s")
+    finally:
+        started_waiter.cancel()
+        if not future.done():
+            future.cancel()
+
 
 def run_async_safely(coro: Coroutine[Any, Any, T]) -> T:
     """
@@ -43,7 +186,10 @@ def run_async_safely(coro: Coroutine[Any, Any, T]) -> T:
         except Exception as e:
             exception_container['error'] = e
         finally:
-            new_loop.close()
+            try:
+                new_loop.run_until_complete(_run_loop_finalizers(new_loop))
+            finally:
+                new_loop.close()
     
     # Run in a new thread to get a clean event loop
     thread = threading.Thread(target=run_in_new_loop)
@@ -0,0 +1,121 @@
+"""Append-only, segment-based persistence for agent conversation histories."""
+import io
+import os
+import uuid
+from typing import Any, Dict, List, Optional
+
+import dill
+
+
+def _fingerprint(message: Any) -> int:
+    """Cheap identity of a chat message (str hashes are cached by CPython)."""
+    try:
+        return hash((message.get('role'), message.get('content')))
+    except (AttributeError, TypeError):
+        return hash(repr(message))
+
+
+class ConversationLog:
+    """
+    Persist a growing message list as a log of dill records instead of re-dumping it.
+
+    File layout: a header record ``{'generation': str}`` followed by segments
+    ``(start, messages)``; replaying means ``history = history[:start] + messages``.
+    A normal turn appends one segment holding only the new messages. If earlier
+    messages were changed or dropped (e.g. context trimming), the segment starts at
+    the first differing index. After ``compact_every`` segments the file is
+    rewritten as a single segment under a new generation (tmp file + os.replace).
+
+    The caller stores the value returned by :meth:`sync` in its own checkpoint so a
+    replay stops at the state that checkpoint describes, ignoring segments written
+    after it (e.g. when the process died between the two writes).
+    """
+
+    def __init__(self, path: str, compact_every: int = 64):
+        self.path = path
+        self.compact_every = compact_every
+        self.generation: Optional[str] = None
+        self._fingerprints: List[int] = []
+        self._segments = 0
+
+    def sync(self, messages: List[dict], compact: bool = False) -> Dict[str, Any]:
+        """
+        Make the log reflect ``messages``, writing as little as possible.
+
+        Returns:
+            a small marker ``{'generation', 'end', 'length'}`` to embed in the checkpoint
+        """
+        fingerprints = [_fingerprint(m) for m in messages]
+        if (
+            compact
+            or self.generation is None
+            or self._segments >= self.compact_every
+            or not os.path.exists(self.path)
+        ):
+            return self._rewrite(messages, fingerprints)
+
+        start = 0
+        limit = min(len(fingerprints), len(self._fingerprints))
+        while start < limit and fingerprints[start] == self._fingerprints[start]:
+            start += 1
+        if start < len(self._fingerprints) or start < len(fingerprints):
+            with open(self.path, 'ab') as f:
+                dill.dump((start, messages[start:]), f)
+                f.flush()
+            self._segments += 1
+        self._fingerprints = fingerprints
+        return self._marker(len(messages))
+
+    def _rewrite(self, messages: List[dict], fingerprints: List[int]) -> Dict[str, Any]:
+        self.generation = uuid.uuid4().hex
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            dill.dump({'generation': self.generation}, f)
+            dill.dump((0, list(messages)), f)
+        os.replace(tmp_path, self.path)
+        self._fingerprints = fingerprints
+        self._segments = 1
+        return self._marker(len(messages))
+
+    def _marker(self, length: int) -> Dict[str, Any]:
+        return {
+            'generation': self.generation,
+            'end': os.path.getsize(self.path),
+            'length': length,
+        }
+
+    @staticmethod
+    def replay(path: str, marker: Optional[Dict[str, Any]] = None) -> List[dict]:
+        """
+        Rebuild the message list stored at ``path``.
+
+        With a ``marker`` (from :meth:`sync`) only the bytes that existed when it was
+        taken are replayed; if the file has since been compacted into a new
+        generation, the whole file is replayed and cut back to the marker's length.
+        """
+        with open(path, 'rb') as f:
+            data = f.read()
+        stream = io.BytesIO(data)
+        header = dill.load(stream)
+        if not isinstance(header, dict) or 'generation' not in header:
+            raise ValueError(f"Not a conversation log: {path}")
+
+        end = len(data)
+        length = None
+        if marker:
+            length = marker.get('length')
+            if marker.get('generation') == header['generation']:
+                end = min(end, marker.get('end', end))
+
+        messages: List[dict] = []
+        while stream.tell() < end:
+            try:
+                start, segment = dill.load(stream)
+            except Exception:
+                break  # torn trailing segment from an interrupted write
+            if stream.tell() > end:
+                break
+            messages = messages[:start] + list(segment)
+        if length is not None:
+            messages = messages[:length]
+        return messages
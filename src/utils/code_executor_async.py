@@ -8,16 +8,84 @@ import uuid
 import inspect
 import importlib
 import types
-from contextlib import redirect_stdout, redirect_stderr
+import copy
+import threading
+import contextvars
 from typing import Dict, Any, List, Tuple
 import pandas as pd
 
+
+# 每个执行上下文（线程/协程）独立的输出捕获目标，避免并发执行时 redirect_stdout 互相覆盖
+_cv_stdout: contextvars.ContextVar = contextvars.ContextVar('executor_stdout', default=None)
+_cv_stderr: contextvars.ContextVar = contextvars.ContextVar('executor_stderr', default=None)
+
+
+class _ContextStream(io.TextIOBase):
+    """
+    sys.stdout/sys.stderr 代理：当前上下文设置了捕获目标时写入目标，否则写入原始流。
+    """
+    def __init__(self, fallback, var: contextvars.ContextVar):
+        self._fallback = fallback
+        self._var = var
+
+    def write(self, s):
+        target = self._var.get()
+        return (target if target is not None else self._fallback).write(s)
+
+    def flush(self):
+        target = self._var.get()
+        (target if target is not None else self._fallback).flush()
+
+    def __getattr__(self, name):
+        return getattr(self._fallback, name)
+
+
+def _install_context_streams():
+    if not isinstance(sys.stdout, _ContextStream):
+        sys.stdout = _ContextStream(sys.stdout, _cv_stdout)
+    if not isinstance(sys.stderr, _ContextStream):
+        sys.stderr = _ContextStream(sys.stderr, _cv_stderr)
+
+
+class _capture_output:
+    """仅对当前上下文生效的 redirect_stdout/redirect_stderr。"""
+    def __init__(self, stdout, stderr):
+        self._stdout = stdout
+        self._stderr = stderr
+
+    def __enter__(self):
+        _install_context_streams()
+        self._tokens = (_cv_stdout.set(self._stdout), _cv_stderr.set(self._stderr))
+        return self
+
+    def __exit__(self, *exc):
+        _cv_stdout.reset(self._tokens[0])
+        _cv_stderr.reset(self._tokens[1])
+        return False
+
+# pyplot 的"当前图像"是进程级全局状态，多个沙箱并发绘图时需要串行执行绘图代码
+_PYPLOT_LOCK = threading.Lock()
+_PLOTTING_MODULES = ('matplotlib', 'seaborn')
+
+
+def _imports_plotting(namespace: Dict[str, Any]) -> bool:
+    """
+    命名空间中是否导入了matplotlib/seaborn。
+    不能只看当前代码片段：之前单元定义的函数也可能在内部调用plt。
+    """
+    return any(
+        isinstance(value, types.ModuleType) and value.__name__.split('.')[0] in _PLOTTING_MODULES
+        for value in list(namespace.values())
+    )
+
+
 class AsyncCodeExecutor:
     """
     轻量级Python沙箱，可用于异步执行LLM生成的代码。
     """
-    def __init__(self, working_dir: str):
+    def __init__(self, working_dir: str, frame_store=None):
         self.working_dir = working_dir
+        self.frame_store = frame_store  # 可选FrameStore：保存状态时DataFrame以列式文件引用
         os.makedirs(self.working_dir, exist_ok=True)
         self.session_id = str(uuid.uuid4())
         self.globals: Dict[str, Any] = self.create_clean_globals()
@@ -94,6 +162,44 @@ class AsyncCodeExecutor:
         """
         return self.globals.get(name)
 
+    def fork(self) -> 'AsyncCodeExecutor':
+        """
+        复制一个独立的沙箱：共享模块与外部注入的函数，沙箱内定义的函数重新绑定到副本的
+        全局命名空间，复制数据变量（DataFrame等深拷贝），在副本中新增/修改变量不会影响
+        原沙箱，可用于并发任务的环境隔离。
+        """
+        forked = AsyncCodeExecutor.__new__(AsyncCodeExecutor)
+        forked.working_dir = self.working_dir
+        forked.frame_store = self.frame_store
+        forked.session_id = str(uuid.uuid4())
+        forked.globals = {}
+        for name, value in self.globals.items():
+            if isinstance(value, types.FunctionType) and value.__globals__ is self.globals:
+                # 沙箱内定义的函数重新绑定到副本的命名空间，否则仍读写原沙箱的全局变量
+                forked.globals[name] = self._rebind_function(value, forked.globals)
+            elif isinstance(value, types.ModuleType) or callable(value) or name == '__builtins__':
+                forked.globals[name] = value
+            elif isinstance(value, (pd.DataFrame, pd.Series)):
+                forked.globals[name] = value.copy()
+            else:
+                try:
+                    forked.globals[name] = copy.deepcopy(value)
+                except Exception:
+                    forked.globals[name] = value
+        return forked
+
+    @staticmethod
+    def _rebind_function(func: types.FunctionType, new_globals: Dict[str, Any]) -> types.FunctionType:
+        """以 new_globals 为全局命名空间复制函数（代码、默认值、闭包与属性不变）。"""
+        rebound = types.FunctionType(func.__code__, new_globals, func.__name__, func.__defaults__, func.__closure__)
+        rebound.__kwdefaults__ = copy.copy(func.__kwdefaults__)
+        rebound.__qualname__ = func.__qualname__
+        rebound.__doc__ = func.__doc__
+        rebound.__module__ = func.__module__
+        rebound.__annotations__ = dict(func.__annotations__)
+        rebound.__dict__.update(func.__dict__)
+        return rebound
+
     def save_state(self) -> bytes:
         """
         保存最简但可还原的运行状态：
@@ -172,9 +278,9 @@ class AsyncCodeExecutor:
                 except Exception:
                     to_store = None
             else:
-                # 复杂对象：dill序列化失败时跳过
+                # 复杂对象：dill序列化失败时跳过（DataFrame经FrameStore只保存引用）
                 try:
-                    to_store = dill.dumps(value)
+                    to_store = self.frame_store.dumps(value) if self.frame_store else dill.dumps(value)
                 except Exception:
                     to_store = None
             if to_store is not None:
@@ -222,7 +328,7 @@ class AsyncCodeExecutor:
         # 3) 还原所有普通变量
         for name, raw in (payload.get('variables', {}) or {}).items():
             try:
-                self.globals[name] = dill.loads(raw)
+                self.globals[name] = self.frame_store.loads(raw) if self.frame_store else dill.loads(raw)
             except Exception:
                 # 反序列化失败时跳过
                 continue
@@ -281,10 +387,14 @@ class AsyncCodeExecutor:
         def sync_exec():
             nonlocal has_error
             try:
-                # 重定向标准输出/错误
-                with redirect_stdout(stdout_capture), redirect_stderr(stderr_capture):
-                    # 以自定义全局变量运行用户代码
-                    exec(code, self.globals)
+                # 重定向标准输出/错误（仅作用于当前线程上下文，支持多个执行器并发）
+                with _capture_output(stdout_capture, stderr_capture):
+                    # 以自定义全局变量运行用户代码；命名空间导入了绘图库时需持有 pyplot 全局锁
+                    if _imports_plotting(self.globals):
+                        with _PYPLOT_LOCK:
+                            exec(code, self.globals)
+                    else:
+                        exec(code, self.globals)
             except Exception:
                 # 捕获出错信息
                 has_error = True
@@ -300,7 +410,7 @@ class AsyncCodeExecutor:
             
             try:
                 # 跟同步部分一样重定向输出
-                with redirect_stdout(stdout_capture), redirect_stderr(stderr_capture):
+                with _capture_output(stdout_capture, stderr_capture):
                     # 执行异步入口
                     await self.globals['async_main']()
             except Exception:
@@ -0,0 +1,176 @@
+"""
+上下文窗口预算：发送前在本地估算token数，超出模型窗口时一次性压缩对话历史。
+
+压缩顺序（每一步后重新计数，够用即停）：
+1. 截断较早消息中的大段 `Console output`（代码执行输出），保留首尾
+2. 把较早的轮次压缩为摘要（保留首尾片段，标注省略的字符数）
+3. 成对丢弃最早的 assistant/user 轮次，并在保留的第一条消息前注明
+4. 仍然超出时，截断最长的消息
+系统消息与第一条 user 消息（任务描述）始终保留，最近 `keep_recent` 条消息只在最后一步才会被截断。
+"""
+import re
+from typing import Any, Dict, List, Optional
+
+try:
+    import tiktoken  # 可选依赖：更准确的本地token计数
+except ImportError:
+    tiktoken = None
+
+_CJK_PATTERN = re.compile(r'[\u3000-\u303f\u3400-\u4dbf\u4e00-\u9fff\uff00-\uffef]')
+_CONSOLE_PATTERN = re.compile(
+    r'(Console output:\n|Partial output: )(.*?)(?=\n+New variables:|\nAdditional notes:|\Z)',
+    re.DOTALL,
+)
+_MESSAGE_OVERHEAD = 4  # 每条消息的角色/分隔符开销
+
+
+class TokenCounter:
+    """本地token计数：安装了tiktoken时使用cl100k_base，否则按中文1字1token、其他字符4字符1token估算。"""
+
+    def __init__(self, encoding_name: str = 'cl100k_base'):
+        self._encoding = None
+        if tiktoken is not None:
+            try:
+                self._encoding = tiktoken.get_encoding(encoding_name)
+            except Exception:
+                self._encoding = None
+
+    def count_text(self, text: str) -> int:
+        if not text:
+            return 0
+        if self._encoding is not None:
+            return len(self._encoding.encode(text, disallowed_special=()))
+        cjk = len(_CJK_PATTERN.findall(text))
+        return cjk + (len(text) - cjk + 3) // 4
+
+    def count_message(self, message: Dict[str, Any]) -> int:
+        content = message.get('content')
+        if isinstance(content, list):
+            tokens = 0
+            for part in content:
+                if isinstance(part, dict) and part.get('type') == 'text':
+                    tokens += self.count_text(part.get('text', ''))
+                else:
+                    tokens += 765  # 一张高分辨率图片的典型开销
+            return tokens + _MESSAGE_OVERHEAD
+        return self.count_text(content if isinstance(content, str) else str(content or '')) + _MESSAGE_OVERHEAD
+
+    def count_messages(self, messages: List[Dict[str, Any]]) -> int:
+        return sum(self.count_message(message) for message in messages) + 3
+
+
+def _shorten(text: str, keep_chars: int, label: str) -> str:
+    if len(text) <= keep_chars:
+        return text
+    head = keep_chars * 3 // 4
+    tail = keep_chars - head
+    omitted = len(text) - head - tail
+    return f"{text[:head]}\n...[{omitted} characters of {label} omitted]...\n{text[len(text) - tail:] if tail else ''}"
+
+
+class ContextBudgeter:
+    """
+    将对话历史压缩到模型上下文窗口以内。
+
+    Args:
+        context_window: 模型上下文窗口（token）
+        keep_recent: 不参与前两步压缩的最近消息条数
+        console_keep_chars: 截断后每段Console output保留的字符数
+        summary_keep_chars: 较早轮次压缩后保留的字符数
+        safety_margin: 预留的比例，弥补本地计数与服务端计数的差异
+    """
+
+    def __init__(
+        self,
+        context_window: Optional[int] = None,
+        keep_recent: int = 4,
+        console_keep_chars: int = 2000,
+        summary_keep_chars: int = 600,
+        safety_margin: float = 0.05,
+    ):
+        self.context_window = context_window
+        self.keep_recent = keep_recent
+        self.console_keep_chars = console_keep_chars
+        self.summary_keep_chars = summary_keep_chars
+        self.safety_margin = safety_margin
+        self.counter = TokenCounter()
+
+    def budget_for(self, max_output_tokens: int = 0) -> Optional[int]:
+        if not self.context_window:
+            return None
+        return int(self.context_window * (1 - self.safety_margin)) - max_output_tokens
+
+    def fit(self, messages: List[Dict[str, Any]], budget: Optional[int]) -> bool:
+        """
+        原地压缩 messages 使其不超过 budget 个token。
+
+        Returns:
+            是否修改了 messages
+        """
+        if budget is None or not messages:
+            return False
+        counts = [self.counter.count_message(message) for message in messages]
+        if sum(counts) + 3 <= budget:
+            return False
+        original = list(messages)
+
+        head = 0
+        while head < len(messages) and messages[head].get('role') == 'system':
+            head += 1
+        head = min(head + 1, len(messages))  # 第一条 user 消息（任务描述）
+        recent = max(head, len(messages) - self.keep_recent)
+
+        def fits() -> bool:
+            return sum(counts) + 3 <= budget
+
+        def replace(idx: int, content: str):
+            messages[idx] = {**messages[idx], 'content': content}
+            counts[idx] = self.counter.count_message(messages[idx])
+
+        # 1. 截断较早的 Console output
+        for idx in range(head, recent):
+            if fits():
+                break
+            content = messages[idx].get('content')
+            if isinstance(content, str) and messages[idx].get('role') == 'user':
+                shortened = _CONSOLE_PATTERN.sub(
+                    lambda m: m.group(1) + _shorten(m.group(2), self.console_keep_chars, 'console output'),
+                    content,
+                )
+                if shortened != content:
+                    replace(idx, shortened)
+
+        # 2. 压缩较早的轮次
+        for idx in range(head, recent):
+            if fits():
+                break
+            content = messages[idx].get('content')
+            if isinstance(content, str) and len(content) > self.summary_keep_chars:
+                replace(idx, _shorten(content, self.summary_keep_chars, 'earlier turn'))
+
+        # 3. 成对丢弃最早的轮次（保持 assistant/user 交替）
+        dropped = 0
+        while not fits() and recent - head >= 2:
+            del messages[head:head + 2]
+            del counts[head:head + 2]
+            recent -= 2
+            dropped += 2
+        if dropped and head < len(messages):
+            note = f"[{dropped} earlier messages were omitted to fit the context window]\n\n"
+            content = messages[head].get('content')
+            if isinstance(content, str):
+                replace(head, note + content)
+
+        # 4. 截断最长的消息
+        while not fits():
+            idx = max(range(len(messages)), key=lambda i: counts[i])
+            content = messages[idx].get('content')
+            if not isinstance(content, str):
+                break
+            excess_ratio = (sum(counts) + 3 - budget) / max(counts[idx], 1)
+            keep_chars = int(len(content) * max(0.0, 1 - excess_ratio) * 0.9)
+            shortened = _shorten(content, keep_chars, 'message')
+            if len(shortened) >= len(content):
+                break
+            replace(idx, shortened)
+        return len(messages) != len(original) or any(a is not b for a, b in zip(messages, original))
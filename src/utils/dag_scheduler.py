@@ -0,0 +1,112 @@
+"""Dependency-driven scheduler that runs agents as a DAG under a global concurrency budget."""
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from .logger import get_logger
+
+@dataclass
+class DAGNode:
+    """A unit of work in the scheduler (usually one agent run)."""
+    node_id: str
+    run: Callable[[], Awaitable[Any]]
+    depends_on: List[str] = field(default_factory=list)
+    skip: bool = False  # already finished (e.g. on resume); still unblocks dependents
+
+
+class DAGScheduler:
+    """
+    Start every node as soon as all of its dependencies have completed.
+
+    Unlike priority tiers, there is no barrier between groups: a node only waits
+    for the nodes it declares, so wall time follows the critical path. A single
+    semaphore caps the number of nodes running at once across the whole graph.
+    A failed dependency still unblocks its dependents (matching the previous
+    tier behaviour); the failure is reported in the returned results.
+    """
+
+    def __init__(self, max_concurrent: Optional[int] = None):
+        self.max_concurrent = max_concurrent
+        self.nodes: Dict[str, DAGNode] = {}
+        self.results: Dict[str, Any] = {}
+        self.logger = get_logger()
+
+    def add_node(
+        self,
+        node_id: str,
+        run: Callable[[], Awaitable[Any]],
+        depends_on: Optional[List[str]] = None,
+        skip: bool = False,
+    ):
+        if node_id in self.nodes:
+            raise ValueError(f"Duplicate node id: {node_id}")
+        self.nodes[node_id] = DAGNode(
+            node_id=node_id,
+            run=run,
+            depends_on=list(dict.fromkeys(depends_on or [])),
+            skip=skip,
+        )
+
+    def _resolve_dependencies(self):
+        """Drop dependencies that are not part of this graph (e.g. stale task_mapping entries)."""
+        for node in self.nodes.values():
+            unknown = [dep for dep in node.depends_on if dep not in self.nodes]
+            if unknown:
+                self.logger.debug(f"Node {node.node_id}: ignoring unknown dependencies {unknown}")
+            node.depends_on = [dep for dep in node.depends_on if dep in self.nodes and dep != node.node_id]
+
+    def _check_acyclic(self):
+        """Kahn's algorithm; raises ValueError listing the nodes stuck in a cycle."""
+        indegree = {node_id: len(node.depends_on) for node_id, node in self.nodes.items()}
+        dependents: Dict[str, List[str]] = {node_id: [] for node_id in self.nodes}
+        for node in self.nodes.values():
+            for dep in node.depends_on:
+                dependents[dep].append(node.node_id)
+
+        queue = [node_id for node_id, degree in indegree.items() if degree == 0]
+        visited = 0
+        while queue:
+            node_id = queue.pop()
+            visited += 1
+            for child in dependents[node_id]:
+                indegree[child] -= 1
+                if indegree[child] == 0:
+                    queue.append(child)
+
+        if visited != len(self.nodes):
+            cyclic = [node_id for node_id, degree in indegree.items() if degree > 0]
+            raise ValueError(f"Dependency cycle detected among nodes: {cyclic}")
+
+    async def run(self) -> Dict[str, Any]:
+        """
+        Execute the graph.
+
+        Returns:
+            node_id -> result (or the raised exception, or None for skipped nodes)
+        """
+        self._resolve_dependencies()
+        self._check_acyclic()
+
+        semaphore = asyncio.Semaphore(self.max_concurrent) if self.max_concurrent else None
+        done_events = {node_id: asyncio.Event() for node_id in self.nodes}
+
+        async def run_node(node: DAGNode):
+            try:
+                for dep in node.depends_on:
+                    await done_events[dep].wait()
+                if node.skip:
+                    return None
+                if semaphore:
+                    async with semaphore:
+                        return await node.run()
+                return await node.run()
+            finally:
+                done_events[node.node_id].set()
+
+        tasks = {
+            node_id: asyncio.create_task(run_node(node), name=f"dag_{node_id}")
+            for node_id, node in self.nodes.items()
+        }
+        results = await asyncio.gather(*tasks.values(), return_exceptions=True)
+        self.results = dict(zip(tasks.keys(), results))
+        return self.results
@@ -0,0 +1,162 @@
+"""
+列式DataFrame存储：大DataFrame以Arrow IPC文件写入一次（按内容哈希命名），
+其余序列化状态（Memory分片、Agent检查点、沙箱状态）中只保存其ID引用。
+"""
+import io
+import os
+import pickle
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import dill
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:  # 缺少pyarrow时退化为普通dill内联序列化
+    pa = None
+
+
+_FRAME_TAG = 'frame'
+_stores: Dict[str, 'FrameStore'] = {}
+_stores_lock = threading.Lock()
+
+
+def get_frame_store(root: str) -> 'FrameStore':
+    """获取（进程内共享的）指定目录的FrameStore实例。"""
+    root = os.path.abspath(root)
+    with _stores_lock:
+        store = _stores.get(root)
+        if store is None:
+            store = FrameStore(root)
+            _stores[root] = store
+        return store
+
+
+class FrameStore:
+    """
+    按内容寻址的DataFrame列式存储。
+
+    - 相同内容只写一次：`<root>/<sha1>.arrow`
+    - 读取时以内存映射打开Arrow文件，最近使用的 `pa.Table` 保留在有界LRU中（不重复解析文件）；
+      每次读取都由 `to_pandas()` 复制出一个新的DataFrame，调用方修改互不影响
+    - `dumps/loads/dump/load` 与 dill 接口一致，序列化过程中遇到的大DataFrame自动替换为ID引用；
+      同一次反序列化中对同一ID的多处引用仍指向同一个DataFrame
+    """
+
+    def __init__(self, root: str, min_bytes: int = 64 * 1024, max_cached_tables: int = 32):
+        self.root = root
+        self.min_bytes = min_bytes  # 小于该体积的DataFrame直接内联，避免产生大量小文件
+        self.max_cached_tables = max_cached_tables
+        os.makedirs(self.root, exist_ok=True)
+        self._tables: 'OrderedDict[str, pa.Table]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _path(self, frame_id: str) -> str:
+        return os.path.join(self.root, f"{frame_id}.arrow")
+
+    def frame_id(self, df: pd.DataFrame) -> Optional[str]:
+        """计算DataFrame的内容ID；不适合列式存储时返回None。"""
+        if pa is None:
+            return None
+        if not all(isinstance(col, str) for col in df.columns) or df.columns.has_duplicates:
+            return None
+        if df.memory_usage(index=True, deep=False).sum() < self.min_bytes:
+            return None
+        try:
+            row_hash = pd.util.hash_pandas_object(df, index=True).to_numpy()
+        except TypeError:  # 含不可哈希的对象（list/dict等）
+            return None
+        digest = hashlib.sha1(row_hash.tobytes())
+        digest.update(repr((
+            list(df.columns),
+            [str(dtype) for dtype in df.dtypes],
+            list(df.index.names),
+            str(df.index.dtype),
+        )).encode())
+        return digest.hexdigest()
+
+    def put(self, df: pd.DataFrame) -> Optional[str]:
+        """写入DataFrame（已存在则跳过），返回ID；无法列式存储时返回None。"""
+        frame_id = self.frame_id(df)
+        if frame_id is None:
+            return None
+        path = self._path(frame_id)
+        if os.path.exists(path):
+            return frame_id
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError, TypeError, ValueError):
+            return None  # 混合类型的object列等，交由dill内联
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with pa.OSFile(tmp_path, 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+        return frame_id
+
+    def _table(self, frame_id: str) -> 'pa.Table':
+        """按ID取Arrow表（LRU缓存，表的缓冲区引用内存映射而非复制）。"""
+        with self._lock:
+            table = self._tables.get(frame_id)
+            if table is not None:
+                self._tables.move_to_end(frame_id)
+                return table
+        with pa.memory_map(self._path(frame_id), 'r') as source:
+            table = pa.ipc.open_file(source).read_all()
+        with self._lock:
+            self._tables[frame_id] = table
+            self._tables.move_to_end(frame_id)
+            while len(self._tables) > self.max_cached_tables:
+                self._tables.popitem(last=False)
+        return table
+
+    def get(self, frame_id: str) -> pd.DataFrame:
+        """按ID读取DataFrame；每次返回新的副本（`to_pandas()` 会复制数据）。"""
+        return self._table(frame_id).to_pandas()
+
+    # ---- dill兼容的序列化接口 ----
+
+    def dump(self, obj: Any, file):
+        _FramePickler(file, self).dump(obj)
+
+    def dumps(self, obj: Any) -> bytes:
+        buffer = io.BytesIO()
+        self.dump(obj, buffer)
+        return buffer.getvalue()
+
+    def load(self, file) -> Any:
+        return _FrameUnpickler(file, self).load()
+
+    def loads(self, data: bytes) -> Any:
+        return self.load(io.BytesIO(data))
+
+
+class _FramePickler(dill.Pickler):
+    def __init__(self, file, store: FrameStore):
+        super().__init__(file)
+        self._store = store
+
+    def persistent_id(self, obj):
+        if type(obj) is pd.DataFrame:
+            frame_id = self._store.put(obj)
+            if frame_id is not None:
+                return (_FRAME_TAG, frame_id)
+        return None
+
+
+class _FrameUnpickler(dill.Unpickler):
+    def __init__(self, file, store: FrameStore):
+        super().__init__(file)
+        self._store = store
+        self._frames: Dict[str, pd.DataFrame] = {}
+
+    def persistent_load(self, pid):
+        if isinstance(pid, tuple) and len(pid) == 2 and pid[0] == _FRAME_TAG:
+            df = self._frames.get(pid[1])
+            if df is None:
+                df = self._frames[pid[1]] = self._store.get(pid[1])
+            return df
+        raise pickle.UnpicklingError(f"Unsupported persistent id: {pid!r}")
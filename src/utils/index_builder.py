@@ -1,9 +1,167 @@
 import os
 import sys
 import json
+import hashlib
 import numpy as np
+from contextlib import contextmanager
 from tqdm import tqdm
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+
+@contextmanager
+def _file_lock(path: str):
+    """Exclusive inter-process lock on `path` (created if missing)."""
+    with open(path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        elif msvcrt is not None:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            elif msvcrt is not None:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class EmbeddingCache:
+    """
+    Binary, content-hash-keyed embedding cache.
+
+    Vectors are appended as raw float32 rows to `<prefix>.f32` and their keys
+    (sha1 of model + text) as lines of `<prefix>.keys`; row i of the vector file
+    belongs to line i of the key file. Existing rows are memory-mapped on open,
+    new ones stay in memory until `flush()` appends them.
+
+    Several instances (or processes) may share the files: reads and appends
+    hold `<prefix>.lock`, and a flush only appends keys nobody else has written
+    yet. If the two files disagree in length (a writer died between its two
+    appends), both are cut back to their common prefix.
+    """
+
+    def __init__(self, prefix: str, model_name: str = ""):
+        self.vectors_path = prefix + ".f32"
+        self.keys_path = prefix + ".keys"
+        self.lock_path = prefix + ".lock"
+        self.model_name = model_name
+        self.dim: Optional[int] = None
+        self._rows: Dict[str, int] = {}
+        self._matrix: Optional[np.ndarray] = None
+        self._pending: Dict[str, np.ndarray] = {}
+        self._open()
+
+    def key(self, text: str) -> str:
+        return hashlib.sha1(f"{self.model_name}\0{text}".encode("utf-8")).hexdigest()
+
+    def _open(self):
+        self._rows = {}
+        self._matrix = None
+        if not os.path.exists(self.keys_path):
+            return
+        with _file_lock(self.lock_path):
+            keys = self._read_consistent()
+        if keys:
+            self._matrix = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(len(keys), self.dim))
+        self._rows = {key: row for row, key in enumerate(keys)}
+
+    def _read_consistent(self) -> List[str]:
+        """Keys currently on disk, repairing the files first if they disagree. Caller holds the lock."""
+        try:
+            with open(self.keys_path, "r", encoding="utf-8") as f:
+                content = f.read()
+        except FileNotFoundError:
+            content = ""
+        # Every complete line ends with a newline; anything after the last one is a torn write
+        lines = content.split("\n")[:-1]
+        try:
+            dim = int(json.loads(lines[0])["dim"]) if lines else None
+        except (ValueError, KeyError, TypeError):
+            dim = None
+        if dim is None:
+            for path in (self.vectors_path, self.keys_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            return []
+        self.dim = dim
+        keys = lines[1:]
+        vector_bytes = os.path.getsize(self.vectors_path) if os.path.exists(self.vectors_path) else 0
+        n_rows = min(len(keys), vector_bytes // (4 * dim))
+        if n_rows != len(keys) or vector_bytes != 4 * dim * n_rows or not content.endswith("\n"):
+            print(
+                f"Warning: embedding cache {self.vectors_path} has {vector_bytes // (4 * dim)} vectors "
+                f"for {len(keys)} keys; keeping the first {n_rows}"
+            )
+            keys = keys[:n_rows]
+            with open(self.vectors_path, "a+b") as f:
+                f.truncate(4 * dim * n_rows)
+            tmp_path = self.keys_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(json.dumps({"dim": dim}) + "\n")
+                f.write("".join(key + "\n" for key in keys))
+            os.replace(tmp_path, self.keys_path)
+        return keys
+
+    def __len__(self) -> int:
+        return len(self._rows) + len(self._pending)
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        key = self.key(text)
+        vector = self._pending.get(key)
+        if vector is not None:
+            return vector
+        row = self._rows.get(key)
+        return None if row is None else self._matrix[row]
+
+    def put(self, text: str, vector) -> None:
+        vector = np.asarray(vector, dtype=np.float32).reshape(-1)
+        if vector.size == 0:
+            return
+        if self.dim is None:
+            self.dim = int(vector.size)
+        if vector.size != self.dim:
+            return  # embedding model changed dimensions; don't mix rows
+        key = self.key(text)
+        if key not in self._rows:
+            self._pending[key] = vector
+
+    def flush(self) -> None:
+        """Append pending vectors that are not on disk yet and re-map the vector file."""
+        if not self._pending:
+            return
+        os.makedirs(os.path.dirname(self.vectors_path), exist_ok=True)
+        dim = self.dim
+        with _file_lock(self.lock_path):
+            # Other writers may have appended since we opened; never overwrite their rows
+            on_disk = set(self._read_consistent())
+            if on_disk and self.dim != dim:
+                print(f"Warning: embedding cache {self.vectors_path} holds {self.dim}-d vectors; dropping {len(self._pending)} {dim}-d ones")
+            else:
+                self.dim = dim
+                keys = [key for key in self._pending if key not in on_disk]
+                if keys:
+                    block = np.stack([self._pending[key] for key in keys]).astype(np.float32, copy=False)
+                    if not on_disk:
+                        with open(self.keys_path, "w", encoding="utf-8") as f:
+                            f.write(json.dumps({"dim": dim}) + "\n")
+                    with open(self.vectors_path, "ab") as f:
+                        f.write(block.tobytes())
+                    with open(self.keys_path, "a", encoding="utf-8") as f:
+                        f.write("".join(key + "\n" for key in keys))
+        self._pending = {}
+        self._open()
+
 
 class IndexBuilder:
     def __init__(
@@ -16,50 +174,54 @@ class IndexBuilder:
         self.embedding_model_name = embedding_model
         self.save_file_path = os.path.join(working_dir, "embeddings", "collect_data_list.npz")
         self.cache_file_path = os.path.join(working_dir, "embeddings", "cache.json")
-        self.cache = {}
+        self.embedding_cache = EmbeddingCache(
+            os.path.join(working_dir, "embeddings", "embedding_cache"),
+            model_name=embedding_model,
+        )
         self.embeddings = []
-        # Load cache if it exists
-        self._load_cache()
+        # Move embeddings left in the old JSON cache into the binary store
+        self._migrate_legacy_cache()
         # Load embeddings index if it exists
         self.load_index()
 
-    def _load_cache(self):
-        """Internal method to load the search and embeddings cache (with backward compatibility)."""
-        if os.path.exists(self.cache_file_path):
-            try:
-                with open(self.cache_file_path, "r", encoding="utf-8") as f:
-                    loaded = json.load(f)
-                # Backward compatibility: previously cache may have been a flat dict for search results
-                if isinstance(loaded, dict) and ("search" in loaded or "embeddings" in loaded):
-                    self.cache = loaded
-                elif isinstance(loaded, dict):
-                    # Migrate old flat search cache into new structured cache
-                    self.cache = {"search": loaded, "embeddings": {}}
-                else:
-                    self.cache = {"search": {}, "embeddings": {}}
-            except json.JSONDecodeError as e:
-                print(f"Warning: Could not load cache from {self.cache_file_path}. File might be corrupted: {e}")
-                self.cache = {"search": {}, "embeddings": {}} # Reset cache if loading fails
-        else:
-            print(f"No cache file found at {self.cache_file_path}. Starting with empty cache.")
-            self.cache = {"search": {}, "embeddings": {}}
+    def _migrate_legacy_cache(self):
+        """
+        Import embeddings from the old `cache.json` into the binary store, then remove the file.
 
-    def _save_cache(self):
-        """Internal method to save the search cache."""
-        os.makedirs(os.path.dirname(self.cache_file_path), exist_ok=True)
+        Search results are no longer cached: repeated queries hit the embedding cache and
+        only redo the dot product, which is cheaper than rewriting the JSON file per query.
+        """
+        if not os.path.exists(self.cache_file_path):
+            return
         try:
-            with open(self.cache_file_path, "w", encoding="utf-8") as f:
-                json.dump(self.cache, f, ensure_ascii=False, indent=4) # Added indent for readability
-        except IOError as e:
-            print(f"Error: Could not save cache to {self.cache_file_path}: {e}")
-        
+            with open(self.cache_file_path, "r", encoding="utf-8") as f:
+                loaded = json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            print(f"Warning: Could not load cache from {self.cache_file_path}. File might be corrupted: {e}")
+            return
+        # The flat (oldest) format held search results only
+        legacy_embeddings = loaded.get("embeddings") if isinstance(loaded, dict) else None
+        if legacy_embeddings:
+            for text, emb in legacy_embeddings.items():
+                if self.embedding_cache.get(text) is None:
+                    self.embedding_cache.put(text, emb)
+            self.embedding_cache.flush()
+        try:
+            os.remove(self.cache_file_path)
+        except OSError as e:
+            print(f"Warning: Could not remove legacy cache {self.cache_file_path}: {e}")
+
+    def _save_cache(self):
+        """Internal method to flush new embeddings to the binary store."""
+        self.embedding_cache.flush()
+
     async def _get_embeddings_batch(self, batch: List[str], n_retries: int = 3):
-        """Helper method to get embeddings for a batch with retries and caching per-text."""
-        if not isinstance(self.cache, dict):
-            self.cache = {"search": {}, "embeddings": {}}
-        if "embeddings" not in self.cache or not isinstance(self.cache["embeddings"], dict):
-            self.cache["embeddings"] = {}
+        """
+        Helper method to get embeddings for a batch with retries and caching per-text.
 
+        New embeddings are kept in the in-memory part of the cache; callers flush
+        them with `_save_cache()` once per build/search.
+        """
         # Prepare results aligned with input order
         results: List = [None] * len(batch)
         to_compute_indices: List[int] = []
@@ -67,7 +229,7 @@ class IndexBuilder:
 
         # Fill from cache if available
         for idx, text in enumerate(batch):
-            cached = self.cache["embeddings"].get(text)
+            cached = self.embedding_cache.get(text)
             if cached is not None:
                 results[idx] = cached
             else:
@@ -98,18 +260,33 @@ class IndexBuilder:
         for offset, idx in enumerate(to_compute_indices):
             if offset < len(response):
                 emb = response[offset]
-                # Ensure JSON serializable (convert numpy arrays to lists if any)
-                if isinstance(emb, np.ndarray):
-                    emb = emb.tolist()
                 results[idx] = emb
-                self.cache["embeddings"][batch[idx]] = emb
+                self.embedding_cache.put(batch[idx], emb)
             else:
                 results[idx] = []
 
-        # Persist cache updates
+        return results
+
+    async def embed_texts(self, texts: List[str], batch_size: int = 32, n_retries: int = 2) -> np.ndarray:
+        """
+        Embed texts in cache-aware batches without touching the index.
+
+        Returns:
+            L2-normalised float32 matrix (len(texts) x dim); rows of failed texts are zero.
+        """
+        vectors = []
+        for i in range(0, len(texts), batch_size):
+            vectors.extend(await self._get_embeddings_batch(texts[i : i + batch_size], n_retries))
         self._save_cache()
 
-        return results
+        dim = next((len(v) for v in vectors if v is not None and len(v) > 0), 0)
+        matrix = np.zeros((len(texts), dim), dtype=np.float32)
+        for row, vector in enumerate(vectors):
+            if vector is not None and len(vector) == dim and dim > 0:
+                matrix[row] = vector
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
 
     async def build_index_from_analysis_result(self, analysis_result_list: List[dict], batch_size: int = 10, n_retries: int = 3):
         """Build embeddings index for a list of analysis results."""
@@ -125,16 +302,14 @@ class IndexBuilder:
     async def _build_index(self, texts: List[str], batch_size: int=32, n_retries: int=2):
         """Internal unified method to build the embeddings index."""
         self.embeddings = [] # Clear existing embeddings before building a new index
-        # Clear search cache since index is being rebuilt - cached ids would be invalid
-        if isinstance(self.cache, dict) and "search" in self.cache:
-            self.cache["search"] = {}
-        
+
         for i in tqdm(range(0, len(texts), batch_size), desc="Building index"):
             batch = texts[i : i + batch_size]
             batch_embeddings = await self._get_embeddings_batch(batch, n_retries)
             self.embeddings.extend(batch_embeddings)
 
-        # Save index to file after building
+        # Persist new embeddings once per build, then the index itself
+        self._save_cache()
         self._save_index()
 
     def _save_index(self):
@@ -168,24 +343,11 @@ class IndexBuilder:
             print("Warning: Embeddings index is empty. Cannot perform search.")
             return []
 
-        # Ensure structured cache
-        if not isinstance(self.cache, dict):
-            self.cache = {"search": {}, "embeddings": {}}
-        if "search" not in self.cache or not isinstance(self.cache["search"], dict):
-            # Backward compatibility: if flat, migrate
-            if isinstance(self.cache, dict):
-                flat = {k: v for k, v in self.cache.items() if k not in ("search", "embeddings")}
-                self.cache = {"search": flat, "embeddings": self.cache.get("embeddings", {})}
-            else:
-                self.cache = {"search": {}, "embeddings": {}}
-
-        if query in self.cache["search"]:
-            return self.cache["search"][query]
-
         try:
             # Reuse the embedding cache via the batch helper
             query_embedding_list = await self._get_embeddings_batch([query])
-            if not query_embedding_list or not query_embedding_list[0]:
+            self._save_cache()
+            if not query_embedding_list or len(query_embedding_list[0]) == 0:
                 return []
             query_embedding = np.array(query_embedding_list[0])
             query_embedding = np.array(query_embedding)
@@ -205,8 +367,4 @@ class IndexBuilder:
 
         top_k_indices = np.argsort(distances)[::-1][:top_k]
 
-        results = [{'id': int(i), 'score': float(distances[i])} for i in top_k_indices]
-        self.cache["search"][query] = results
-        self._save_cache() # Use the internal save method
-
-        return results
+        return [{'id': int(i), 'score': float(distances[i])} for i in top_k_indices]
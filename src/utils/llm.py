@@ -1,11 +1,34 @@
 import asyncio
+import random
+import time
+from contextlib import nullcontext
+from types import SimpleNamespace
 from openai import OpenAI, AsyncOpenAI
-from typing import List, Dict, Optional, Union, Any
+from typing import List, Dict, Optional, Union, Any, Callable, Tuple
 from .retry import retry, async_retry, RetryError
 from .logger import get_logger
+from .llm_cache import ResponseCache, ReplayCacheMiss, make_cache_key
+from .llm_usage import UsageTracker
+from .rate_limiter import EndpointLimiter, estimate_tokens, is_rate_limit_error
+from .context_budget import ContextBudgeter
+from .logger import _cv_agent_id, _cv_agent_name
 
 logger = get_logger()
 
+# 流式生成的增量token监听器：listener(delta, info)，info 含 model / agent_id / agent_name / done
+_stream_listeners: List[Callable[[str, Dict[str, Any]], None]] = []
+
+
+def add_stream_listener(listener: Callable[[str, Dict[str, Any]], None]):
+    """注册流式输出监听器（如demo的WebSocket日志），监听器须为同步且快速返回的函数"""
+    if listener not in _stream_listeners:
+        _stream_listeners.append(listener)
+
+
+def remove_stream_listener(listener: Callable[[str, Dict[str, Any]], None]):
+    if listener in _stream_listeners:
+        _stream_listeners.remove(listener)
+
 class LLM:
     def __init__(
         self,
@@ -82,20 +105,12 @@ class LLM:
         except Exception as e:
             error_msg = str(e)
 
-            # 处理上下文长度超限
+            # 处理上下文长度超限：按当前估算的 75% 一次性压缩历史后重试
             if "Error code: 400" in error_msg:
-                logger.warning(f"上下文长度超限，尝试移除早期消息。当前消息数: {len(messages)}")
-
-                # 查找并移除第一条 assistant 消息
-                first_assistant_idx = None
-                for i, message in enumerate(messages):
-                    if message["role"] == "assistant":
-                        first_assistant_idx = i
-                        break
-
-                if first_assistant_idx is not None:
-                    messages.pop(first_assistant_idx)
-                    logger.info(f"已移除第 {first_assistant_idx} 条消息")
+                budgeter = ContextBudgeter()
+                current_tokens = budgeter.counter.count_messages(messages)
+                logger.warning(f"上下文长度超限，尝试压缩历史。当前消息数: {len(messages)}，约 {current_tokens} tokens")
+                if budgeter.fit(messages, int(current_tokens * 0.75)):
                     return self._generate_with_retry(messages, **params)
 
             logger.error(f"API 调用失败: {error_msg}")
@@ -108,7 +123,12 @@ class AsyncLLM:
         base_url: str,
         api_key: str,
         model_name: Union[str, List[str]],
-        generation_params: dict = None
+        generation_params: dict = None,
+        response_cache: Optional[ResponseCache] = None,
+        usage_tracker: Optional[UsageTracker] = None,
+        stream: bool = False,
+        rate_limiter: Optional[EndpointLimiter] = None,
+        context_budgeter: Optional[ContextBudgeter] = None
     ):
         self.client = AsyncOpenAI(
             base_url=base_url,
@@ -116,27 +136,80 @@ class AsyncLLM:
         )
         self.generation_params = generation_params or {}
         self.model_name = model_name
+        self.response_cache = response_cache  # 可选的磁盘响应缓存（readwrite / replay）
+        self.usage_tracker = usage_tracker  # 可选的token/耗时统计
+        self.stream = stream  # 流式生成：客户端检测停止词后立即取消请求
+        self._stream_usage = True  # 流式请求附带 stream_options.include_usage（服务端不支持时自动关闭）
+        self.rate_limiter = rate_limiter  # 可选的端点限流（RPM/TPM + 自适应并发）
+        self.context_budgeter = context_budgeter or ContextBudgeter()  # 上下文窗口预算
     
-    @async_retry(max_attempts=3, delay=1.0, backoff=2.0, exceptions=(Exception,))
     async def generate_embeddings(
         self, input_texts: List[str],
     ):
         """异步生成文本嵌入向量，带重试机制"""
+        start_time = time.perf_counter()
+        attempts = []
         try:
-            response = await self.client.embeddings.create(
-                model=self.model_name,
-                input=input_texts
-            )
-            return [embedding_data.embedding for embedding_data in response.data]
+            response = await self._create_embeddings(input_texts, attempts)
+        except Exception:
+            self._record_usage('embedding', None, start_time, len(attempts) - 1, success=False)
+            raise
+        self._record_usage('embedding', getattr(response, 'usage', None), start_time, len(attempts) - 1)
+        return [embedding_data.embedding for embedding_data in response.data]
+
+    @async_retry(max_attempts=3, delay=1.0, backoff=2.0, exceptions=(Exception,))
+    async def _create_embeddings(self, input_texts: List[str], attempts: list):
+        """内部嵌入方法，带重试机制；attempts 用于统计尝试次数"""
+        attempts.append(time.perf_counter())
+        try:
+            async with self._rate_limit_slot(estimate_tokens(input_texts)) as ticket:
+                response = await self.client.embeddings.create(
+                    model=self.model_name,
+                    input=input_texts
+                )
+                ticket['tokens'] = getattr(getattr(response, 'usage', None), 'total_tokens', None)
+            return response
         except Exception as e:
             logger.error(f"异步生成嵌入向量失败: {str(e)}")
             raise
 
+    def _rate_limit_slot(self, estimated_tokens: int):
+        """限流槽位（未配置限流时为空上下文）"""
+        if self.rate_limiter is None:
+            return nullcontext({'tokens': None})
+        return self.rate_limiter.slot(estimated_tokens)
+
+    @staticmethod
+    def _retry_delay(error: Exception, attempt: int) -> float:
+        """重试等待时间：限流错误优先使用 Retry-After，否则指数退避加抖动；其他错误固定 2 秒"""
+        if not is_rate_limit_error(error):
+            return 2
+        headers = getattr(getattr(error, 'response', None), 'headers', None) or {}
+        try:
+            return min(float(headers.get('retry-after')), 60.0)
+        except (TypeError, ValueError):
+            return min(2 ** attempt, 60) * (0.5 + random.random())
+
+    def _record_usage(self, kind: str, usage: Any, start_time: float, retries: int, success: bool = True, cached: bool = False):
+        """向用量统计写入一条调用记录（未配置统计时忽略）"""
+        if self.usage_tracker is None:
+            return
+        self.usage_tracker.record(
+            kind=kind,
+            model=self.model_name,
+            usage=usage,
+            latency=time.perf_counter() - start_time,
+            retries=max(retries, 0),
+            success=success,
+            cached=cached,
+        )
+
     async def generate(
         self,
         messages: List[Dict[str, str]],
         max_retries_per_model: int = 5,
         include_stop_string: bool = True,
+        stream: Optional[bool] = None,
         **params
     ) -> Union[str, Any]:
         """
@@ -146,6 +219,7 @@ class AsyncLLM:
             messages: 对话消息列表
             max_retries_per_model: 最大重试次数
             include_stop_string: 是否包含停止原因字符串
+            stream: 是否流式生成，默认使用实例的 stream 设置
             **params: 额外的生成参数
 
         Returns:
@@ -158,12 +232,45 @@ class AsyncLLM:
         if not (self.client and hasattr(self.client, 'chat') and hasattr(self.client.chat, 'completions')):
             raise NotImplementedError("异步客户端不支持 chat completions")
 
+        start_time = time.perf_counter()
+
+        # 发送前按上下文窗口预算压缩历史（原地修改，调用方的对话历史随之缩短）
+        max_output_tokens = params.get('max_tokens', self.generation_params.get('max_tokens')) or 0
+        if self.context_budgeter.fit(messages, self.context_budgeter.budget_for(max_output_tokens)):
+            logger.info(f"对话历史超出上下文预算，已压缩为 {len(messages)} 条消息（约 {self.context_budgeter.counter.count_messages(messages)} tokens）")
+
+        # 先查响应缓存（键基于调用前的消息，错误恢复对消息的修改不影响键）
+        cache_key = None
+        if self.response_cache is not None:
+            cache_key = make_cache_key(
+                self.model_name,
+                messages,
+                {**self.generation_params, **params, 'include_stop_string': include_stop_string}
+            )
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                self._record_usage('chat', None, start_time, 0, cached=True)
+                return cached
+            if self.response_cache.read_only:
+                raise ReplayCacheMiss(f"回放模式下未找到录制的响应 (model={self.model_name}, key={cache_key[:12]})")
+
         last_exception = None
 
         for attempt in range(1, max_retries_per_model + 1):
             try:
-                response = await self._call_api(messages, params)
-                return self._extract_output(response, include_stop_string)
+                async with self._rate_limit_slot(estimate_tokens(messages)) as ticket:
+                    if self.stream if stream is None else stream:
+                        output, usage = await self._call_api_stream(messages, params, include_stop_string, ticket)
+                    else:
+                        response = await self._call_api(messages, params)
+                        output = self._extract_output(response, include_stop_string)
+                        usage = getattr(response, 'usage', None)
+                    ticket['tokens'] = getattr(usage, 'total_tokens', None)
+                    ticket['completion_tokens'] = getattr(usage, 'completion_tokens', None)
+                if cache_key is not None:
+                    self.response_cache.put(cache_key, output, model_name=self.model_name)
+                self._record_usage('chat', usage, start_time, attempt - 1)
+                return output
 
             except Exception as e:
                 last_exception = e
@@ -175,10 +282,11 @@ class AsyncLLM:
                 if not should_continue:
                     break
 
-                await asyncio.sleep(2)
+                await asyncio.sleep(self._retry_delay(e, attempt))
 
         error_msg = f"所有 {max_retries_per_model} 次尝试均失败。最后错误: {last_exception}"
         logger.error(error_msg)
+        self._record_usage('chat', None, start_time, attempt - 1, success=False)
         raise RetryError(error_msg, last_exception=last_exception)
 
     async def _call_api(self, messages: List[Dict[str, str]], params: dict) -> Any:
@@ -189,6 +297,99 @@ class AsyncLLM:
             **{**self.generation_params, **params}
         )
 
+    async def _call_api_stream(
+        self,
+        messages: List[Dict[str, str]],
+        params: dict,
+        include_stop_string: bool,
+        ticket: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[str, Any]:
+        """
+        流式调用 API：逐块累积输出并在客户端检测停止词，命中后立即关闭流（取消请求）。
+
+        自动附带 stream_options={"include_usage": true}，由最后一块返回usage；若流被提前取消
+        或服务端未返回usage，则用本地token计数估算。收到第一块内容时在 `ticket` 中记录时间，
+        供限流器按首token耗时判断延迟突增。
+
+        Returns:
+            (输出文本, usage)
+        """
+        merged_params = {**self.generation_params, **params}
+        if self._stream_usage:
+            merged_params['stream_options'] = {'include_usage': True, **(merged_params.get('stream_options') or {})}
+        stop_words = merged_params.get('stop') or []
+        if isinstance(stop_words, str):
+            stop_words = [stop_words]
+        max_stop_len = max((len(word) for word in stop_words), default=0)
+        info = {'model': self.model_name, 'agent_id': _cv_agent_id.get(), 'agent_name': _cv_agent_name.get()}
+
+        response_stream = await self.client.chat.completions.create(
+            model=self.model_name,
+            messages=messages,
+            stream=True,
+            **merged_params
+        )
+        output = ''
+        usage = None
+        stop_string = None
+        try:
+            async for chunk in response_stream:
+                usage = getattr(chunk, 'usage', None) or usage
+                if not getattr(chunk, 'choices', None):
+                    continue
+                choice = chunk.choices[0]
+                delta = getattr(choice.delta, 'content', None) or ''
+                if isinstance(getattr(choice, 'stop_reason', None), str):
+                    stop_string = choice.stop_reason  # 服务端已处理停止词（如 vLLM）
+                if not delta:
+                    continue
+                if ticket is not None and ticket.get('first_token_at') is None:
+                    ticket['first_token_at'] = time.monotonic()
+                # 只需检查新增内容及其前面可能跨块的停止词前缀
+                scan_from = max(0, len(output) - max_stop_len + 1)
+                output += delta
+                hits = [(output.find(word, scan_from), word) for word in stop_words]
+                hits = [hit for hit in hits if hit[0] >= 0]
+                if hits:
+                    cut, stop_string = min(hits)
+                    self._emit_stream_delta(delta[:max(0, len(delta) - (len(output) - cut))], info)
+                    output = output[:cut]
+                    break
+                self._emit_stream_delta(delta, info)
+        finally:
+            close = getattr(response_stream, 'close', None)
+            if close is not None:
+                await close()
+            self._emit_stream_delta('', {**info, 'done': True})
+
+        if usage is None:
+            usage = self._estimate_usage(messages, output)
+        if include_stop_string and stop_string:
+            output += stop_string
+        return output, usage
+
+    def _estimate_usage(self, messages: List[Dict[str, str]], output: str) -> SimpleNamespace:
+        """服务端未返回usage时按本地token计数估算。"""
+        counter = self.context_budgeter.counter
+        prompt_tokens = counter.count_messages(messages)
+        completion_tokens = counter.count_text(output)
+        return SimpleNamespace(
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            total_tokens=prompt_tokens + completion_tokens,
+        )
+
+    @staticmethod
+    def _emit_stream_delta(delta: str, info: Dict[str, Any]):
+        if not _stream_listeners or (not delta and not info.get('done')):
+            return
+        info = {'done': False, **info}
+        for listener in list(_stream_listeners):
+            try:
+                listener(delta, info)
+            except Exception as e:
+                logger.debug(f"流式输出监听器异常: {e}")
+
     def _extract_output(self, response: Any, include_stop_string: bool) -> str:
         """从响应中提取输出内容"""
         if hasattr(response, 'choices') and response.choices:
@@ -240,6 +441,12 @@ class AsyncLLM:
                 )
             return True
 
+        # 服务端不支持 stream_options
+        if "stream_options" in error_msg and self._stream_usage:
+            logger.warning("服务端不支持 stream_options，改为本地估算流式调用的token用量")
+            self._stream_usage = False
+            return True
+
         # 工具选择错误
         if "Tool choice is none" in error_msg:
             logger.warning("检测到工具选择错误，添加提示避免原生工具调用")
@@ -251,25 +458,23 @@ class AsyncLLM:
                 )
             return True
 
-        # 上下文长度超限
-        logger.warning("上下文长度超限，尝试移除早期消息")
-        return self._remove_early_message(messages)
+        # 上下文长度超限（本地计数低估了服务端计数）
+        logger.warning("上下文长度超限，按当前估算的 75% 一次性压缩历史")
+        return self._shrink_context(messages)
 
-    def _remove_early_message(self, messages: List[Dict[str, str]]) -> bool:
+    def _shrink_context(self, messages: List[Dict[str, str]], ratio: float = 0.75) -> bool:
         """
-        移除早期消息以缩短上下文
+        将对话历史压缩到当前估算token数的 ratio 倍
 
         Returns:
-            bool: True 表示成功移除消息，False 表示无法移除
+            bool: True 表示已压缩，False 表示无法继续压缩
         """
-        # 查找第一条非系统消息的 user 消息（跳过第一条）
-        for i in range(1, len(messages)):
-            if messages[i]["role"] == "user":
-                removed = messages.pop(i)
-                logger.info(f"已移除第 {i} 条消息（角色: {removed['role']}）")
-                return True
-
-        logger.warning("没有可移除的消息，停止重试")
+        current_tokens = self.context_budgeter.counter.count_messages(messages)
+        if self.context_budgeter.fit(messages, int(current_tokens * ratio)):
+            logger.info(f"已压缩对话历史: {current_tokens} -> {self.context_budgeter.counter.count_messages(messages)} tokens")
+            return True
+
+        logger.warning("没有可压缩的消息，停止重试")
         return False
 
     async def close(self):
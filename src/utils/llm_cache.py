@@ -0,0 +1,177 @@
+"""
+LLM响应磁盘缓存：以 (模型名, 消息, 生成参数) 的哈希为键，每条响应一个JSON文件。
+
+- readwrite：命中直接返回，未命中调用API后写入；支持TTL过期与按总大小的LRU淘汰（文件mtime即最近访问时间）
+- replay：只读回放已录制的运行，忽略TTL，未命中时抛出 ReplayCacheMiss 而不是调用API
+- 提示词中含本次运行的时间戳（`Config.run_time`），录制时把它写入 `run_time.txt`，回放时沿用，否则键永远不同
+"""
+import os
+import json
+import time
+import hashlib
+import threading
+from typing import Any, Dict, List, Optional
+
+from .logger import get_logger
+
+logger = get_logger()
+
+CACHE_MODES = ('off', 'readwrite', 'replay')
+RUN_TIME_FILE = 'run_time.txt'
+
+
+class ReplayCacheMiss(RuntimeError):
+    """回放模式下请求未被录制。"""
+
+
+def make_cache_key(model_name: Any, messages: List[Dict[str, Any]], params: Dict[str, Any]) -> str:
+    """计算请求的缓存键（sha256）。"""
+    payload = json.dumps(
+        {'model': model_name, 'messages': messages, 'params': params},
+        sort_keys=True,
+        ensure_ascii=False,
+        default=repr,
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """
+    按请求哈希寻址的LLM响应缓存目录。
+
+    Args:
+        cache_dir: 缓存目录
+        mode: 'readwrite' 或 'replay'
+        ttl: 条目有效期（秒），None 表示永不过期（replay 模式下忽略）
+        max_bytes: 目录总大小上限，超出后按最近访问时间淘汰
+    """
+
+    def __init__(self, cache_dir: str, mode: str = 'readwrite', ttl: Optional[float] = None, max_bytes: int = 1024 ** 3):
+        if mode not in ('readwrite', 'replay'):
+            raise ValueError(f"Unsupported cache mode: {mode}")
+        self.cache_dir = cache_dir
+        self.mode = mode
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._total_bytes = self._scan_size()
+
+    @property
+    def read_only(self) -> bool:
+        return self.mode == 'replay'
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def save_run_time(self, run_time: str):
+        """记录录制运行的时间戳（提示词中的“当前时间”），供回放时复用；只读模式下忽略。"""
+        if self.read_only:
+            return
+        try:
+            with open(os.path.join(self.cache_dir, RUN_TIME_FILE), 'w', encoding='utf-8') as f:
+                f.write(run_time)
+        except OSError as e:
+            logger.warning(f"记录LLM响应缓存的运行时间失败: {e}")
+
+    def load_run_time(self) -> Optional[str]:
+        """最近一次录制运行的时间戳；未记录返回 None。"""
+        try:
+            with open(os.path.join(self.cache_dir, RUN_TIME_FILE), 'r', encoding='utf-8') as f:
+                return f.read().strip() or None
+        except OSError:
+            return None
+
+    def _scan_size(self) -> int:
+        total = 0
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith('.json'):
+                try:
+                    total += entry.stat().st_size
+                except OSError:
+                    pass
+        return total
+
+    def get(self, key: str) -> Optional[str]:
+        """读取缓存的响应；未命中或已过期返回 None。"""
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        if not self.read_only:
+            if self.ttl is not None and time.time() - record.get('created_at', 0) > self.ttl:
+                self._remove(path)
+                self.misses += 1
+                return None
+            try:
+                os.utime(path)  # 刷新最近访问时间，供LRU淘汰使用
+            except OSError:
+                pass
+        self.hits += 1
+        return record.get('output')
+
+    def put(self, key: str, output: str, model_name: Any = None):
+        """写入响应（原子替换），必要时触发LRU淘汰；只读模式下忽略。"""
+        if self.read_only or not isinstance(output, str):
+            return
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        data = json.dumps(
+            {'model': model_name, 'created_at': time.time(), 'output': output},
+            ensure_ascii=False,
+        ).encode('utf-8')
+        try:
+            old_size = os.path.getsize(path) if os.path.exists(path) else 0
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"写入LLM响应缓存失败: {e}")
+            return
+        with self._lock:
+            self._total_bytes += len(data) - old_size
+            over_limit = self._total_bytes > self.max_bytes
+        if over_limit:
+            self._evict()
+
+    def _remove(self, path: str):
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except OSError:
+            return
+        with self._lock:
+            self._total_bytes -= size
+
+    def _evict(self):
+        """按最近访问时间从旧到新删除条目，直到总大小降到上限的90%。"""
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith('.json'):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        entries.sort()
+        with self._lock:
+            self._total_bytes = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        removed = 0
+        for _, _, path in entries:
+            if self._total_bytes <= target:
+                break
+            self._remove(path)
+            removed += 1
+        logger.info(f"LLM响应缓存淘汰 {removed} 条，当前大小 {self._total_bytes} 字节")
+
+    def clear(self):
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith('.json'):
+                self._remove(entry.path)
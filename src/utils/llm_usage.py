@@ -0,0 +1,201 @@
+"""
+LLM调用用量统计：记录每次 generate / generate_embeddings 的token数、耗时、重试次数与模型，
+并按Agent上下文（见logger）与阶段标签归类，汇总为 per-agent / per-phase / per-model / per-run 的统计。
+服务端返回前缀缓存命中数时（OpenAI的 prompt_tokens_details.cached_tokens、DeepSeek的 prompt_cache_hit_tokens），
+一并记录为 cache_hit_tokens。
+"""
+import os
+import json
+import time
+import uuid
+import threading
+import contextvars
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from .logger import _cv_agent_id, _cv_agent_name
+
+_cv_usage_phase: contextvars.ContextVar[str] = contextvars.ContextVar('usage_phase', default='N/A')
+
+
+def set_usage_phase(phase: str):
+    """设置当前异步上下文的阶段标签（由之后创建的子任务继承）。"""
+    _cv_usage_phase.set(phase)
+
+
+def get_usage_phase() -> str:
+    return _cv_usage_phase.get()
+
+
+@contextmanager
+def usage_phase(phase: str):
+    """在代码块内临时使用指定阶段标签。"""
+    token = _cv_usage_phase.set(phase)
+    try:
+        yield
+    finally:
+        _cv_usage_phase.reset(token)
+
+
+def _cache_hit_tokens(usage: Any) -> int:
+    """从usage中读取服务端前缀缓存命中的prompt token数（不同厂商字段不同）。"""
+    details = getattr(usage, 'prompt_tokens_details', None)
+    if isinstance(details, dict):
+        cached = details.get('cached_tokens')
+    else:
+        cached = getattr(details, 'cached_tokens', None)
+    if cached is None:
+        cached = getattr(usage, 'prompt_cache_hit_tokens', None)
+    return int(cached or 0)
+
+
+@dataclass
+class LLMCallRecord:
+    """单次LLM调用记录"""
+    kind: str  # 'chat' / 'embedding'
+    model: str
+    agent_id: str
+    agent_name: str
+    phase: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    total_tokens: int = 0
+    cache_hit_tokens: int = 0  # 服务端前缀缓存命中的prompt token
+    latency: float = 0.0
+    retries: int = 0
+    success: bool = True
+    cached: bool = False
+    timestamp: float = field(default_factory=time.time)
+
+
+def _empty_stats() -> Dict[str, Any]:
+    return {
+        'calls': 0,
+        'failed_calls': 0,
+        'cached_calls': 0,
+        'retries': 0,
+        'prompt_tokens': 0,
+        'completion_tokens': 0,
+        'total_tokens': 0,
+        'cache_hit_tokens': 0,
+        'latency_total': 0.0,
+        'latency_max': 0.0,
+    }
+
+
+def _accumulate(stats: Dict[str, Any], record: LLMCallRecord):
+    stats['calls'] += 1
+    stats['failed_calls'] += 0 if record.success else 1
+    stats['cached_calls'] += 1 if record.cached else 0
+    stats['retries'] += record.retries
+    stats['prompt_tokens'] += record.prompt_tokens
+    stats['completion_tokens'] += record.completion_tokens
+    stats['total_tokens'] += record.total_tokens
+    stats['cache_hit_tokens'] += record.cache_hit_tokens
+    stats['latency_total'] += record.latency
+    stats['latency_max'] = max(stats['latency_max'], record.latency)
+
+
+def _finalize(stats: Dict[str, Any]) -> Dict[str, Any]:
+    stats['latency_total'] = round(stats['latency_total'], 3)
+    stats['latency_max'] = round(stats['latency_max'], 3)
+    stats['latency_avg'] = round(stats['latency_total'] / stats['calls'], 3) if stats['calls'] else 0.0
+    stats['cache_hit_rate'] = round(stats['cache_hit_tokens'] / stats['prompt_tokens'], 4) if stats['prompt_tokens'] else 0.0
+    return stats
+
+
+class UsageTracker:
+    """
+    进程内的LLM用量统计（一个Config共享一个实例）。
+
+    - `record(...)` 由AsyncLLM在每次调用结束后调用，自动带上当前Agent上下文与阶段标签
+    - `records(**filters)` / `summary()` 供进程内查询
+    - `save(path)` 将本次运行的汇总合并写入JSON文件（保留同一文件中其他运行的汇总）
+    """
+
+    def __init__(self, run_id: Optional[str] = None):
+        self.run_id = run_id or uuid.uuid4().hex[:12]
+        self.started_at = time.time()
+        self._records: List[LLMCallRecord] = []
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        kind: str,
+        model: Any,
+        usage: Any = None,
+        latency: float = 0.0,
+        retries: int = 0,
+        success: bool = True,
+        cached: bool = False,
+    ) -> LLMCallRecord:
+        prompt_tokens = int(getattr(usage, 'prompt_tokens', 0) or 0)
+        completion_tokens = int(getattr(usage, 'completion_tokens', 0) or 0)
+        total_tokens = int(getattr(usage, 'total_tokens', 0) or 0) or prompt_tokens + completion_tokens
+        record = LLMCallRecord(
+            kind=kind,
+            model=str(model),
+            agent_id=_cv_agent_id.get(),
+            agent_name=_cv_agent_name.get(),
+            phase=_cv_usage_phase.get(),
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            total_tokens=total_tokens,
+            cache_hit_tokens=_cache_hit_tokens(usage),
+            latency=latency,
+            retries=retries,
+            success=success,
+            cached=cached,
+        )
+        with self._lock:
+            self._records.append(record)
+        return record
+
+    def records(self, **filters) -> List[LLMCallRecord]:
+        """按字段过滤调用记录，例如 `records(agent_name='data_analyzer', kind='chat')`。"""
+        with self._lock:
+            records = list(self._records)
+        return [r for r in records if all(getattr(r, key) == value for key, value in filters.items())]
+
+    def summary(self, **filters) -> Dict[str, Any]:
+        """汇总（可选过滤后的）调用记录。"""
+        totals = _empty_stats()
+        by_agent: Dict[str, Dict[str, Any]] = {}
+        by_agent_name: Dict[str, Dict[str, Any]] = {}
+        by_phase: Dict[str, Dict[str, Any]] = {}
+        by_model: Dict[str, Dict[str, Any]] = {}
+        for record in self.records(**filters):
+            _accumulate(totals, record)
+            if record.agent_id not in by_agent:
+                by_agent[record.agent_id] = {'agent_name': record.agent_name, **_empty_stats()}
+            _accumulate(by_agent[record.agent_id], record)
+            _accumulate(by_agent_name.setdefault(record.agent_name, _empty_stats()), record)
+            _accumulate(by_phase.setdefault(record.phase, _empty_stats()), record)
+            _accumulate(by_model.setdefault(record.model, _empty_stats()), record)
+        return {
+            'run_id': self.run_id,
+            'started_at': self.started_at,
+            'updated_at': time.time(),
+            'totals': _finalize(totals),
+            'by_agent': {key: _finalize(value) for key, value in by_agent.items()},
+            'by_agent_name': {key: _finalize(value) for key, value in by_agent_name.items()},
+            'by_phase': {key: _finalize(value) for key, value in by_phase.items()},
+            'by_model': {key: _finalize(value) for key, value in by_model.items()},
+        }
+
+    def save(self, path: str):
+        """写出 `{'current_run': run_id, 'runs': [...]}`，同一文件中其他run的汇总保持不变。"""
+        runs = []
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    runs = [run for run in json.load(f).get('runs', []) if run.get('run_id') != self.run_id]
+            except (OSError, ValueError, AttributeError):
+                runs = []
+        runs.append(self.summary())
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'current_run': self.run_id, 'runs': runs}, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, path)
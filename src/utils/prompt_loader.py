@@ -3,10 +3,36 @@
 import os
 import yaml
 import warnings
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, Optional
 from pathlib import Path
 
 
+def format_with_stable_prefix(template: str, variable_keys: Iterable[str], **kwargs) -> str:
+    """
+    格式化提示词模板，并把引用了 variable_keys 的行移到末尾。
+
+    同一批兄弟Agent（如各章节写作、各分析任务）只有少数字段不同；把这些字段所在的行
+    集中放到提示词尾部，其余内容（规则、API说明、数据目录等）构成逐字节一致的共享前缀，
+    从而命中服务端的前缀缓存（KV cache）。
+
+    Args:
+        template: 提示词模板
+        variable_keys: 每个Agent各不相同的字段名
+        **kwargs: 用于 str.format() 的变量
+
+    Returns:
+        格式化后的提示词：共享部分在前，可变部分在后
+    """
+    markers = tuple(f"{{{key}}}" for key in variable_keys)
+    head, tail = [], []
+    for line in template.split('\n'):
+        (tail if markers and any(marker in line for marker in markers) else head).append(line)
+    prompt = '\n'.join(head).rstrip().format(**kwargs)
+    if tail:
+        prompt += '\n\n' + '\n'.join(line.strip() for line in tail).format(**kwargs)
+    return prompt
+
+
 class PromptLoader:
     """加载并管理来自 YAML 配置文件的提示词。"""
     
@@ -89,6 +115,20 @@ class PromptLoader:
                 )
         
         return prompt_template
+
+    def get_prompt_with_stable_prefix(self, prompt_key: str, variable_keys: Iterable[str], **kwargs) -> str:
+        """
+        获取并格式化提示词，引用了 variable_keys 的行移到末尾（见 `format_with_stable_prefix`）。
+        """
+        prompt_template = self.get_prompt(prompt_key)
+        if prompt_template is None:
+            return None
+        try:
+            return format_with_stable_prefix(prompt_template, variable_keys, **kwargs)
+        except KeyError as e:
+            raise KeyError(
+                f"提示词 '{prompt_key}' 缺少必要的格式化参数 {e}"
+            )
     
     def get_all_prompts(self) -> Dict[str, str]:
         """获取所有已加载的提示词。"""
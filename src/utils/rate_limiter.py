@@ -0,0 +1,256 @@
+"""
+LLM端点的客户端限流：RPM/TPM令牌桶 + AIMD自适应并发。
+
+- 令牌桶按分钟速率连续补充，容量为一分钟的额度；TPM先按估算的prompt token扣减，
+  拿到实际usage后再补差（允许暂时为负，后续请求自然等待）
+- 并发窗口：成功一次加 1/limit（约每一轮窗口+1），遇到429或延迟突增时减半；
+  只有在上次减半之后发出的请求才会再次触发减半，同一波429只减一次
+- 延迟突增不看总耗时（随输出长度变化，流式时覆盖整个生成过程）：流式请求看首token耗时，
+  非流式看每个输出token的耗时，各自维护平滑均值
+- 状态只由线程锁保护、不绑定事件循环，同一个限流器可被多个线程/事件循环共享
+"""
+import time
+import asyncio
+import threading
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """判断异常是否为服务端限流（HTTP 429）。"""
+    if getattr(error, 'status_code', None) == 429:
+        return True
+    message = str(error)
+    return 'Error code: 429' in message or 'rate limit' in message.lower()
+
+
+def estimate_tokens(messages: List[Dict[str, Any]]) -> int:
+    """粗略估算消息的token数（按每2个字符1个token，对中英文混合文本偏保守）。"""
+    chars = 0
+    images = 0
+    for message in messages:
+        content = message.get('content') if isinstance(message, dict) else message
+        if isinstance(content, str):
+            chars += len(content)
+        elif isinstance(content, list):
+            for part in content:
+                if isinstance(part, dict) and part.get('type') == 'text':
+                    chars += len(part.get('text', ''))
+                else:
+                    images += 1
+    return chars // 2 + images * 85 + 1
+
+
+class TokenBucket:
+    """
+    按分钟速率补充的令牌桶。
+
+    只用线程锁保护计数，不绑定事件循环，可被 `run_async_safely` 的多个临时事件循环共享。
+    取令牌时先在锁内预扣（余额可为负），再在锁外睡到余额回正，排在前面的请求先拿到。
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float = 1):
+        """取走amount个令牌，不足时等待（先到先得）。"""
+        amount = min(amount, self.capacity)
+        with self._lock:
+            self._refill()
+            self.tokens -= amount
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait <= 0:
+            return
+        try:
+            await asyncio.sleep(wait)
+        except asyncio.CancelledError:
+            self.adjust(-amount)  # 未发出的请求退还预扣的令牌
+            raise
+
+    def adjust(self, amount: float):
+        """按实际用量补扣（amount为正表示多用，为负表示退还）。"""
+        with self._lock:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens - amount)
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD并发窗口。
+
+    等待者按 (事件循环, Future) 排队，释放槽位时在线程锁内按先后顺序分配，并通过
+    `call_soon_threadsafe` 唤醒其所在的事件循环，因此可跨线程、跨事件循环共享。
+
+    Args:
+        max_limit: 窗口上限（也是初始值）
+        min_limit: 窗口下限
+        latency_factor: 单次延迟指标超过同类指标平滑均值的该倍数视为延迟突增
+    """
+
+    def __init__(self, max_limit: int, min_limit: int = 1, latency_factor: float = 3.0):
+        self.max_limit = max(1, int(max_limit))
+        self.min_limit = max(1, min(int(min_limit), self.max_limit))
+        self.limit = float(self.max_limit)
+        self.latency_factor = latency_factor
+        self.in_flight = 0
+        self.epoch = 0  # 每次减半加一
+        self._latency_avg: Dict[str, float] = {}  # 指标类型 -> 平滑均值
+        self._samples: Dict[str, int] = {}
+        self._waiters: Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+        self._lock = threading.Lock()
+
+    def _has_room(self) -> bool:
+        return self.in_flight < max(self.min_limit, int(self.limit))
+
+    @staticmethod
+    def _wake(future: asyncio.Future, epoch: int):
+        if not future.done():
+            future.set_result(epoch)
+
+    def _grant_waiters(self):
+        """按排队顺序把空出的槽位分给等待者（调用方持有锁）。"""
+        while self._waiters and self._has_room():
+            loop, future = self._waiters.popleft()
+            try:
+                loop.call_soon_threadsafe(self._wake, future, self.epoch)
+            except RuntimeError:
+                continue  # 等待者所在的事件循环已关闭
+            self.in_flight += 1
+
+    async def acquire(self) -> int:
+        """占用一个并发槽位，返回当前epoch（释放时传回）。"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if not self._waiters and self._has_room():
+                self.in_flight += 1
+                return self.epoch
+            waiter = (loop, loop.create_future())
+            self._waiters.append(waiter)
+        try:
+            return await waiter[1]
+        except asyncio.CancelledError:
+            with self._lock:
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    # 取消前已分到槽位：还回去给下一个等待者
+                    self.in_flight -= 1
+                    self._grant_waiters()
+            raise
+
+    async def release(self, epoch: int, latency: Optional[float] = None, throttled: bool = False, kind: str = 'total'):
+        """
+        归还槽位。
+
+        Args:
+            epoch: `acquire` 返回的epoch
+            latency: 本次请求的延迟指标（失败时为 None）
+            throttled: 是否被服务端限流
+            kind: 延迟指标类型（'ttft' 首token耗时 / 'per_token' 每输出token耗时 / 'total' 总耗时），
+                只与同类指标的均值比较
+        """
+        with self._lock:
+            self.in_flight -= 1
+            average = self._latency_avg.get(kind)
+            spike = (
+                latency is not None
+                and self._samples.get(kind, 0) >= 10
+                and latency > average * self.latency_factor
+            )
+            if throttled or spike:
+                if epoch == self.epoch:
+                    self.limit = max(float(self.min_limit), self.limit / 2)
+                    self.epoch += 1
+            elif latency is not None:
+                self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+            if latency is not None and not throttled:
+                self._samples[kind] = self._samples.get(kind, 0) + 1
+                self._latency_avg[kind] = latency if average is None else 0.9 * average + 0.1 * latency
+            self._grant_waiters()
+
+
+class EndpointLimiter:
+    """
+    单个LLM端点的限流器：并发窗口 + 请求数令牌桶 + token令牌桶。
+
+    用法::
+
+        async with limiter.slot(estimate_tokens(messages)) as ticket:
+            response = await call_api()
+            ticket['tokens'] = response.usage.total_tokens
+            ticket['completion_tokens'] = response.usage.completion_tokens
+
+    流式调用在收到第一块内容时设置 `ticket['first_token_at'] = time.monotonic()`。
+    """
+
+    # 按输出token折算延迟时的最少token数，避免极短输出（固定开销为主）被误判为突增
+    MIN_OUTPUT_TOKENS = 32
+
+    def __init__(
+        self,
+        name: str,
+        rpm: Optional[int] = None,
+        tpm: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        min_concurrency: int = 1,
+    ):
+        self.name = name
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+        self.concurrency = AdaptiveConcurrency(max_concurrency or 32, min_limit=min_concurrency)
+        self.throttled_count = 0
+
+    @asynccontextmanager
+    async def slot(self, estimated_tokens: int = 0):
+        epoch = await self.concurrency.acquire()
+        ticket: Dict[str, Any] = {'tokens': None, 'completion_tokens': None, 'first_token_at': None}
+        latency = None
+        kind = 'total'
+        throttled = False
+        try:
+            if self.requests is not None:
+                await self.requests.acquire(1)
+            if self.tokens is not None:
+                await self.tokens.acquire(estimated_tokens)
+            start_time = time.monotonic()
+            try:
+                yield ticket
+            except Exception as e:
+                throttled = is_rate_limit_error(e)
+                self.throttled_count += int(throttled)
+                raise
+            kind, latency = self.latency_signal(ticket, start_time, time.monotonic())
+        finally:
+            if self.tokens is not None and ticket['tokens'] is not None:
+                self.tokens.adjust(ticket['tokens'] - min(estimated_tokens, self.tokens.capacity))
+            await self.concurrency.release(epoch, latency=latency, throttled=throttled, kind=kind)
+
+    @classmethod
+    def latency_signal(cls, ticket: Dict[str, Any], start_time: float, end_time: float) -> Tuple[str, float]:
+        """
+        选择不随输出长度变化的延迟指标：流式用首token耗时，已知输出token数时用每token耗时，
+        否则（如embedding）用总耗时。
+        """
+        if ticket.get('first_token_at') is not None:
+            return 'ttft', ticket['first_token_at'] - start_time
+        if ticket.get('completion_tokens'):
+            return 'per_token', (end_time - start_time) / max(ticket['completion_tokens'], cls.MIN_OUTPUT_TOKENS)
+        return 'total', end_time - start_time
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'concurrency_limit': round(self.concurrency.limit, 2),
+            'in_flight': self.concurrency.in_flight,
+            'throttled': self.throttled_count,
+        }
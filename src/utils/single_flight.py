@@ -0,0 +1,77 @@
+"""
+请求合并（single-flight）：同一键的并发调用只执行一次，其余调用等待并共享结果。
+
+- 跨线程、跨事件循环生效：结果通过 `concurrent.futures.Future` 传递，等待者用
+  `asyncio.wrap_future` 在各自的事件循环上等待
+- 等待者被取消只影响它自己（共享future经 `asyncio.shield` 保护，不会被连带取消）
+- 执行者抛出普通异常时所有等待者收到同一异常；执行者被取消时等待者各自重试
+"""
+import asyncio
+import concurrent.futures
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+class _FlightAbandoned(Exception):
+    """负责执行的调用被取消，等待者需自行重试。"""
+
+
+class SingleFlight:
+    """
+    按键合并并发调用。`coalesced` 记录搭便车（未执行、直接共享结果）的调用次数。
+    """
+
+    def __init__(self):
+        self.coalesced = 0
+        self._inflight: Dict[str, concurrent.futures.Future] = {}
+        self._lock = threading.Lock()
+
+    async def do(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[Any]],
+        share: Optional[Callable[[Any], Any]] = None,
+    ) -> Any:
+        """
+        执行 `fn`，或等待同一键正在进行的调用并返回其结果。
+
+        Args:
+            key: 合并键
+            fn: 实际执行的协程函数（只有执行者调用）
+            share: 交给每个等待者之前对结果的处理（如复制可变对象）；执行者拿到原始结果
+        """
+        while True:
+            with self._lock:
+                future = self._inflight.get(key)
+                owner = future is None
+                if owner:
+                    future = concurrent.futures.Future()
+                    self._inflight[key] = future
+            if owner:
+                return await self._run(key, future, fn)
+
+            self.coalesced += 1
+            try:
+                result = await asyncio.shield(asyncio.wrap_future(future))
+            except _FlightAbandoned:
+                continue
+            return share(result) if share is not None else result
+
+    async def _run(self, key: str, future: concurrent.futures.Future, fn: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            result = await fn()
+            if not future.done():
+                future.set_result(result)
+            return result
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+            raise
+        except BaseException:
+            if not future.done():
+                future.set_exception(_FlightAbandoned())
+            raise
+        finally:
+            with self._lock:
+                if self._inflight.get(key) is future:
+                    del self._inflight[key]
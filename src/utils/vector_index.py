@@ -0,0 +1,227 @@
+"""
+连续float32向量矩阵：行号<->键映射、写入时一次性L2归一化、argpartition取top-k，
+数据量大时可选用faiss近似最近邻；以内存映射的.npy文件持久化。
+"""
+import os
+import json
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import faiss  # 可选依赖：大规模向量的近似最近邻检索
+except ImportError:
+    faiss = None
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _top_k(scores: np.ndarray, top_k: int) -> np.ndarray:
+    """按分数降序返回前top_k个位置（argpartition + 局部排序）。"""
+    k = min(top_k, scores.shape[0])
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    if k < scores.shape[0]:
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    else:
+        candidates = np.arange(scores.shape[0])
+    return candidates[np.argsort(-scores[candidates], kind='stable')]
+
+
+def greedy_assignment(scores: np.ndarray, mask: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    全局贪心匹配：按分数从高到低为每一行分配一个互不重复的列。
+
+    Args:
+        scores: (行数, 列数) 相似度矩阵
+        mask: 同形状的布尔矩阵，False 表示该组合不可匹配
+
+    Returns:
+        每行分配到的列号，未分配为 -1
+    """
+    scores = np.asarray(scores, dtype=np.float32)
+    assignment = np.full(scores.shape[0], -1, dtype=np.int64)
+    if scores.size == 0:
+        return assignment
+    if mask is not None:
+        scores = np.where(mask, scores, -np.inf)
+    n_cols = scores.shape[1]
+    used_cols = np.zeros(n_cols, dtype=bool)
+    remaining = min(scores.shape)
+    for flat_idx in np.argsort(-scores, axis=None, kind='stable'):
+        row, col = divmod(int(flat_idx), n_cols)
+        if not np.isfinite(scores[row, col]):
+            break
+        if assignment[row] >= 0 or used_cols[col]:
+            continue
+        assignment[row] = col
+        used_cols[col] = True
+        remaining -= 1
+        if remaining == 0:
+            break
+    return assignment
+
+
+class EmbeddingMatrix:
+    """
+    键到向量的映射，底层为一块连续的float32矩阵（按容量翻倍扩展）。
+
+    - 向量写入时即L2归一化，检索时直接做内积（余弦相似度）
+    - `save` 写出 `<path>`（.npy）与 `<path>.keys.json`；`load` 以只读内存映射打开，
+      首次写入新向量时才复制到可写内存
+    - 行数达到 `ann_threshold` 且安装了faiss时，全量检索走HNSW近似索引
+    """
+
+    def __init__(self, ann_threshold: int = 50000):
+        self.ann_threshold = ann_threshold
+        self.keys: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._matrix: Optional[np.ndarray] = None
+        self._size = 0
+        self._ann = None
+        self._ann_size = 0
+        self.dirty = False
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._rows
+
+    @property
+    def dim(self) -> int:
+        return 0 if self._matrix is None else self._matrix.shape[1]
+
+    @property
+    def matrix(self) -> np.ndarray:
+        if self._matrix is None:
+            return np.empty((0, 0), dtype=np.float32)
+        return self._matrix[:self._size]
+
+    def _reserve(self, rows: int, dim: int):
+        if self._matrix is None:
+            self._matrix = np.empty((max(rows, 64), dim), dtype=np.float32)
+            return
+        if dim != self._matrix.shape[1]:
+            raise ValueError(f"Embedding dimension mismatch: expected {self._matrix.shape[1]}, got {dim}")
+        writable = self._matrix.flags.writeable and not isinstance(self._matrix, np.memmap)
+        if rows <= self._matrix.shape[0] and writable:
+            return
+        capacity = max(rows, 2 * self._matrix.shape[0], 64)
+        grown = np.empty((capacity, dim), dtype=np.float32)
+        grown[:self._size] = self._matrix[:self._size]
+        self._matrix = grown
+
+    def add_many(self, keys: Sequence[str], vectors: Iterable) -> None:
+        """写入（或覆盖）一批向量。"""
+        vectors = _normalize(np.asarray(list(vectors), dtype=np.float32))
+        if len(keys) == 0:
+            return
+        if vectors.ndim != 2 or vectors.shape[0] != len(keys):
+            raise ValueError("keys and vectors must have the same length")
+        new_keys = [key for key in dict.fromkeys(keys) if key not in self._rows]
+        self._reserve(self._size + len(new_keys), vectors.shape[1])
+        for key in new_keys:
+            self._rows[key] = self._size
+            self.keys.append(key)
+            self._size += 1
+        for key, vector in zip(keys, vectors):
+            row = self._rows[key]
+            if row < self._ann_size:
+                self._ann = None  # 覆盖了已入索引的行，近似索引需重建
+            self._matrix[row] = vector
+        self.dirty = True
+
+    def add(self, key: str, vector) -> None:
+        self.add_many([key], [vector])
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        row = self._rows.get(key)
+        return None if row is None else self._matrix[row]
+
+    def rows(self, keys: Sequence[str]) -> np.ndarray:
+        """键对应的行号；存在未收录的键时抛出 KeyError（-1 会读到未初始化的行）。"""
+        missing = [key for key in keys if key not in self._rows]
+        if missing:
+            raise KeyError(f"{len(missing)} key(s) not in EmbeddingMatrix, e.g. {missing[0]!r}")
+        return np.fromiter((self._rows[key] for key in keys), dtype=np.int64, count=len(keys))
+
+    def _ann_index(self):
+        if faiss is None or self._size < self.ann_threshold:
+            return None
+        if self._ann is None:
+            self._ann = faiss.IndexHNSWFlat(self.dim, 32, faiss.METRIC_INNER_PRODUCT)
+            self._ann_size = 0
+        if self._ann_size < self._size:
+            self._ann.add(np.ascontiguousarray(self._matrix[self._ann_size:self._size]))
+            self._ann_size = self._size
+        return self._ann
+
+    def search(self, query, top_k: int = 10, rows: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        检索与query最相似的向量。
+
+        Args:
+            query: 查询向量（无需归一化）
+            top_k: 返回数量
+            rows: 候选行号数组；给定时返回值为该数组中的位置，否则为行号
+
+        Returns:
+            (positions, scores)，按分数降序
+        """
+        if self._size == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        query = _normalize(np.asarray(query, dtype=np.float32).reshape(-1))
+
+        ann = self._ann_index()
+        if ann is not None:
+            pool = top_k if rows is None else min(self._size, top_k * 4)
+            _, found = ann.search(query.reshape(1, -1), pool)
+            found = found[0][found[0] >= 0]
+            positions = found if rows is None else np.flatnonzero(np.isin(rows, found))
+            if rows is None or positions.shape[0] >= top_k:
+                scores = self._matrix[found if rows is None else rows[positions]] @ query
+                order = _top_k(scores, top_k)
+                return positions[order], scores[order]
+
+        candidates = self.matrix if rows is None else self._matrix[rows]
+        scores = candidates @ query
+        order = _top_k(scores, top_k)
+        return order, scores[order]
+
+    def save(self, path: str) -> None:
+        """写出 `<path>`(.npy) 与 `<path>.keys.json`（均为原子替换）。"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.save(f, np.ascontiguousarray(self.matrix))
+        os.replace(tmp_path, path)
+        keys_path = path + '.keys.json'
+        with open(keys_path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(self.keys, f, ensure_ascii=False)
+        os.replace(keys_path + '.tmp', keys_path)
+        self.dirty = False
+
+    @classmethod
+    def load(cls, path: str, ann_threshold: int = 50000) -> 'EmbeddingMatrix':
+        """以只读内存映射方式加载；文件不存在时返回空矩阵。"""
+        instance = cls(ann_threshold=ann_threshold)
+        keys_path = path + '.keys.json'
+        if not (os.path.exists(path) and os.path.exists(keys_path)):
+            return instance
+        matrix = np.load(path, mmap_mode='r')
+        with open(keys_path, 'r', encoding='utf-8') as f:
+            keys = json.load(f)
+        size = min(len(keys), matrix.shape[0])
+        if size == 0 or matrix.ndim != 2:
+            return instance
+        instance._matrix = matrix
+        instance._size = size
+        instance.keys = list(keys[:size])
+        instance._rows = {key: row for row, key in enumerate(instance.keys)}
+        return instance
@@ -1,8 +1,11 @@
 """
 Memory 状态检查工具
 用于快速查看 Memory 的内容，辅助调试
+
+memory.pkl 只是清单，log/data 存放在 `<名称>_shards/` 分片中、向量在 `<名称>_embeddings.npy`，
+因此通过 `Memory.load` 读取（兼容旧的单文件格式）
 """
-import dill
+import json
 import sys
 import os
 from pathlib import Path
@@ -10,6 +13,30 @@ from pathlib import Path
 root = str(Path(__file__).resolve().parents[2])
 sys.path.append(root)
 
+from src.memory import Memory
+
+
+class _SavedConfig:
+    """只读取运行目录下 config.json 的最小配置，供 Memory 加载检查点（不创建 LLM 客户端与连接池）"""
+
+    def __init__(self, working_dir):
+        self.working_dir = working_dir
+        config_path = os.path.join(working_dir, 'config.json')
+        self.config = {}
+        if os.path.exists(config_path):
+            with open(config_path, 'r', encoding='utf-8') as f:
+                self.config = json.load(f)
+
+
+def load_memory(memory_path):
+    """按 <working_dir>/memory/<checkpoint> 的布局加载 Memory；失败返回 None"""
+    memory_path = os.path.abspath(memory_path)
+    working_dir = os.path.dirname(os.path.dirname(memory_path))
+    memory = Memory(config=_SavedConfig(working_dir))
+    if not memory.load(os.path.basename(memory_path)):
+        return None
+    return memory
+
 
 def inspect_memory(memory_path='outputs/my-research/memory/memory.pkl'):
     """打印 Memory 的详细信息"""
@@ -23,23 +50,25 @@ def inspect_memory(memory_path='outputs/my-research/memory/memory.pkl'):
     print(" Memory State Inspector".center(70))
     print("="*70)
     print(f"文件路径: {memory_path}")
-    print(f"文件大小: {os.path.getsize(memory_path) / 1024:.2f} KB")
+    print(f"清单大小: {os.path.getsize(memory_path) / 1024:.2f} KB")
     
     try:
-        with open(memory_path, 'rb') as f:
-            state = dill.load(f)
+        memory = load_memory(memory_path)
     except Exception as e:
+        memory = None
         print(f"\n❌ 无法加载文件: {e}")
+    if memory is None:
+        print("\n❌ 无法加载 Memory 检查点")
         return
     
     # 数据项统计
     print("\n" + "-"*70)
     print("📊 数据项 (Data Items)")
     print("-"*70)
-    print(f"总数: {len(state.get('data', []))}")
+    print(f"总数: {len(memory.data)}")
     
     data_types = {}
-    for item in state.get('data', []):
+    for item in memory.data:
         type_name = type(item).__name__
         data_types[type_name] = data_types.get(type_name, 0) + 1
     
@@ -48,7 +77,7 @@ def inspect_memory(memory_path='outputs/my-research/memory/memory.pkl'):
         print(f"  • {type_name}: {count}")
     
     print("\n前 5 个数据项:")
-    for i, item in enumerate(state.get('data', [])[:5]):
+    for i, item in enumerate(memory.data[:5]):
         type_name = type(item).__name__
         name = getattr(item, 'name', 'N/A')
         print(f"  [{i}] {type_name}: {name}")
@@ -57,7 +86,7 @@ def inspect_memory(memory_path='outputs/my-research/memory/memory.pkl'):
     print("\n" + "-"*70)
     print("📋 任务映射 (Task Mapping)")
     print("-"*70)
-    task_mapping = state.get('task_mapping', [])
+    task_mapping = memory.task_mapping
     print(f"总数: {len(task_mapping)}\n")
     
     for i, task in enumerate(task_mapping):
@@ -74,20 +103,20 @@ def inspect_memory(memory_path='outputs/my-research/memory/memory.pkl'):
     print("\n" + "-"*70)
     print("🔢 向量索引 (Embeddings)")
     print("-"*70)
-    embeddings = state.get('data2embedding', {})
+    embeddings = memory.embeddings
     print(f"缓存的 Embedding 数量: {len(embeddings)}")
     
-    if embeddings:
+    if len(embeddings):
         print("\n示例键值:")
-        for key in list(embeddings.keys())[:3]:
+        for key in list(embeddings.keys)[:3]:
             print(f"  • {key[:60]}...")
     
     # 生成的任务
     print("\n" + "-"*70)
     print("📝 LLM 生成的任务")
     print("-"*70)
-    collect_tasks = state.get('generated_collect_tasks', [])
-    analysis_tasks = state.get('generated_analysis_tasks', [])
+    collect_tasks = memory.generated_collect_tasks
+    analysis_tasks = memory.generated_analysis_tasks
     
     print(f"采集任务 (Collect): {len(collect_tasks)}")
     for i, task in enumerate(collect_tasks):
@@ -101,7 +130,7 @@ def inspect_memory(memory_path='outputs/my-research/memory/memory.pkl'):
     print("\n" + "-"*70)
     print("🔗 依赖关系 (Dependencies)")
     print("-"*70)
-    dependencies = state.get('dependency', {})
+    dependencies = memory.dependency
     print(f"依赖关系数量: {len(dependencies)}\n")
     
     for parent, children in list(dependencies.items())[:5]:
@@ -113,7 +142,7 @@ def inspect_memory(memory_path='outputs/my-research/memory/memory.pkl'):
     print("\n" + "-"*70)
     print("📜 日志 (Logs)")
     print("-"*70)
-    logs = state.get('log', [])
+    logs = memory.log
     print(f"日志条目数: {len(logs)}")
     
     if logs:
@@ -136,10 +165,11 @@ def compare_memories(path1, path2):
     print(" Memory Comparison".center(70))
     print("="*70)
     
-    with open(path1, 'rb') as f:
-        state1 = dill.load(f)
-    with open(path2, 'rb') as f:
-        state2 = dill.load(f)
+    memory1 = load_memory(path1)
+    memory2 = load_memory(path2)
+    if memory1 is None or memory2 is None:
+        print("\n❌ 无法加载 Memory 检查点")
+        return
     
     print(f"\nMemory 1: {path1}")
     print(f"Memory 2: {path2}")
@@ -149,18 +179,18 @@ def compare_memories(path1, path2):
     print("-"*70)
     
     # 数据项差异
-    data1_count = len(state1.get('data', []))
-    data2_count = len(state2.get('data', []))
+    data1_count = len(memory1.data)
+    data2_count = len(memory2.data)
     print(f"📊 数据项: {data1_count} → {data2_count} (delta: {data2_count - data1_count:+d})")
     
     # 任务差异
-    task1_count = len(state1.get('task_mapping', []))
-    task2_count = len(state2.get('task_mapping', []))
+    task1_count = len(memory1.task_mapping)
+    task2_count = len(memory2.task_mapping)
     print(f"📋 任务: {task1_count} → {task2_count} (delta: {task2_count - task1_count:+d})")
     
     # Embedding 差异
-    emb1_count = len(state1.get('data2embedding', {}))
-    emb2_count = len(state2.get('data2embedding', {}))
+    emb1_count = len(memory1.embeddings)
+    emb2_count = len(memory2.embeddings)
     print(f"🔢 Embeddings: {emb1_count} → {emb2_count} (delta: {emb2_count - emb1_count:+d})")
     
     print("\n" + "="*70 + "\n")
@@ -0,0 +1,93 @@
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+root = str(Path(__file__).resolve().parents[2])
+sys.path.append(root)
+
+from src.utils.async_helpers import configure_blocking_pool, run_blocking, run_cleanup
+
+
+@pytest.fixture(autouse=True)
+def _small_pool():
+    configure_blocking_pool(2)
+    yield
+    configure_blocking_pool(16)
+
+
+def test_run_blocking_keeps_the_loop_responsive():
+    async def main():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        result = await run_blocking(lambda value: time.sleep(0.2) or value, 'done')
+        task.cancel()
+        return result, ticks
+
+    result, ticks = asyncio.run(main())
+    assert result == 'done'
+    assert ticks >= 5
+
+
+def test_timeout_counts_from_start_not_from_queueing():
+    async def main():
+        # two workers: the third call queues behind two 0.2s calls but has its own 0.3s budget
+        calls = [run_blocking(time.sleep, 0.2, timeout=0.3) for _ in range(3)]
+        return await asyncio.gather(*calls)
+
+    assert asyncio.run(main()) == [None, None, None]
+
+    async def too_slow():
+        await run_blocking(time.sleep, 0.3, timeout=0.05)
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(too_slow())
+
+
+def test_cancelled_queued_call_never_runs():
+    started = []
+    release = threading.Event()
+
+    async def main():
+        blockers = [asyncio.ensure_future(run_blocking(release.wait, 1)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        queued = asyncio.ensure_future(run_blocking(started.append, 'queued'))
+        await asyncio.sleep(0.01)
+        queued.cancel()
+        await asyncio.sleep(0.01)  # let the cancellation reach the executor queue
+        release.set()
+        await asyncio.gather(*blockers)
+        await asyncio.sleep(0.05)
+
+    asyncio.run(main())
+    assert started == []
+
+
+
+def test_run_cleanup_runs_now_from_sync_code_and_as_a_task_inside_a_loop():
+    done = []
+
+    async def cleanup(tag):
+        await asyncio.sleep(0.01)
+        done.append(tag)
+
+    run_cleanup(cleanup('sync'))
+    assert done == ['sync']
+
+    async def main():
+        run_cleanup(cleanup('async'))
+        assert done == ['sync']  # scheduled, never blocks the running loop
+        await asyncio.sleep(0.05)
+
+    asyncio.run(main())
+    assert done == ['sync', 'async']
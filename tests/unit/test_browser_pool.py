@@ -0,0 +1,138 @@
+import asyncio
+import gc
+import sys
+from pathlib import Path
+
+import pytest
+
+root = str(Path(__file__).resolve().parents[2])
+sys.path.append(root)
+
+from src.tools.web import browser_pool
+from src.tools.web.browser_pool import BrowserPoolBusy, _LeasePool
+from src.utils.async_helpers import run_async_safely
+
+
+class _Resource:
+    def __init__(self):
+        self.healthy = True
+        self.closed = False
+
+
+class _FakePool(_LeasePool):
+    name = 'FakePool'
+
+    async def _start(self):
+        await asyncio.sleep(0.01)
+        return _Resource()
+
+    async def _stop(self, resource):
+        resource.closed = True
+
+    def _is_healthy(self, resource):
+        return resource.healthy
+
+
+async def _use(pool, hold=0.02):
+    async with pool.lease() as resource:
+        await asyncio.sleep(hold)
+        return resource
+
+
+def test_concurrent_leases_share_one_launch():
+    pool = _FakePool(max_concurrency=2, max_uses=50)
+
+    async def main():
+        return await asyncio.gather(*(_use(pool) for _ in range(6)))
+
+    resources = asyncio.run(main())
+    assert pool.launches == 1
+    assert len({id(r) for r in resources}) == 1
+
+
+def test_resource_is_recycled_after_max_uses():
+    pool = _FakePool(max_concurrency=1, max_uses=3)
+
+    async def main():
+        return [await _use(pool, 0) for _ in range(4)]
+
+    resources = asyncio.run(main())
+    assert pool.launches == 2
+    assert resources[0] is resources[2] and resources[0].closed
+    assert resources[3] is not resources[0]
+
+
+def test_unhealthy_resource_is_replaced():
+    pool = _FakePool()
+
+    async def main():
+        first = await _use(pool, 0)
+        first.healthy = False
+        return first, await _use(pool, 0)
+
+    first, second = asyncio.run(main())
+    assert second is not first and first.closed
+
+
+def test_too_many_waiters_are_rejected():
+    pool = _FakePool(max_concurrency=1, max_waiting=2)
+
+    async def main():
+        return await asyncio.gather(*(_use(pool, 0.05) for _ in range(5)), return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert sum(isinstance(r, BrowserPoolBusy) for r in results) == 2
+
+
+def test_temporary_loop_resources_are_closed_and_forgotten():
+    pool = _FakePool()
+    resources = [run_async_safely(_use(pool, 0)) for _ in range(3)]
+    gc.collect()
+
+    assert all(r.closed for r in resources)
+    assert len(pool._states) == 0
+
+
+def test_aclose_closes_resources_of_the_running_loop():
+    pool = _FakePool()
+
+    async def main():
+        resource = await _use(pool, 0)
+        await pool.aclose()
+        return resource
+
+    assert asyncio.run(main()).closed
+
+
+def test_failed_lease_retires_when_configured():
+    pool = _FakePool()
+    pool.retire_on_error = True
+
+    async def main():
+        with pytest.raises(RuntimeError):
+            async with pool.lease() as resource:
+                raise RuntimeError('page crashed')
+        return resource, await _use(pool, 0)
+
+    broken, replacement = asyncio.run(main())
+    assert broken.closed and replacement is not broken
+
+
+def test_reconfiguring_keeps_unchanged_pools_and_closes_replaced_ones(monkeypatch):
+    pool = _FakePool()
+    monkeypatch.setattr(browser_pool, '_pool_settings', {'max_concurrency': 2})
+    monkeypatch.setattr(browser_pool, '_browser_pool', pool)
+    monkeypatch.setattr(browser_pool, '_crawler_pool', None)
+
+    async def main():
+        async with pool.lease() as resource:
+            pass
+        browser_pool.configure_browser_pools(max_concurrency=2)
+        assert browser_pool.get_browser_pool() is pool and not resource.closed
+
+        browser_pool.configure_browser_pools(max_concurrency=3)
+        await asyncio.sleep(0.01)  # the replaced pool is closed in a task on this loop
+        assert resource.closed
+        assert browser_pool._browser_pool is None
+
+    asyncio.run(main())
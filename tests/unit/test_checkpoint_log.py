@@ -0,0 +1,65 @@
+import os
+import sys
+from pathlib import Path
+
+root = str(Path(__file__).resolve().parents[2])
+sys.path.append(root)
+
+from src.utils.checkpoint_log import ConversationLog
+
+
+def _messages(count):
+    return [{'role': 'user' if i % 2 == 0 else 'assistant', 'content': f'turn {i}'} for i in range(count)]
+
+
+def test_turns_append_only_new_messages(tmp_path):
+    path = str(tmp_path / 'history.log')
+    log = ConversationLog(path)
+    log.sync(_messages(2))
+    size = os.path.getsize(path)
+
+    marker = log.sync(_messages(4))
+
+    assert log._segments == 2
+    assert marker['end'] > size
+    assert ConversationLog.replay(path, marker) == _messages(4)
+
+
+def test_trimmed_history_rewrites_from_first_difference(tmp_path):
+    path = str(tmp_path / 'history.log')
+    log = ConversationLog(path)
+    log.sync(_messages(6))
+    trimmed = _messages(2) + [{'role': 'user', 'content': 'summary'}] + _messages(6)[4:]
+
+    marker = log.sync(trimmed)
+
+    assert ConversationLog.replay(path, marker) == trimmed
+
+
+def test_compaction_keeps_content_and_starts_new_generation(tmp_path):
+    path = str(tmp_path / 'history.log')
+    log = ConversationLog(path, compact_every=3)
+    first = log.sync(_messages(1))
+    for count in range(2, 4):
+        log.sync(_messages(count))
+
+    marker = log.sync(_messages(4))
+
+    assert marker['generation'] != first['generation']
+    assert log._segments == 1
+    assert ConversationLog.replay(path, marker) == _messages(4)
+    # an older marker still replays its own prefix after compaction
+    assert ConversationLog.replay(path, first) == _messages(1)
+    assert not os.path.exists(path + '.tmp')
+
+
+def test_replay_stops_at_marker_and_ignores_torn_tail(tmp_path):
+    path = str(tmp_path / 'history.log')
+    log = ConversationLog(path)
+    marker = log.sync(_messages(2))
+    log.sync(_messages(3))
+    with open(path, 'ab') as f:
+        f.write(b'\x80\x04partial')
+
+    assert ConversationLog.replay(path, marker) == _messages(2)
+    assert ConversationLog.replay(path) == _messages(3)
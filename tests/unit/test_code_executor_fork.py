@@ -0,0 +1,71 @@
+import asyncio
+import sys
+from pathlib import Path
+
+root = str(Path(__file__).resolve().parents[2])
+sys.path.append(root)
+
+from src.utils import code_executor_async
+from src.utils.code_executor_async import AsyncCodeExecutor
+
+
+def test_forked_functions_use_the_fork_namespace(tmp_path):
+    parent = AsyncCodeExecutor(str(tmp_path))
+
+    async def main():
+        await parent.execute(
+            "threshold = 1\n"
+            "def above(values, *, strict=True):\n"
+            "    '''values over the threshold'''\n"
+            "    return [v for v in values if v > threshold]\n"
+            "def bump():\n"
+            "    global threshold\n"
+            "    threshold += 10\n"
+        )
+        forked = parent.fork()
+        await forked.execute("threshold = 5\nbump()\nresult = above([2, 6, 20])")
+        return forked
+
+    forked = asyncio.run(main())
+
+    assert forked.get_variable('result') == [20]
+    assert forked.get_variable('threshold') == 15
+    assert parent.get_variable('threshold') == 1
+    assert parent.get_variable('above')([2, 6]) == [2, 6]
+    rebound = forked.get_variable('above')
+    assert rebound.__doc__ == 'values over the threshold'
+    assert rebound.__kwdefaults__ == {'strict': True}
+
+
+def test_injected_functions_are_shared(tmp_path):
+    parent = AsyncCodeExecutor(str(tmp_path))
+    calls = []
+    parent.set_variable('get_data', calls.append)
+    forked = parent.fork()
+
+    asyncio.run(forked.execute("get_data(1)"))
+
+    assert forked.get_variable('get_data') is parent.get_variable('get_data')
+    assert calls == [1]
+
+
+def test_helpers_drawing_with_pyplot_run_under_the_lock(tmp_path):
+    executor = AsyncCodeExecutor(str(tmp_path))
+    held = []
+    executor.set_variable('held', held)
+    executor.set_variable('pyplot_lock', code_executor_async._PYPLOT_LOCK)
+
+    async def main():
+        await executor.execute(
+            "def draw():\n"
+            "    fig = plt.figure()\n"
+            "    held.append(pyplot_lock.locked())\n"
+            "    plt.close(fig)\n"
+        )
+        # This cell never names the plotting library; the helper from the earlier cell does
+        result = await executor.execute("draw()")
+        assert not result['error'], result['stderr']
+
+    asyncio.run(main())
+
+    assert held == [True]
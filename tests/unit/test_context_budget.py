@@ -0,0 +1,54 @@
+import sys
+from pathlib import Path
+
+root = str(Path(__file__).resolve().parents[2])
+sys.path.append(root)
+
+from src.utils.context_budget import ContextBudgeter, TokenCounter
+
+
+def _history(turns, body='x' * 4000):
+    messages = [{'role': 'system', 'content': 'system prompt'}, {'role': 'user', 'content': 'task description'}]
+    for index in range(turns):
+        messages.append({'role': 'assistant', 'content': f'<execute>step {index}</execute>'})
+        messages.append({'role': 'user', 'content': f'Console output:\n{body}\nNew variables: v{index}'})
+    return messages
+
+
+def test_under_budget_is_untouched():
+    budgeter = ContextBudgeter(context_window=100000)
+    messages = _history(2)
+    original = [dict(m) for m in messages]
+    assert budgeter.fit(messages, budgeter.budget_for(1000)) is False
+    assert messages == original
+
+
+def test_fit_keeps_task_and_recent_turns_within_budget():
+    budgeter = ContextBudgeter(context_window=4000, keep_recent=2, console_keep_chars=200)
+    messages = _history(10)
+    recent = [dict(m) for m in messages[-2:]]
+    budget = budgeter.budget_for(500)
+
+    assert budgeter.fit(messages, budget) is True
+
+    assert budgeter.counter.count_messages(messages) <= budget
+    assert messages[0]['content'] == 'system prompt'
+    assert messages[1]['content'] == 'task description'
+    assert messages[-2:] == recent
+
+
+def test_old_turns_are_dropped_in_pairs_with_a_note():
+    budgeter = ContextBudgeter(context_window=2000, keep_recent=2, console_keep_chars=50, summary_keep_chars=50)
+    messages = _history(150, body='y' * 200)
+
+    budgeter.fit(messages, budgeter.budget_for(0))
+
+    roles = [m['role'] for m in messages[2:]]
+    assert roles == ['assistant', 'user'] * (len(roles) // 2)
+    assert 'earlier messages were omitted' in messages[2]['content']
+
+
+def test_counter_estimates_cjk_per_character():
+    counter = TokenCounter()
+    assert counter.count_text('中文文本') >= 4
+    assert counter.count_text('') == 0
@@ -0,0 +1,95 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+root = str(Path(__file__).resolve().parents[2])
+sys.path.append(root)
+
+from src.utils.dag_scheduler import DAGScheduler
+
+
+def _recorder(events, node_id, delay=0.0):
+    async def run():
+        events.append(('start', node_id))
+        await asyncio.sleep(delay)
+        events.append(('end', node_id))
+        return node_id
+    return run
+
+
+def test_analysis_starts_without_waiting_for_unrelated_collectors():
+    events = []
+    scheduler = DAGScheduler()
+    scheduler.add_node('collect_fin', _recorder(events, 'collect_fin', 0.01))
+    scheduler.add_node('collect_slow', _recorder(events, 'collect_slow', 0.1))
+    scheduler.add_node('analyze_fin', _recorder(events, 'analyze_fin'), depends_on=['collect_fin'])
+    scheduler.add_node('report', _recorder(events, 'report'), depends_on=['collect_fin', 'collect_slow', 'analyze_fin'])
+
+    results = asyncio.run(scheduler.run())
+
+    assert results == {node_id: node_id for node_id in scheduler.nodes}
+    assert events.index(('end', 'analyze_fin')) < events.index(('end', 'collect_slow'))
+    assert events.index(('start', 'report')) > events.index(('end', 'collect_slow'))
+
+
+def test_report_waits_for_collectors_when_there_are_no_analyzers():
+    events = []
+    scheduler = DAGScheduler()
+    collectors = ['collect_a', 'collect_b']
+    for node_id in collectors:
+        scheduler.add_node(node_id, _recorder(events, node_id, 0.02))
+    scheduler.add_node('report', _recorder(events, 'report'), depends_on=collectors)
+
+    asyncio.run(scheduler.run())
+
+    report_start = events.index(('start', 'report'))
+    assert all(events.index(('end', node_id)) < report_start for node_id in collectors)
+
+
+def test_failed_and_skipped_dependencies_still_unblock_dependents():
+    async def fail():
+        raise RuntimeError('boom')
+
+    events = []
+    scheduler = DAGScheduler()
+    scheduler.add_node('collect_failed', fail)
+    scheduler.add_node('collect_done', _recorder(events, 'collect_done'), skip=True)
+    scheduler.add_node('analyze', _recorder(events, 'analyze'), depends_on=['collect_failed', 'collect_done', 'stale_id'])
+
+    results = asyncio.run(scheduler.run())
+
+    assert isinstance(results['collect_failed'], RuntimeError)
+    assert results['collect_done'] is None
+    assert results['analyze'] == 'analyze'
+    assert ('start', 'collect_done') not in events
+
+
+def test_max_concurrent_caps_running_nodes():
+    running = 0
+    peak = 0
+
+    async def work():
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    scheduler = DAGScheduler(max_concurrent=2)
+    for index in range(5):
+        scheduler.add_node(f'node_{index}', work)
+    asyncio.run(scheduler.run())
+
+    assert peak == 2
+
+
+def test_cycles_and_duplicates_are_rejected():
+    scheduler = DAGScheduler()
+    scheduler.add_node('a', _recorder([], 'a'), depends_on=['b'])
+    scheduler.add_node('b', _recorder([], 'b'), depends_on=['a'])
+    with pytest.raises(ValueError):
+        asyncio.run(scheduler.run())
+    with pytest.raises(ValueError):
+        scheduler.add_node('a', _recorder([], 'a'))
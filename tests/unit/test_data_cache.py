@@ -0,0 +1,105 @@
+import asyncio
+import os
+import sys
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+root = str(Path(__file__).resolve().parents[2])
+sys.path.append(root)
+
+from src.tools.data_cache import ToolDataCache, make_data_key
+from src.utils.async_helpers import run_async_safely
+
+
+def _counting_loader(calls, delay=0.1):
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        return pd.DataFrame({'close': [1.0, 2.0, 3.0]})
+    return loader
+
+
+def test_key_depends_on_tool_function_and_arguments():
+    key = make_data_key('stock', pd.DataFrame, ('600519',), {'period': 'daily'})
+    assert key == make_data_key('stock', pd.DataFrame, ('600519',), {'period': 'daily'})
+    assert key != make_data_key('stock', pd.DataFrame, ('000001',), {'period': 'daily'})
+    assert key != make_data_key('macro', pd.DataFrame, ('600519',), {'period': 'daily'})
+
+
+def test_concurrent_fetches_across_loops_run_the_loader_once(tmp_path):
+    cache = ToolDataCache(str(tmp_path))
+    calls = []
+    results = []
+
+    def worker():
+        results.append(run_async_safely(cache.fetch('k', 3600, _counting_loader(calls))))
+
+    threads = [threading.Thread(target=worker) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert len(results) == 3 and all(df['close'].tolist() == [1.0, 2.0, 3.0] for df in results)
+    assert len({id(df) for df in results}) == 3  # callers never share a mutable frame
+    assert cache.coalesced == 2
+
+
+def test_results_persist_until_ttl(tmp_path):
+    calls = []
+    asyncio.run(ToolDataCache(str(tmp_path)).fetch('k', 3600, _counting_loader(calls, 0)))
+
+    fresh = ToolDataCache(str(tmp_path))
+    asyncio.run(fresh.fetch('k', 3600, _counting_loader(calls, 0)))
+    assert (len(calls), fresh.hits) == (1, 1)
+
+    os.utime(fresh._path('k'), (0, 0))
+    asyncio.run(fresh.fetch('k', 3600, _counting_loader(calls, 0)))
+    assert len(calls) == 2
+
+
+def test_waiter_retries_when_the_owner_is_cancelled(tmp_path):
+    cache = ToolDataCache(str(tmp_path))
+    calls = []
+
+    async def main():
+        owner = asyncio.create_task(cache.fetch('k', 3600, _counting_loader(calls, 1.0)))
+        await asyncio.sleep(0.01)
+        waiter = asyncio.create_task(cache.fetch('k', 3600, _counting_loader(calls, 0)))
+        await asyncio.sleep(0.01)
+        owner.cancel()
+        return await waiter
+
+    assert asyncio.run(main())['close'].tolist() == [1.0, 2.0, 3.0]
+    assert len(calls) == 2
+
+
+def test_non_frame_results_are_returned_but_not_stored(tmp_path):
+    cache = ToolDataCache(str(tmp_path))
+
+    async def loader():
+        return {'status': 'ok'}
+
+    assert asyncio.run(cache.fetch('k', 3600, loader)) == {'status': 'ok'}
+    assert not os.path.exists(cache._path('k'))
+
+
+def test_cancelled_waiter_does_not_break_the_owner_or_other_waiters(tmp_path):
+    cache = ToolDataCache(str(tmp_path))
+    calls = []
+
+    async def main():
+        owner = asyncio.create_task(cache.fetch('k', 3600, _counting_loader(calls, 0.2)))
+        await asyncio.sleep(0.01)
+        waiters = [asyncio.create_task(cache.fetch('k', 3600, _counting_loader(calls, 0))) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        waiters[0].cancel()
+        return await asyncio.gather(owner, *waiters, return_exceptions=True)
+
+    owner_result, cancelled, waiter_result = asyncio.run(main())
+    assert isinstance(cancelled, asyncio.CancelledError)
+    assert owner_result['close'].tolist() == waiter_result['close'].tolist() == [1.0, 2.0, 3.0]
+    assert len(calls) == 1
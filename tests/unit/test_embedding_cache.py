@@ -0,0 +1,123 @@
+import asyncio
+import json
+import os
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+
+root = str(Path(__file__).resolve().parents[2])
+sys.path.append(root)
+
+from src.utils.index_builder import EmbeddingCache, IndexBuilder
+
+
+def _vector(seed, dim=4):
+    return np.random.default_rng(seed).random(dim).astype(np.float32)
+
+
+def test_instances_sharing_files_keep_each_others_rows(tmp_path):
+    prefix = str(tmp_path / 'embeddings' / 'cache')
+    first = EmbeddingCache(prefix, model_name='m')
+    second = EmbeddingCache(prefix, model_name='m')
+
+    first.put('a', _vector(0))
+    first.flush()
+    second.put('b', _vector(1))
+    second.put('a', _vector(0))
+    second.flush()
+    first.put('c', _vector(2))
+    first.flush()
+
+    reopened = EmbeddingCache(prefix, model_name='m')
+    assert len(reopened) == 3
+    for seed, text in enumerate('abc'):
+        np.testing.assert_array_equal(reopened.get(text), _vector(seed))
+    assert os.path.getsize(prefix + '.f32') == 3 * 4 * 4
+
+
+def test_open_repairs_torn_vector_tail(tmp_path):
+    prefix = str(tmp_path / 'cache')
+    cache = EmbeddingCache(prefix)
+    cache.put('a', _vector(0))
+    cache.put('b', _vector(1))
+    cache.flush()
+    # crash after writing the vectors of a third row but before its key
+    with open(prefix + '.f32', 'ab') as f:
+        f.write(_vector(2).tobytes()[:10])
+
+    reopened = EmbeddingCache(prefix)
+    assert len(reopened) == 2
+    assert os.path.getsize(prefix + '.f32') == 2 * 4 * 4
+    reopened.put('c', _vector(2))
+    reopened.flush()
+    np.testing.assert_array_equal(EmbeddingCache(prefix).get('c'), _vector(2))
+
+
+def test_open_drops_keys_without_vectors_and_torn_lines(tmp_path):
+    prefix = str(tmp_path / 'cache')
+    cache = EmbeddingCache(prefix)
+    cache.put('a', _vector(0))
+    cache.flush()
+    with open(prefix + '.keys', 'a', encoding='utf-8') as f:
+        f.write('orphan\npart')
+
+    reopened = EmbeddingCache(prefix)
+    assert len(reopened) == 1
+    with open(prefix + '.keys', encoding='utf-8') as f:
+        assert len(f.read().splitlines()) == 2
+    np.testing.assert_array_equal(reopened.get('a'), _vector(0))
+
+
+def test_vectors_of_another_dimension_are_not_mixed_in(tmp_path):
+    prefix = str(tmp_path / 'cache')
+    cache = EmbeddingCache(prefix)
+    cache.put('a', _vector(0))
+    cache.put('b', _vector(1, dim=8))
+    cache.flush()
+
+    reopened = EmbeddingCache(prefix)
+    assert reopened.dim == 4
+    assert reopened.get('b') is None
+
+
+class _FakeEmbeddingLLM:
+    def __init__(self):
+        self.calls = []
+
+    async def generate_embeddings(self, texts):
+        self.calls.append(list(texts))
+        return [_vector(len(text)).tolist() for text in texts]
+
+
+def _index_builder(tmp_path, llm):
+    config = SimpleNamespace(llm_dict={'emb': llm})
+    return IndexBuilder(config=config, embedding_model='emb', working_dir=str(tmp_path))
+
+
+def test_search_reuses_query_embedding_without_writing_cache_json(tmp_path):
+    llm = _FakeEmbeddingLLM()
+    index = _index_builder(tmp_path, llm)
+    asyncio.run(index._build_index(['a', 'bb', 'ccc']))
+
+    first = asyncio.run(index.search('dd', top_k=2))
+    again = asyncio.run(index.search('dd', top_k=3))
+
+    assert [r['id'] for r in again[:2]] == [r['id'] for r in first]
+    assert len(again) == 3
+    assert llm.calls == [['a', 'bb', 'ccc'], ['dd']]
+    assert not os.path.exists(index.cache_file_path)
+    # The query embedding was persisted with the embedding cache
+    assert _index_builder(tmp_path, llm).embedding_cache.get('dd') is not None
+
+
+def test_legacy_json_embeddings_are_migrated_and_file_removed(tmp_path):
+    cache_json = tmp_path / 'embeddings' / 'cache.json'
+    cache_json.parent.mkdir()
+    cache_json.write_text(json.dumps({'search': {'q': []}, 'embeddings': {'old': _vector(7).tolist()}}))
+
+    index = _index_builder(tmp_path, _FakeEmbeddingLLM())
+
+    assert not cache_json.exists()
+    np.testing.assert_allclose(index.embedding_cache.get('old'), _vector(7))
@@ -0,0 +1,56 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+root = str(Path(__file__).resolve().parents[2])
+sys.path.append(root)
+
+from src.utils.frame_store import FrameStore
+
+pytest.importorskip('pyarrow')
+
+
+def _frame(seed=0, rows=5000):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({'close': rng.random(rows), 'volume': rng.integers(0, 1000, rows)})
+
+
+def test_each_load_returns_an_independent_frame(tmp_path):
+    store = FrameStore(str(tmp_path))
+    df = _frame()
+    data = store.dumps({'prices': df})
+
+    first = store.loads(data)['prices']
+    first.loc[0, 'close'] = -1.0
+    second = store.loads(data)['prices']
+
+    assert second is not first
+    pd.testing.assert_frame_equal(second, df)
+
+
+def test_aliases_within_one_load_are_preserved(tmp_path):
+    store = FrameStore(str(tmp_path))
+    df = _frame()
+    loaded = store.loads(store.dumps({'a': df, 'b': df}))
+    assert loaded['a'] is loaded['b']
+
+
+def test_table_cache_is_bounded(tmp_path):
+    store = FrameStore(str(tmp_path), max_cached_tables=2)
+    frame_ids = [store.put(_frame(seed)) for seed in range(3)]
+    for frame_id in frame_ids:
+        store.get(frame_id)
+
+    assert list(store._tables) == frame_ids[1:]
+    pd.testing.assert_frame_equal(store.get(frame_ids[0]), _frame(0))
+
+
+def test_small_frames_stay_inline(tmp_path):
+    store = FrameStore(str(tmp_path))
+    small = pd.DataFrame({'x': [1, 2, 3]})
+    assert store.put(small) is None
+    pd.testing.assert_frame_equal(store.loads(store.dumps(small)), small)
+    assert not list(tmp_path.glob('*.arrow'))
@@ -0,0 +1,84 @@
+import asyncio
+import gc
+import sys
+import threading
+from pathlib import Path
+
+import httpx
+
+root = str(Path(__file__).resolve().parents[2])
+sys.path.append(root)
+
+from src.tools.web.http_client import HttpClientPool, configure_http_pool, get_http_pool
+from src.utils.async_helpers import run_async_safely
+
+
+def test_clients_of_temporary_loops_are_closed_and_forgotten():
+    pool = HttpClientPool()
+    created = []
+
+    async def use_pool():
+        client = pool.client('https://example.com/a')
+        assert pool.client('https://EXAMPLE.com/b') is client
+        created.append(client)
+
+    for _ in range(5):
+        run_async_safely(use_pool())
+    gc.collect()
+
+    assert len(created) == 5
+    assert all(client.is_closed for client in created)
+    assert len(pool._clients) == 0
+
+
+def test_aclose_waits_for_clients_on_other_loops():
+    pool = HttpClientPool()
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever)
+    thread.start()
+    try:
+        async def make_client():
+            return pool.client('https://example.com')
+
+        client = asyncio.run_coroutine_threadsafe(make_client(), loop).result()
+        asyncio.run(pool.aclose())
+        assert client.is_closed
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+
+def test_request_retries_retryable_statuses():
+    pool = HttpClientPool(retries=2, backoff=0.001)
+    statuses = [503, 429, 200]
+
+    def handler(request):
+        return httpx.Response(statuses.pop(0), headers={'Retry-After': '0'})
+
+    async def main():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        pool.client = lambda url: client
+        try:
+            return await pool.get('https://example.com')
+        finally:
+            await client.aclose()
+
+    assert asyncio.run(main()).status_code == 200
+    assert statuses == []
+
+
+def test_reconfiguring_keeps_an_unchanged_pool_and_closes_a_replaced_one():
+    async def main():
+        pool = configure_http_pool(timeout=5.0, retries=1)
+        client = pool.client('https://example.com')
+        assert configure_http_pool(timeout=5.0, retries=1) is pool
+        assert not client.is_closed
+
+        replacement = configure_http_pool(timeout=6.0, retries=1)
+        await asyncio.sleep(0.01)  # the old pool is closed in a task on this loop
+        assert replacement is not pool and get_http_pool() is replacement
+        assert client.is_closed
+        await replacement.aclose()
+
+    asyncio.run(main())
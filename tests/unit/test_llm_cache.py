@@ -0,0 +1,130 @@
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+root = str(Path(__file__).resolve().parents[2])
+sys.path.append(root)
+
+from src.utils.llm_cache import ReplayCacheMiss, ResponseCache, make_cache_key
+
+MESSAGES = [{'role': 'user', 'content': '你好'}]
+
+
+def test_key_depends_on_model_messages_and_params():
+    key = make_cache_key('m', MESSAGES, {'temperature': 0.1, 'stop': ['x']})
+    assert key == make_cache_key('m', MESSAGES, {'stop': ['x'], 'temperature': 0.1})
+    assert key != make_cache_key('other', MESSAGES, {'temperature': 0.1, 'stop': ['x']})
+    assert key != make_cache_key('m', MESSAGES, {'temperature': 0.2, 'stop': ['x']})
+
+
+def test_readwrite_round_trip_and_ttl(tmp_path):
+    cache = ResponseCache(str(tmp_path), ttl=60)
+    cache.put('k', 'answer', model_name='m')
+    assert cache.get('k') == 'answer'
+    assert cache.get('missing') is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    cache.ttl = 0
+    time.sleep(0.01)
+    assert cache.get('k') is None
+    assert not os.path.exists(cache._path('k'))
+
+
+def test_replay_is_read_only_and_ignores_ttl(tmp_path):
+    ResponseCache(str(tmp_path)).put('k', 'answer')
+    replay = ResponseCache(str(tmp_path), mode='replay', ttl=0)
+    replay.put('new', 'ignored')
+    assert replay.get('k') == 'answer'
+    assert replay.get('new') is None
+    with pytest.raises(ValueError):
+        ResponseCache(str(tmp_path), mode='off')
+
+
+def test_eviction_drops_least_recently_used(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_bytes=10 ** 9)
+    for index, key in enumerate(('old', 'used', 'new')):
+        cache.put(key, 'x' * 100)
+        os.utime(cache._path(key), (1000 + index, 1000 + index))
+    cache.get('old')  # touching refreshes its access time
+    size = os.path.getsize(cache._path('new'))
+
+    cache.max_bytes = 3 * size + 10  # evicts down to 90%, i.e. two entries
+    cache.put('newest', 'x' * 100)
+
+    assert cache.get('used') is None
+    assert cache.get('new') is None
+    assert cache.get('old') == 'x' * 100
+    assert cache.get('newest') == 'x' * 100
+    assert cache._total_bytes <= cache.max_bytes
+
+
+def _config(monkeypatch, tmp_path, mode, now, **overrides):
+    from datetime import datetime
+    import src.config.config as config_module
+
+    class _Clock(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return now
+
+    for var in ('DS', 'EMBEDDING', 'VLM'):
+        monkeypatch.setenv(f'{var}_MODEL_NAME', 'm')
+        monkeypatch.setenv(f'{var}_API_KEY', 'k')
+        monkeypatch.setenv(f'{var}_BASE_URL', 'http://localhost')
+    monkeypatch.setattr(config_module, 'datetime', _Clock)
+    return config_module.Config(config_dict={
+        'output_dir': str(tmp_path / 'outputs'),
+        'llm_cache_mode': mode,
+        'llm_cache_dir': str(tmp_path / 'llm_cache'),
+        'llm_config_list': [{'model_name': 'm', 'api_key': 'k', 'base_url': 'http://localhost'}],
+        **overrides,
+    })
+
+
+def _ask(config, completions):
+    from types import SimpleNamespace
+
+    llm = config.llm_dict['m']
+    llm.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    # 与Agent提示词一致：开头是本次运行的当前时间
+    messages = [{'role': 'user', 'content': f"当前时间: {config.run_time}\n请总结公司年报"}]
+    return asyncio.run(llm.generate(messages=messages))
+
+
+class _Completions:
+    def __init__(self, answer=None):
+        self.answer = answer
+        self.calls = 0
+
+    async def create(self, **kwargs):
+        from types import SimpleNamespace
+
+        self.calls += 1
+        if self.answer is None:
+            raise AssertionError('replay must not call the API')
+        message = SimpleNamespace(content=self.answer)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+
+def test_replay_of_a_recorded_run_reuses_its_run_time(monkeypatch, tmp_path):
+    from datetime import datetime
+
+    recorder = _config(monkeypatch, tmp_path, 'readwrite', datetime(2025, 1, 1, 9, 0, 0))
+    recording = _Completions('营收增长')
+    assert _ask(recorder, recording) == '营收增长'
+    assert recording.calls == 1
+
+    replay = _config(monkeypatch, tmp_path, 'replay', datetime(2025, 3, 1, 18, 30, 0))
+    assert replay.run_time == '2025-01-01 09:00:00'
+    assert _ask(replay, _Completions()) == '营收增长'
+
+    pinned = _config(monkeypatch, tmp_path, 'readwrite', datetime(2025, 3, 2, 8, 0, 0), run_time='2025-01-01 09:00:00')
+    assert _ask(pinned, _Completions()) == '营收增长'
+
+    other = _config(monkeypatch, tmp_path, 'replay', datetime(2025, 3, 2, 8, 0, 0), run_time='2025-02-01 09:00:00')
+    with pytest.raises(ReplayCacheMiss):
+        _ask(other, _Completions())
@@ -0,0 +1,98 @@
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+root = str(Path(__file__).resolve().parents[2])
+sys.path.append(root)
+
+from src.utils.llm import AsyncLLM
+from src.utils.llm_usage import UsageTracker
+
+
+def _chunk(content=None, usage=None):
+    choices = [SimpleNamespace(delta=SimpleNamespace(content=content))] if content is not None else []
+    return SimpleNamespace(choices=choices, usage=usage)
+
+
+class _Stream:
+    def __init__(self, chunks):
+        self._chunks = list(chunks)
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self._chunks:
+            raise StopAsyncIteration
+        return self._chunks.pop(0)
+
+    async def close(self):
+        self.closed = True
+
+
+class _Completions:
+    def __init__(self, chunks, reject_stream_options=False):
+        self.chunks = chunks
+        self.reject_stream_options = reject_stream_options
+        self.calls = []
+
+    async def create(self, **kwargs):
+        self.calls.append(kwargs)
+        if self.reject_stream_options and 'stream_options' in kwargs:
+            raise RuntimeError("Error code: 400 - unknown field: stream_options")
+        return _Stream(self.chunks)
+
+
+def _llm(completions, **generation_params):
+    tracker = UsageTracker()
+    llm = AsyncLLM(base_url='http://localhost', api_key='k', model_name='m', stream=True,
+                   usage_tracker=tracker, generation_params=generation_params)
+    llm.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return llm, tracker
+
+
+MESSAGES = [{'role': 'user', 'content': 'hello'}]
+
+
+def test_streaming_requests_and_records_server_usage():
+    usage = SimpleNamespace(prompt_tokens=11, completion_tokens=3, total_tokens=14)
+    completions = _Completions([_chunk('Hi'), _chunk(' there'), _chunk(usage=usage)])
+    llm, tracker = _llm(completions)
+
+    assert asyncio.run(llm.generate(messages=list(MESSAGES))) == 'Hi there'
+    assert completions.calls[0]['stream_options'] == {'include_usage': True}
+    assert tracker.summary()['totals']['prompt_tokens'] == 11
+
+
+def test_usage_is_estimated_when_stream_is_cut_at_stop_word():
+    completions = _Completions([_chunk('answer</final_result>tail'), _chunk(usage=SimpleNamespace(prompt_tokens=99))])
+    llm, tracker = _llm(completions)
+
+    output = asyncio.run(llm.generate(messages=list(MESSAGES), stop=['</final_result>']))
+
+    totals = tracker.summary()['totals']
+    assert output == 'answer</final_result>'
+    assert totals['prompt_tokens'] > 0 and totals['prompt_tokens'] != 99
+    assert totals['completion_tokens'] > 0
+
+
+def test_stream_options_dropped_when_provider_rejects_them():
+    completions = _Completions([_chunk('ok')], reject_stream_options=True)
+    llm, tracker = _llm(completions)
+
+    assert asyncio.run(llm.generate(messages=list(MESSAGES))) == 'ok'
+    assert 'stream_options' not in completions.calls[-1]
+    assert tracker.summary()['totals']['completion_tokens'] > 0
+
+
+def test_streamed_calls_report_time_to_first_token_to_the_limiter():
+    from src.utils.rate_limiter import EndpointLimiter
+
+    limiter = EndpointLimiter('m', max_concurrency=4)
+    llm, _ = _llm(_Completions([_chunk('Hi'), _chunk(' there')]))
+    llm.rate_limiter = limiter
+
+    asyncio.run(llm.generate(messages=list(MESSAGES)))
+    assert limiter.concurrency._samples == {'ttft': 1}
@@ -0,0 +1,50 @@
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+root = str(Path(__file__).resolve().parents[2])
+sys.path.append(root)
+
+from src.utils.llm_usage import UsageTracker, usage_phase
+from src.utils.logger import get_logger
+
+
+def _usage(prompt, completion, cached=None):
+    details = SimpleNamespace(cached_tokens=cached) if cached is not None else None
+    return SimpleNamespace(prompt_tokens=prompt, completion_tokens=completion, total_tokens=None, prompt_tokens_details=details)
+
+
+def test_summary_groups_by_agent_phase_and_model():
+    tracker = UsageTracker(run_id='run')
+    get_logger().set_agent_context('agent_a', 'data_analyzer')
+    with usage_phase('outline'):
+        tracker.record('chat', 'm1', _usage(100, 10, cached=40), latency=1.0)
+    tracker.record('chat', 'm2', SimpleNamespace(prompt_tokens=50, completion_tokens=5, prompt_cache_hit_tokens=10), retries=2)
+    tracker.record('embedding', 'm1', None, success=False)
+
+    summary = tracker.summary()
+
+    totals = summary['totals']
+    assert (totals['calls'], totals['failed_calls'], totals['retries']) == (3, 1, 2)
+    assert (totals['prompt_tokens'], totals['completion_tokens'], totals['total_tokens']) == (150, 15, 165)
+    assert totals['cache_hit_tokens'] == 50
+    assert totals['cache_hit_rate'] == round(50 / 150, 4)
+    assert summary['by_phase']['outline']['calls'] == 1
+    assert summary['by_model']['m1']['calls'] == 2
+    assert summary['by_agent']['agent_a']['agent_name'] == 'data_analyzer'
+    assert tracker.summary(kind='chat')['totals']['calls'] == 2
+
+
+def test_save_keeps_other_runs(tmp_path):
+    path = str(tmp_path / 'usage.json')
+    UsageTracker(run_id='first').save(path)
+    tracker = UsageTracker(run_id='second')
+    tracker.record('chat', 'm', _usage(1, 1))
+    tracker.save(path)
+    tracker.save(path)
+
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    assert data['current_run'] == 'second'
+    assert [run['run_id'] for run in data['runs']] == ['first', 'second']
@@ -0,0 +1,80 @@
+import os
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+root = str(Path(__file__).resolve().parents[2])
+sys.path.append(root)
+
+from src.memory.variable_memory import Memory
+from src.tools import ToolResult
+
+
+def _memory(tmp_path):
+    return Memory(SimpleNamespace(working_dir=str(tmp_path), config={'target_type': 'financial_company'}))
+
+
+def _item(name, data='x'):
+    return ToolResult(name=name, description=f'{name} desc', data=data, source='test')
+
+
+def _shards(tmp_path):
+    return set(os.listdir(os.path.join(str(tmp_path), 'memory', 'memory_shards')))
+
+
+def _reloaded(tmp_path):
+    memory = _memory(tmp_path)
+    assert memory.load()
+    return memory
+
+
+def test_appends_are_saved_incrementally(tmp_path):
+    memory = _memory(tmp_path)
+    memory.add_data(_item('a'))
+    memory.add_log('agent', 'collector', {}, {})
+    memory.save()
+    first = _shards(tmp_path)
+
+    memory.add_data(_item('b'))
+    memory.save()
+    assert first < _shards(tmp_path)
+    assert len(_shards(tmp_path) - first) == 1
+    assert [item.name for item in _reloaded(tmp_path).data] == ['a', 'b']
+
+
+def test_replacing_a_saved_item_is_persisted(tmp_path):
+    memory = _memory(tmp_path)
+    memory.add_data(_item('a'))
+    memory.add_data(_item('b'))
+    memory.save()
+
+    memory.data[0] = _item('a2')
+    memory.save()
+    assert [item.name for item in _reloaded(tmp_path).data] == ['a2', 'b']
+
+
+def test_in_place_edits_are_persisted_after_mark_dirty(tmp_path):
+    memory = _memory(tmp_path)
+    memory.add_data(_item('a', data='old'))
+    memory.save()
+
+    memory.data[0].data = 'new'
+    memory.save()
+    assert _reloaded(tmp_path).data[0].data == 'old'  # undetectable without a flag
+
+    memory.mark_dirty('data')
+    memory.save()
+    assert _reloaded(tmp_path).data[0].data == 'new'
+
+
+def test_lazy_collections_keep_incremental_saves_after_load(tmp_path):
+    memory = _memory(tmp_path)
+    memory.add_data(_item('a'))
+    memory.save()
+
+    reloaded = _reloaded(tmp_path)
+    reloaded.add_data(_item('b'))
+    before = _shards(tmp_path)
+    reloaded.save()
+    assert len(_shards(tmp_path) - before) == 1
+    assert [item.name for item in _reloaded(tmp_path).data] == ['a', 'b']
@@ -0,0 +1,111 @@
+import asyncio
+import os
+import sys
+import threading
+from pathlib import Path
+
+root = str(Path(__file__).resolve().parents[2])
+sys.path.append(root)
+
+from src.tools.web.page_cache import FetchedPage, PageCache, normalize_url
+from src.utils.async_helpers import run_async_safely
+
+
+def test_normalize_url_drops_tracking_and_cosmetic_differences():
+    canonical = normalize_url('https://example.com/report?id=1&page=2')
+    assert normalize_url('HTTPS://Example.com:443/report/?page=2&utm_source=x&id=1#top') == canonical
+    assert normalize_url('https://example.com/report?id=1&page=2&spm=abc') == canonical
+    assert normalize_url('https://example.com/report?id=2&page=2') != canonical
+    assert normalize_url('http://example.com:8080') == 'http://example.com:8080/'
+
+
+class _Site:
+    def __init__(self, content='# page', etag='"v1"', delay=0.0):
+        self.content = content
+        self.etag = etag
+        self.delay = delay
+        self.loads = 0
+        self.revalidations = []
+        self._lock = threading.Lock()
+
+    async def loader(self):
+        with self._lock:
+            self.loads += 1
+        await asyncio.sleep(self.delay)
+        return FetchedPage(self.content, {'ETag': self.etag})
+
+    async def revalidate(self, url, headers):
+        self.revalidations.append(headers)
+        return headers.get('If-None-Match') == self.etag
+
+
+def _fetch(cache, site, url='https://example.com/a'):
+    return cache.fetch(url, site.loader, site.revalidate)
+
+
+def test_fresh_entries_skip_the_network(tmp_path):
+    cache = PageCache(str(tmp_path))
+    site = _Site()
+    assert asyncio.run(_fetch(cache, site)) == '# page'
+    assert asyncio.run(_fetch(cache, site, 'https://example.com/a/?utm_medium=x')) == '# page'
+    assert (site.loads, cache.hits, site.revalidations) == (1, 1, [])
+
+
+def test_stale_entries_are_revalidated(tmp_path):
+    cache = PageCache(str(tmp_path), ttl=0)
+    site = _Site()
+    asyncio.run(_fetch(cache, site))
+
+    assert asyncio.run(_fetch(cache, site)) == '# page'
+    assert site.revalidations == [{'If-None-Match': '"v1"'}]
+    assert (site.loads, cache.revalidated) == (1, 1)
+
+    site.etag, site.content = '"v2"', '# updated'
+    assert asyncio.run(_fetch(cache, site)) == '# updated'
+    assert site.loads == 2
+
+
+def test_mirrors_share_one_blob(tmp_path):
+    cache = PageCache(str(tmp_path))
+    site = _Site()
+    asyncio.run(_fetch(cache, site, 'https://a.example.com/report'))
+    asyncio.run(_fetch(cache, site, 'https://b.example.com/report'))
+    assert len(os.listdir(os.path.join(str(tmp_path), 'entries'))) == 2
+    assert len(os.listdir(os.path.join(str(tmp_path), 'blobs'))) == 1
+
+
+def test_concurrent_fetches_across_loops_crawl_once(tmp_path):
+    cache = PageCache(str(tmp_path))
+    site = _Site(delay=0.1)
+    results = []
+
+    def worker():
+        results.append(run_async_safely(_fetch(cache, site)))
+
+    threads = [threading.Thread(target=worker) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ['# page'] * 3
+    assert site.loads == 1
+    assert cache.coalesced == 2
+
+
+def test_cancelled_click_batch_does_not_break_other_agents(tmp_path):
+    cache = PageCache(str(tmp_path))
+    site = _Site(delay=0.2)
+
+    async def main():
+        owner = asyncio.create_task(_fetch(cache, site))
+        await asyncio.sleep(0.01)
+        waiters = [asyncio.create_task(_fetch(cache, site)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        waiters[0].cancel()
+        return await asyncio.gather(owner, *waiters, return_exceptions=True)
+
+    owner_result, cancelled, waiter_result = asyncio.run(main())
+    assert isinstance(cancelled, asyncio.CancelledError)
+    assert owner_result == waiter_result == '# page'
+    assert site.loads == 1
@@ -0,0 +1,166 @@
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+root = str(Path(__file__).resolve().parents[2])
+sys.path.append(root)
+
+from src.utils.async_helpers import run_async_safely
+from src.utils.rate_limiter import AdaptiveConcurrency, EndpointLimiter, TokenBucket
+
+
+def test_limiter_is_shared_across_run_async_safely_threads():
+    limiter = EndpointLimiter('test', rpm=6000, tpm=600000, max_concurrency=2)
+    lock = threading.Lock()
+    running = 0
+    peak = 0
+
+    async def call():
+        nonlocal running, peak
+        async with limiter.slot(100) as ticket:
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            await asyncio.sleep(0.02)
+            with lock:
+                running -= 1
+            ticket['tokens'] = 120
+
+    async def batch():
+        await asyncio.gather(*(call() for _ in range(4)))
+
+    errors = []
+
+    def worker():
+        try:
+            run_async_safely(batch())
+        except Exception as e:  # "bound to a different event loop" before the fix
+            errors.append(e)
+
+    # The first loop binds any loop-bound primitive; later loops must still work
+    run_async_safely(batch())
+    threads = [threading.Thread(target=worker) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert peak == 2
+    assert limiter.concurrency.in_flight == 0
+
+
+def test_token_bucket_waits_outside_the_lock_in_arrival_order():
+    bucket = TokenBucket(per_minute=600)  # 10 tokens/s
+    asyncio.run(bucket.acquire(600))
+    finished = []
+
+    async def take(name):
+        await bucket.acquire(1)
+        finished.append(name)
+
+    async def main():
+        start = time.monotonic()
+        await asyncio.gather(take('a'), take('b'), take('c'))
+        return time.monotonic() - start
+
+    elapsed = asyncio.run(main())
+
+    assert finished == ['a', 'b', 'c']
+    assert 0.25 <= elapsed < 0.5
+
+
+def test_cancelled_acquire_returns_its_tokens():
+    bucket = TokenBucket(per_minute=60)
+
+    async def main():
+        await bucket.acquire(60)
+        task = asyncio.create_task(bucket.acquire(30))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    asyncio.run(main())
+    assert bucket.tokens > -1
+
+
+def test_cancelled_waiter_does_not_leak_a_slot():
+    concurrency = AdaptiveConcurrency(max_limit=1)
+
+    async def main():
+        epoch = await concurrency.acquire()
+        waiter = asyncio.create_task(concurrency.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await concurrency.release(epoch)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            pass
+        assert concurrency.in_flight == 0
+        await asyncio.wait_for(concurrency.acquire(), 1)
+
+    asyncio.run(main())
+    assert concurrency.in_flight == 1
+
+
+def test_throttling_halves_the_window_once_per_epoch():
+    concurrency = AdaptiveConcurrency(max_limit=8)
+
+    async def main():
+        epochs = [await concurrency.acquire() for _ in range(3)]
+        for epoch in epochs:
+            await concurrency.release(epoch, throttled=True)
+
+    asyncio.run(main())
+    assert concurrency.limit == 4
+    assert concurrency.epoch == 1
+
+
+def _warm_up(concurrency, kind, latency, samples=10):
+    async def main():
+        for _ in range(samples):
+            await concurrency.release(await concurrency.acquire(), latency=latency, kind=kind)
+    asyncio.run(main())
+
+
+def _release_once(concurrency, kind, latency):
+    async def main():
+        await concurrency.release(await concurrency.acquire(), latency=latency, kind=kind)
+    asyncio.run(main())
+
+
+def test_latency_spike_halves_the_window():
+    concurrency = AdaptiveConcurrency(max_limit=8)
+    _warm_up(concurrency, 'ttft', 0.5)
+    _release_once(concurrency, 'ttft', 0.6)
+    assert concurrency.epoch == 0
+    _release_once(concurrency, 'ttft', 5.0)
+    assert (concurrency.limit, concurrency.epoch) == (4, 1)
+
+
+def test_long_generations_after_short_calls_are_not_spikes():
+    limiter = EndpointLimiter('m', max_concurrency=8)
+    concurrency = limiter.concurrency
+
+    # short select_data/title calls: ~1s for a handful of tokens
+    for _ in range(10):
+        kind, latency = limiter.latency_signal({'completion_tokens': 8}, 0.0, 1.0)
+        _release_once(concurrency, kind, latency)
+    # a long section write: 40s for 2000 tokens is a normal decode rate
+    kind, latency = limiter.latency_signal({'completion_tokens': 2000}, 0.0, 40.0)
+    assert kind == 'per_token'
+    _release_once(concurrency, kind, latency)
+    # streamed: only the wait for the first token counts, not the generation
+    kind, latency = limiter.latency_signal({'first_token_at': 100.8, 'completion_tokens': 2000}, 100.0, 160.0)
+    assert (kind, round(latency, 3)) == ('ttft', 0.8)
+    _release_once(concurrency, kind, latency)
+
+    assert concurrency.epoch == 0
+    assert concurrency.limit == 8
+    assert limiter.latency_signal({}, 0.0, 2.0) == ('total', 2.0)
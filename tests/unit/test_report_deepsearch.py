@@ -0,0 +1,153 @@
+import asyncio
+import copy
+import sys
+import threading
+from pathlib import Path
+
+root = str(Path(__file__).resolve().parents[2])
+sys.path.append(root)
+
+from src.agents.report_generator.report_generator import ReportGenerator
+from src.agents.search_agent.search_agent import DeepSearchAgent
+from src.utils.async_helpers import run_async_safely
+from src.utils.single_flight import SingleFlight
+
+
+class _FakeDeepSearch(DeepSearchAgent):
+    """DeepSearchAgent whose run just records the link it 'found'."""
+
+    def __init__(self):
+        self.state = None
+        self.current_checkpoint = {}
+        self._conversation_logs = {}
+        self.current_task_data = {}
+        self._resume_state = None
+        self.current_round = 0
+        self.link2name = {}
+        self.valid_links = {}
+        self.used_sources = {}
+        self.running = 0
+        self.peak = 0
+        self.checkpoints = []
+
+    async def async_run(self, input_data, checkpoint_name='deepsearch_latest.pkl', **kwargs):
+        shared = self._shared
+        shared.running += 1
+        shared.peak = max(shared.peak, shared.running)
+        shared.checkpoints.append(checkpoint_name)
+        try:
+            await asyncio.sleep(0.05)
+            query = input_data['query']
+            self.valid_links[f'https://example.com/{query}'] = {'query': query}
+            return {'final_result': query}
+        finally:
+            shared.running -= 1
+
+    def fork(self):
+        worker = super().fork()
+        worker._shared = self
+        return worker
+
+
+def _generator(ds_agent, section_outline=''):
+    generator = ReportGenerator.__new__(ReportGenerator)
+    generator.tools = [ds_agent]
+    generator.current_task_data = {'task': 'report', 'section_outline': section_outline}
+    generator._deepsearch_lock = threading.Lock()
+    generator._deepsearch_flight = SingleFlight()
+    return generator
+
+
+def _section(generator, section_outline):
+    """What `_fork_section_worker` does: a shallow copy with its own task data."""
+    worker = copy.copy(generator)
+    worker.current_task_data = {'task': 'report', 'section_outline': section_outline}
+    return worker
+
+
+def test_fork_isolates_search_state():
+    agent = _FakeDeepSearch()
+    agent.valid_links['https://a'] = {}
+    worker = agent.fork()
+    worker.valid_links['https://b'] = {}
+    worker.current_task_data['query'] = 'x'
+
+    assert 'https://b' not in agent.valid_links
+    assert agent.current_task_data == {}
+    agent.merge_sources(worker)
+    assert set(agent.valid_links) == {'https://a', 'https://b'}
+
+
+def test_sections_search_concurrently_and_merge_links():
+    agent = _FakeDeepSearch()
+    generator = _generator(agent)
+
+    async def main():
+        return await asyncio.gather(*(generator._run_deepsearch({'query': q}) for q in ('q1', 'q2', 'q3')))
+
+    results = asyncio.run(main())
+
+    assert [r['final_result'] for r in results] == ['q1', 'q2', 'q3']
+    assert agent.peak == 3
+    assert len(set(agent.checkpoints)) == 3
+    assert set(agent.valid_links) == {f'https://example.com/{q}' for q in ('q1', 'q2', 'q3')}
+
+
+def test_search_from_executor_threads_is_not_serialized():
+    agent = _FakeDeepSearch()
+    generator = _generator(agent)
+    threads = [
+        threading.Thread(target=run_async_safely, args=(generator._run_deepsearch({'query': q}),))
+        for q in ('t1', 't2')
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert agent.peak == 2
+    assert not generator._deepsearch_lock.locked()
+
+
+def test_cancelled_search_releases_the_lock():
+    agent = _FakeDeepSearch()
+    generator = _generator(agent)
+
+    async def main():
+        task = asyncio.create_task(generator._run_deepsearch({'query': 'slow'}))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        return await generator._run_deepsearch({'query': 'next'})
+
+    assert asyncio.run(main())['final_result'] == 'next'
+    assert not generator._deepsearch_lock.locked()
+
+
+def test_identical_searches_in_one_section_run_once():
+    agent = _FakeDeepSearch()
+    generator = _section(_generator(agent), '## 盈利能力')
+
+    async def main():
+        return await asyncio.gather(*(generator._run_deepsearch({'query': 'q'}) for _ in range(3)))
+
+    results = asyncio.run(main())
+    assert [r['final_result'] for r in results] == ['q'] * 3
+    assert len(agent.checkpoints) == 1
+
+
+def test_checkpoints_are_scoped_to_task_and_section():
+    agent = _FakeDeepSearch()
+    generator = _generator(agent)
+    profit, valuation = _section(generator, '## 盈利能力'), _section(generator, '## 估值')
+
+    async def main():
+        await asyncio.gather(profit._run_deepsearch({'query': 'q'}), valuation._run_deepsearch({'query': 'q'}))
+        await profit._run_deepsearch({'query': 'q', 'task': 'another report'})
+
+    asyncio.run(main())
+    assert len(agent.checkpoints) == 3
+    assert len(set(agent.checkpoints)) == 3
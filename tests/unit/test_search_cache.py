@@ -0,0 +1,112 @@
+import asyncio
+import os
+import sys
+import threading
+from pathlib import Path
+
+root = str(Path(__file__).resolve().parents[2])
+sys.path.append(root)
+
+from src.tools.web.base_search import SearchResult
+from src.tools.web.search_cache import SearchResultCache, normalize_query
+from src.utils.async_helpers import run_async_safely
+
+ENGINES = ['tavily', 'duckduckgo']
+
+
+def test_normalization_folds_width_case_and_whitespace():
+    assert normalize_query('  宁德时代　２０２４年报  ') == '宁德时代 2024年报'
+    assert normalize_query('CATL  Annual\tReport') == normalize_query('catl annual report')
+
+
+def test_normalization_keeps_operators_and_word_order():
+    base = normalize_query('宁德时代 储能')
+    assert normalize_query('宁德时代 -储能') != base
+    assert normalize_query('宁德时代 储能 site:cninfo.com.cn') != base
+    assert normalize_query('"宁德时代 储能"') != base
+    assert normalize_query('储能 宁德时代') != base
+    assert normalize_query('CATL OR BYD') != normalize_query('catl or byd')
+    assert normalize_query('宁德时代 -储能') == '宁德时代 -储能'
+
+
+def _results(query):
+    return [SearchResult(query=query, name='title', description='summary', data='', link='https://example.com')]
+
+
+def _loader(calls, query, delay=0.0):
+    async def load():
+        calls.append(query)
+        await asyncio.sleep(delay)
+        return _results(query)
+    return load
+
+
+def test_key_separates_strategy_and_engine_order():
+    key = SearchResultCache.make_key('q', 'auto', ENGINES)
+    assert key == SearchResultCache.make_key('Ｑ', 'auto', ENGINES)
+    assert key != SearchResultCache.make_key('q', 'parallel', ENGINES)
+    assert key != SearchResultCache.make_key('q', 'auto', list(reversed(ENGINES)))
+
+
+def test_equivalent_queries_hit_and_distinct_ones_miss(tmp_path):
+    cache = SearchResultCache(str(tmp_path))
+    calls = []
+    for query in ('宁德时代 储能', '宁德时代　储能', '宁德时代 -储能'):
+        asyncio.run(cache.fetch(query, 'auto', ENGINES, _loader(calls, query)))
+    assert calls == ['宁德时代 储能', '宁德时代 -储能']
+    assert cache.hits == 1
+
+
+def test_concurrent_searches_across_loops_are_coalesced(tmp_path):
+    cache = SearchResultCache(str(tmp_path))
+    calls = []
+    results = []
+
+    def worker(query):
+        results.append(run_async_safely(cache.fetch(query, 'auto', ENGINES, _loader(calls, query, 0.1))))
+
+    threads = [threading.Thread(target=worker, args=(q,)) for q in ('CATL news', 'catl  NEWS', 'Catl News')]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert cache.coalesced == 2
+    assert len(results) == 3 and all(r[0].link == 'https://example.com' for r in results)
+    assert len({id(r[0]) for r in results}) == 3
+
+
+def test_empty_results_and_expired_entries_are_not_served(tmp_path):
+    cache = SearchResultCache(str(tmp_path), ttl=3600)
+
+    async def empty():
+        return []
+
+    asyncio.run(cache.fetch('q', 'auto', ENGINES, empty))
+    assert not os.listdir(str(tmp_path))
+
+    calls = []
+    asyncio.run(cache.fetch('q', 'auto', ENGINES, _loader(calls, 'q')))
+    key = cache.make_key('q', 'auto', ENGINES)
+    os.utime(cache._path(key), (0, 0))
+    asyncio.run(cache.fetch('q', 'auto', ENGINES, _loader(calls, 'q')))
+    assert len(calls) == 2
+
+
+def test_cancelled_waiter_does_not_break_the_search_or_other_waiters(tmp_path):
+    cache = SearchResultCache(str(tmp_path))
+    calls = []
+
+    async def main():
+        owner = asyncio.create_task(cache.fetch('q', 'auto', ENGINES, _loader(calls, 'q', 0.2)))
+        await asyncio.sleep(0.01)
+        waiters = [asyncio.create_task(cache.fetch('q', 'auto', ENGINES, _loader(calls, 'q'))) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        waiters[0].cancel()
+        return await asyncio.gather(owner, *waiters, return_exceptions=True)
+
+    owner_result, cancelled, waiter_result = asyncio.run(main())
+    assert isinstance(cancelled, asyncio.CancelledError)
+    assert owner_result[0].link == waiter_result[0].link == 'https://example.com'
+    assert calls == ['q']
@@ -0,0 +1,85 @@
+import asyncio
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+root = str(Path(__file__).resolve().parents[2])
+sys.path.append(root)
+
+from src.utils.async_helpers import run_async_safely
+from src.utils.single_flight import SingleFlight
+
+
+def _job(calls, result, delay=0.1):
+    async def run():
+        calls.append(result)
+        await asyncio.sleep(delay)
+        return result
+    return run
+
+
+def test_concurrent_calls_across_loops_share_one_run():
+    flight = SingleFlight()
+    calls = []
+    results = []
+
+    def worker():
+        results.append(run_async_safely(flight.do('k', _job(calls, [1, 2]), share=list)))
+
+    threads = [threading.Thread(target=worker) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1 and flight.coalesced == 2
+    assert results == [[1, 2]] * 3
+    assert len({id(result) for result in results}) == 3  # waiters receive shared copies
+
+
+def test_cancelling_a_waiter_leaves_the_owner_and_other_waiters_intact():
+    flight = SingleFlight()
+    calls = []
+
+    async def main():
+        owner = asyncio.create_task(flight.do('k', _job(calls, 'owner', 0.2)))
+        await asyncio.sleep(0.01)
+        waiters = [asyncio.create_task(flight.do('k', _job(calls, 'waiter', 0))) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        waiters[0].cancel()
+        return await asyncio.gather(owner, *waiters, return_exceptions=True)
+
+    owner_result, cancelled, waiter_result = asyncio.run(main())
+    assert isinstance(cancelled, asyncio.CancelledError)
+    assert (owner_result, waiter_result) == ('owner', 'owner')
+    assert calls == ['owner']
+
+
+def test_errors_reach_waiters_and_cancelled_owners_hand_over():
+    flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.05)
+        raise ValueError('backend down')
+
+    async def errors():
+        return await asyncio.gather(flight.do('k', fail), flight.do('k', fail), return_exceptions=True)
+
+    assert [type(e) for e in asyncio.run(errors())] == [ValueError, ValueError]
+
+    calls = []
+
+    async def handover():
+        owner = asyncio.create_task(flight.do('k', _job(calls, 'owner', 1.0)))
+        await asyncio.sleep(0.01)
+        waiter = asyncio.create_task(flight.do('k', _job(calls, 'waiter', 0)))
+        await asyncio.sleep(0.01)
+        owner.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await owner
+        return await waiter
+
+    assert asyncio.run(handover()) == 'waiter'
+    assert not flight._inflight
@@ -0,0 +1,48 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+root = str(Path(__file__).resolve().parents[2])
+sys.path.append(root)
+
+from src.utils.vector_index import EmbeddingMatrix, greedy_assignment
+
+
+def _matrix():
+    matrix = EmbeddingMatrix()
+    matrix.add_many(['x', 'y', 'xy'], [[1, 0], [0, 1], [1, 1]])
+    return matrix
+
+
+def test_rows_rejects_unknown_keys():
+    matrix = _matrix()
+    assert matrix.rows(['xy', 'x']).tolist() == [2, 0]
+    with pytest.raises(KeyError):
+        matrix.rows(['x', 'missing'])
+
+
+def test_search_within_rows_returns_positions():
+    matrix = _matrix()
+    positions, scores = matrix.search([0, 3], top_k=2, rows=matrix.rows(['x', 'xy', 'y']))
+    assert positions.tolist() == [2, 1]
+    assert scores[0] == pytest.approx(1.0)
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = str(tmp_path / 'embeddings.npy')
+    matrix = _matrix()
+    matrix.save(path)
+
+    loaded = EmbeddingMatrix.load(path)
+    loaded.add('z', [1, -1])
+
+    assert loaded.keys == ['x', 'y', 'xy', 'z']
+    np.testing.assert_allclose(loaded.get('xy'), matrix.get('xy'))
+    assert EmbeddingMatrix.load(path).keys == ['x', 'y', 'xy']
+
+
+def test_greedy_assignment_uses_each_column_once():
+    scores = np.array([[0.9, 0.8], [0.95, 0.1], [0.2, 0.3]])
+    assert greedy_assignment(scores).tolist() == [1, 0, -1]